@@ -2,11 +2,22 @@
  * Projektportfolio Dashboard - app.js
  * LV-Vorhaben 2025-2027, VetMedUni Wien
  *
- * Datenquelle: consolidated.json (48-Spalten-Modell aus konsolidiert.xlsx)
- * Felder: lv_nummer, leistungsbereich, kapitelzuordnung, projektname,
- *         pag, ampelstatus, projektphase, fertigstellungsgrad, risiko,
- *         plankosten_2025/2026/2027/gesamt, istkosten_2025/2026/2027/gesamt/prozent,
- *         start, ende, dauer_werktage, meilensteine, status_aktuell, etc.
+ * Datenquelle: consolidated.json (kompaktes Format 2, siehe prototype/dashboarddaten.py)
+ *   spalten:    ein Array je Feld (lv_nummer, projektname, pag, ampelstatus, projektphase,
+ *               fertigstellungsgrad, plankosten_*, istkosten_*, start, ende, ...)
+ *   kategorien: Wertelisten fuer Ampel, PAG, Phase, Leistungsbereich, Risiko
+ *               (die Spalte enthaelt den Index in die Liste)
+ *   aggregate:  KPIs und Verteilungen ueber alle Projekte (ungefilterte Ansicht)
+ *   detail:     Detaildatei je Projekt unter details/ mit den Langtexten
+ *               (kurzbeschreibung, meilensteine, status_aktuell, ...), geladen im Detail-Dialog
+ *
+ * Live-Aktualisierung (start_dashboard.py --beobachten): der Server schickt nach jeder
+ * Quelldaten-Aenderung ein Delta ueber Server-Sent Events (/events?seit=<meta.ereignis>);
+ * applyDelta() tauscht nur die geaenderten Projekte aus.
+ *
+ * Rendering inkrementell (renderAll()): Charts werden einmal angelegt und danach in place
+ * aktualisiert, Karten und Budget-Zeilen je Projekt einmal erzeugt und wiederverwendet
+ * (syncKeyed()); ein Filterwechsel schaltet nur die Sichtbarkeit der betroffenen Karten um.
  *
  * Ampelwerte: "In Ordnung" (gruen), "Vorsicht" (gelb), "Krise" (rot)
  */
@@ -16,10 +27,20 @@
 const APP_STATE = {
     allProjects: [],
     filteredProjects: [],
+    filterActive: false,
+    aggregate: null,
+    details: new Map(),
+    openDetail: null,
     meta: {},
-    charts: {}
+    charts: {},
+    cards: new Map(),
+    budgetRows: new Map(),
+    events: null
 };
 
+const DATA_FORMAT = 2;
+const JAHRE = ['2025', '2026', '2027'];
+
 const AMPEL_COLORS = {
     'In Ordnung': { bg: '#e6f4ea', color: '#4CAF50', border: '#388E3C', label: 'In Ordnung' },
     'Vorsicht':   { bg: '#fff8e1', color: '#FFC107', border: '#FFA000', text: '#8a6d00', label: 'Vorsicht' },
@@ -57,9 +78,41 @@ async function loadData() {
     const response = await fetch('consolidated.json');
     if (!response.ok) throw new Error(`HTTP ${response.status}`);
     const data = await response.json();
+    if (!data.meta || data.meta.format !== DATA_FORMAT) {
+        throw new Error('Veraltetes Datenformat in consolidated.json');
+    }
     APP_STATE.meta = data.meta;
-    APP_STATE.allProjects = data.projekte;
-    APP_STATE.filteredProjects = [...data.projekte];
+    APP_STATE.allProjects = decodeProjects(data);
+    APP_STATE.aggregate = data.aggregate;
+    APP_STATE.filteredProjects = [...APP_STATE.allProjects];
+}
+
+// Spaltenarrays -> ein Objekt je Projekt; Kategorien-Indizes -> Werte
+function decodeProjects(data) {
+    const n = data.meta.anzahl_projekte;
+    const projects = Array.from({ length: n }, () => ({}));
+    Object.entries(data.spalten).forEach(([field, values]) => {
+        const dict = data.kategorien[field];
+        for (let i = 0; i < n; i++) {
+            const v = values[i];
+            projects[i][field] = dict && v != null ? dict[v] : v;
+        }
+    });
+    data.detail.forEach((name, i) => { projects[i]._detail = name; });
+    return projects;
+}
+
+// Langtexte eines Projekts (details/<datei>), je Datei nur einmal geladen
+function loadDetail(p) {
+    if (!APP_STATE.details.has(p._detail)) {
+        const request = fetch('details/' + encodeURIComponent(p._detail)).then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.json();
+        });
+        request.catch(() => APP_STATE.details.delete(p._detail));
+        APP_STATE.details.set(p._detail, request);
+    }
+    return APP_STATE.details.get(p._detail);
 }
 
 // ---- 3. Hilfsfunktionen ----
@@ -108,6 +161,92 @@ function hasValidationIssues(p) {
     return v && v !== 'OK';
 }
 
+function htmlToElement(html, parentTag) {
+    const holder = document.createElement(parentTag);
+    holder.innerHTML = html.trim();
+    return holder.children[0];
+}
+
+// Haelt die Kinder von container passend zu items (in dieser Reihenfolge), ein Element je
+// Projekt (Schluessel: Detaildatei, d.h. die LV-Nummer, bei doppelter LV-Nummer mit Zaehler).
+// render() laeuft nur fuer neue Projekte und fuer geaenderte (anderes Objekt, siehe applyDelta());
+// vorhandene Elemente werden nur verschoben. Nicht sichtbare Elemente bekommen bei keepHidden
+// das Attribut hidden, sonst werden sie aus dem DOM genommen (und bleiben im cache).
+function syncKeyed(container, cache, items, visible, render, keepHidden) {
+    const keys = new Set();
+    let cursor = container.firstChild;
+    items.forEach(item => {
+        const key = item._detail;
+        keys.add(key);
+        let entry = cache.get(key);
+        if (entry && entry.item !== item) {
+            if (cursor === entry.el) cursor = cursor.nextSibling;
+            entry.el.remove();
+            entry = null;
+        }
+        if (!entry) {
+            entry = { item, el: render(item) };
+            cache.set(key, entry);
+        }
+        const el = entry.el;
+        const show = visible.has(item);
+        if (!show && !keepHidden) {
+            if (cursor === el) cursor = el.nextSibling;
+            el.remove();
+            return;
+        }
+        if (el.hidden === show) el.hidden = !show;
+        if (cursor === el) cursor = el.nextSibling;
+        else container.insertBefore(el, cursor);
+    });
+    cache.forEach((entry, key) => {
+        if (!keys.has(key)) {
+            entry.el.remove();
+            cache.delete(key);
+        }
+    });
+}
+
+// Gleiche Definitionen wie aggregate() in prototype/dashboarddaten.py
+function computeAggregates(projects) {
+    const agg = {
+        anzahl: projects.length,
+        ampel: {},
+        plan_gesamt: 0,
+        ist_gesamt: 0,
+        validierung: 0,
+        plan_je_jahr: JAHRE.map(() => 0),
+        ist_je_jahr: JAHRE.map(() => 0),
+        leistungsbereich: {},
+        phase: {}
+    };
+    AMPEL_ORDER.forEach(a => agg.ampel[a] = 0);
+    const lbCounts = {};
+    projects.forEach(p => {
+        if (p.ampelstatus in agg.ampel) agg.ampel[p.ampelstatus]++;
+        agg.plan_gesamt += p.plankosten_gesamt || 0;
+        agg.ist_gesamt += p.istkosten_gesamt || 0;
+        if (hasValidationIssues(p)) agg.validierung++;
+        if (p.plankosten_gesamt > 0) {
+            JAHRE.forEach((y, i) => {
+                agg.plan_je_jahr[i] += p[`plankosten_${y}`] || 0;
+                agg.ist_je_jahr[i] += p[`istkosten_${y}`] || 0;
+            });
+        }
+        const lb = getLeistungsbereich(p.lv_nummer);
+        if (lb) lbCounts[lb] = (lbCounts[lb] || 0) + 1;
+        if (p.projektphase) agg.phase[p.projektphase] = (agg.phase[p.projektphase] || 0) + 1;
+    });
+    Object.keys(lbCounts).sort().forEach(lb => agg.leistungsbereich[lb] = lbCounts[lb]);
+    return agg;
+}
+
+// Ohne Filter gelten die vorberechneten Werte aus consolidated.json
+function currentAggregates() {
+    if (!APP_STATE.filterActive && APP_STATE.aggregate) return APP_STATE.aggregate;
+    return computeAggregates(APP_STATE.filteredProjects);
+}
+
 // ---- 4. Meta-Rendering ----
 
 function renderMeta() {
@@ -123,30 +262,21 @@ function renderMeta() {
 
 // ---- 5. KPI-Rendering ----
 
-function renderKPIs() {
-    const projects = APP_STATE.filteredProjects;
-    const n = projects.length;
-
-    document.getElementById('kpiTotalProjects').textContent = n;
+function renderKPIs(agg) {
+    document.getElementById('kpiTotalProjects').textContent = agg.anzahl;
 
     // Ampel
-    const ampelCounts = { 'In Ordnung': 0, 'Vorsicht': 0, 'Krise': 0 };
-    projects.forEach(p => {
-        const a = p.ampelstatus;
-        if (a in ampelCounts) ampelCounts[a]++;
-    });
-    document.getElementById('kpiGruen').textContent = ampelCounts['In Ordnung'];
-    document.getElementById('kpiGelb').textContent = ampelCounts['Vorsicht'];
-    document.getElementById('kpiRot').textContent = ampelCounts['Krise'];
+    document.getElementById('kpiGruen').textContent = agg.ampel['In Ordnung'];
+    document.getElementById('kpiGelb').textContent = agg.ampel['Vorsicht'];
+    document.getElementById('kpiRot').textContent = agg.ampel['Krise'];
 
     // Budget
-    const totalPlan = projects.reduce((s, p) => s + (p.plankosten_gesamt || 0), 0);
-    const totalIst = projects.reduce((s, p) => s + (p.istkosten_gesamt || 0), 0);
+    const totalPlan = agg.plan_gesamt;
     document.getElementById('kpiBudgetTotal').textContent = formatEUR(totalPlan);
-    document.getElementById('kpiBudgetPct').textContent = totalPlan > 0 ? formatPct(totalIst / totalPlan) : '--';
+    document.getElementById('kpiBudgetPct').textContent = totalPlan > 0 ? formatPct(agg.ist_gesamt / totalPlan) : '--';
 
     // Validierung
-    const nIssues = projects.filter(hasValidationIssues).length;
+    const nIssues = agg.validierung;
     document.getElementById('kpiValidierung').textContent = nIssues;
     const card = document.getElementById('kpiValidierung').closest('.kpi-card');
     if (card) card.classList.toggle('kpi-card--has-warnings', nIssues > 0);
@@ -154,55 +284,49 @@ function renderKPIs() {
 
 // ---- 6. Filter-Logik ----
 
+// Ergaenzt fehlende Optionen (bei der Live-Aktualisierung koennen neue Werte hinzukommen)
 function populateFilterDropdowns() {
     const projects = APP_STATE.allProjects;
-
-    // Leistungsbereich
-    const lbs = [...new Set(projects.map(p => p.leistungsbereich).filter(Boolean))].sort();
-    const lbSelect = document.getElementById('filterLeistungsbereich');
-    lbs.forEach(lb => {
-        const opt = document.createElement('option');
-        opt.value = lb;
-        opt.textContent = lb;
-        lbSelect.appendChild(opt);
+    [
+        ['filterLeistungsbereich', 'leistungsbereich'],
+        ['filterPAG', 'pag'],
+        ['filterPhase', 'projektphase']
+    ].forEach(([id, field]) => {
+        const select = document.getElementById(id);
+        const present = new Set([...select.options].map(o => o.value));
+        const values = [...new Set(projects.map(p => p[field]).filter(Boolean))].sort();
+        values.filter(v => !present.has(v)).forEach(v => {
+            const opt = document.createElement('option');
+            opt.value = v;
+            opt.textContent = v;
+            select.appendChild(opt);
+        });
     });
+}
 
-    // PAG
-    const pags = [...new Set(projects.map(p => p.pag).filter(Boolean))].sort();
-    const pagSelect = document.getElementById('filterPAG');
-    pags.forEach(pag => {
-        const opt = document.createElement('option');
-        opt.value = pag;
-        opt.textContent = pag;
-        pagSelect.appendChild(opt);
-    });
+function currentFilter() {
+    return {
+        lb: document.getElementById('filterLeistungsbereich').value,
+        pag: document.getElementById('filterPAG').value,
+        ampel: document.getElementById('filterAmpel').value,
+        phase: document.getElementById('filterPhase').value
+    };
+}
 
-    // Phase
-    const phases = [...new Set(projects.map(p => p.projektphase).filter(Boolean))].sort();
-    const phaseSelect = document.getElementById('filterPhase');
-    phases.forEach(phase => {
-        const opt = document.createElement('option');
-        opt.value = phase;
-        opt.textContent = phase;
-        phaseSelect.appendChild(opt);
-    });
+function matchesFilter(p, f) {
+    if (f.lb && p.leistungsbereich !== f.lb) return false;
+    if (f.pag && p.pag !== f.pag) return false;
+    if (f.ampel && p.ampelstatus !== f.ampel) return false;
+    if (f.phase && p.projektphase !== f.phase) return false;
+    return true;
 }
 
 function applyFilters() {
-    const lb = document.getElementById('filterLeistungsbereich').value;
-    const pag = document.getElementById('filterPAG').value;
-    const ampel = document.getElementById('filterAmpel').value;
-    const phase = document.getElementById('filterPhase').value;
-
-    APP_STATE.filteredProjects = APP_STATE.allProjects.filter(p => {
-        if (lb && p.leistungsbereich !== lb) return false;
-        if (pag && p.pag !== pag) return false;
-        if (ampel && p.ampelstatus !== ampel) return false;
-        if (phase && p.projektphase !== phase) return false;
-        return true;
-    });
+    const f = currentFilter();
+    APP_STATE.filteredProjects = APP_STATE.allProjects.filter(p => matchesFilter(p, f));
 
-    const hasActiveFilter = lb || pag || ampel || phase;
+    const hasActiveFilter = f.lb || f.pag || f.ampel || f.phase;
+    APP_STATE.filterActive = Boolean(hasActiveFilter);
     document.getElementById('filterReset').classList.toggle('is-visible', hasActiveFilter);
 
     renderAll();
@@ -223,72 +347,72 @@ function setupFilterListeners() {
 
 // ---- 7. Ampel-Grid ----
 
+// Eine Karte je Projekt, einmal erzeugt und danach wiederverwendet: bei einem Filterwechsel
+// wird nur hidden der Karten umgeschaltet, deren Sichtbarkeit sich aendert; neu erzeugt wird
+// nur die Karte eines geaenderten Projekts (neues Objekt nach applyDelta())
 function renderAmpelGrid() {
     const grid = document.getElementById('ampelGrid');
-    const projects = APP_STATE.filteredProjects;
-
-    if (projects.length === 0) {
-        grid.innerHTML = '<div class="empty-state">Keine Projekte gefunden.</div>';
-        return;
+    const visible = new Set(APP_STATE.filteredProjects);
+    syncKeyed(grid, APP_STATE.cards, sortByAmpel(APP_STATE.allProjects), visible,
+        p => htmlToElement(ampelCardHtml(p), 'div'), true);
+
+    let empty = grid.querySelector('.empty-state');
+    if (!empty) {
+        empty = htmlToElement('<div class="empty-state">Keine Projekte gefunden.</div>', 'div');
+        grid.appendChild(empty);
     }
+    empty.hidden = visible.size > 0;
+}
 
-    // Sort: Krise first, then Vorsicht, then In Ordnung
-    const sorted = [...projects].sort((a, b) => {
-        const order = { 'Krise': 0, 'Vorsicht': 1, 'In Ordnung': 2 };
-        return (order[a.ampelstatus] ?? 3) - (order[b.ampelstatus] ?? 3);
-    });
+// Sort: Krise first, then Vorsicht, then In Ordnung
+function sortByAmpel(projects) {
+    const order = { 'Krise': 0, 'Vorsicht': 1, 'In Ordnung': 2 };
+    return [...projects].sort((a, b) => (order[a.ampelstatus] ?? 3) - (order[b.ampelstatus] ?? 3));
+}
 
-    grid.innerHTML = sorted.map(p => {
-        const ampelClass = getAmpelClass(p.ampelstatus);
-        const planGesamt = p.plankosten_gesamt || 0;
-        const istGesamt = p.istkosten_gesamt || 0;
-        const budgetPct = planGesamt > 0 ? (istGesamt / planGesamt * 100) : 0;
-        const budgetColor = getBudgetColorClass(budgetPct / 100);
-        const fg = p.fertigstellungsgrad ? (p.fertigstellungsgrad * 100).toFixed(0) + '%' : '0%';
-        const validation = hasValidationIssues(p);
-
-        return `
-        <div class="ampel-card" data-lv="${escapeHtml(p.lv_nummer)}">
-            <div class="ampel-card__header">
-                <span class="ampel ampel--${ampelClass}"></span>
-                <span class="ampel-card__id">${escapeHtml(p.lv_nummer)}</span>
-                ${validation ? '<span class="ampel-card__warning" title="Validierungsproblem">!</span>' : ''}
-            </div>
-            <div class="ampel-card__title">${escapeHtml(p.projektname)}</div>
-            <div class="ampel-card__details">
-                <span>${escapeHtml(p.pag || '')}</span>
-                <span>${escapeHtml(p.projektphase || '')}</span>
-                <span>${fg}</span>
-            </div>
-            <div class="ampel-card__budget">
-                <div class="budget-bar">
-                    <div class="budget-bar__fill budget-bar__fill--${budgetColor}" style="width: ${Math.min(budgetPct, 100)}%"></div>
-                </div>
-                <span class="ampel-card__budget-label">${formatEUR(istGesamt)} / ${formatEUR(planGesamt)} EUR</span>
+function ampelCardHtml(p) {
+    const ampelClass = getAmpelClass(p.ampelstatus);
+    const planGesamt = p.plankosten_gesamt || 0;
+    const istGesamt = p.istkosten_gesamt || 0;
+    const budgetPct = planGesamt > 0 ? (istGesamt / planGesamt * 100) : 0;
+    const budgetColor = getBudgetColorClass(budgetPct / 100);
+    const fg = p.fertigstellungsgrad ? (p.fertigstellungsgrad * 100).toFixed(0) + '%' : '0%';
+    const validation = hasValidationIssues(p);
+
+    return `
+    <div class="ampel-card" data-lv="${escapeHtml(p.lv_nummer)}">
+        <div class="ampel-card__header">
+            <span class="ampel ampel--${ampelClass}"></span>
+            <span class="ampel-card__id">${escapeHtml(p.lv_nummer)}</span>
+            ${validation ? '<span class="ampel-card__warning" title="Validierungsproblem">!</span>' : ''}
+        </div>
+        <div class="ampel-card__title">${escapeHtml(p.projektname)}</div>
+        <div class="ampel-card__details">
+            <span>${escapeHtml(p.pag || '')}</span>
+            <span>${escapeHtml(p.projektphase || '')}</span>
+            <span>${fg}</span>
+        </div>
+        <div class="ampel-card__budget">
+            <div class="budget-bar">
+                <div class="budget-bar__fill budget-bar__fill--${budgetColor}" style="width: ${Math.min(budgetPct, 100)}%"></div>
             </div>
-            <button class="ampel-card__detail-btn" onclick="openDetailModal('${escapeHtml(p.lv_nummer)}')">Details</button>
-        </div>`;
-    }).join('');
+            <span class="ampel-card__budget-label">${formatEUR(istGesamt)} / ${formatEUR(planGesamt)} EUR</span>
+        </div>
+        <button class="ampel-card__detail-btn" onclick="openDetailModal('${escapeHtml(p._detail)}')">Details</button>
+    </div>`;
 }
 
 // ---- 8. Budget-Section ----
 
-function renderBudgetSection() {
+// Geruest, Chart und Tabellenzeilen werden einmal erzeugt und danach nur aktualisiert
+function renderBudgetSection(agg) {
     const container = document.getElementById('budgetContent');
-    const projects = APP_STATE.filteredProjects.filter(p => p.plankosten_gesamt > 0);
-
-    if (projects.length === 0) {
-        container.innerHTML = '<div class="empty-state">Keine Budgetdaten vorhanden.</div>';
-        return;
-    }
-
-    // Chart: Plan vs. Ist nach Jahr
-    const years = ['2025', '2026', '2027'];
-    const planPerYear = years.map(y => projects.reduce((s, p) => s + (p[`plankosten_${y}`] || 0), 0));
-    const istPerYear = years.map(y => projects.reduce((s, p) => s + (p[`istkosten_${y}`] || 0), 0));
+    const visible = new Set(APP_STATE.filteredProjects.filter(p => p.plankosten_gesamt > 0));
 
-    container.innerHTML = `
-        <div class="section__grid section__grid--2col">
+    if (!document.getElementById('budgetTable')) {
+        container.innerHTML = `
+        <div class="empty-state" id="budgetEmpty">Keine Budgetdaten vorhanden.</div>
+        <div class="section__grid section__grid--2col" id="budgetGrid">
             <div class="chart-container chart-container--budget">
                 <canvas id="budgetChart"></canvas>
             </div>
@@ -304,64 +428,70 @@ function renderBudgetSection() {
                         </tr>
                     </thead>
                     <tbody></tbody>
+                    <tfoot></tfoot>
                 </table>
             </div>
         </div>`;
+    }
+    document.getElementById('budgetEmpty').hidden = visible.size > 0;
+    document.getElementById('budgetGrid').hidden = visible.size === 0;
+    if (visible.size === 0) return;
 
     // Chart
-    destroyChart('budgetChart');
-    APP_STATE.charts.budgetChart = new Chart(document.getElementById('budgetChart'), {
-        type: 'bar',
-        data: {
-            labels: years,
-            datasets: [
-                { label: 'Plan', data: planPerYear, backgroundColor: '#1F4E79' },
-                { label: 'Ist', data: istPerYear, backgroundColor: '#2E86AB' }
-            ]
-        },
-        options: {
-            responsive: true,
-            maintainAspectRatio: false,
-            plugins: {
-                title: { display: true, text: 'Budget: Plan vs. Ist nach Jahr' },
-                tooltip: {
-                    callbacks: {
-                        label: ctx => ctx.dataset.label + ': ' + eurFormatter.format(ctx.raw) + ' EUR'
+    if (!updateChart('budgetChart', agg)) {
+        APP_STATE.charts.budgetChart = new Chart(document.getElementById('budgetChart'), {
+            type: 'bar',
+            data: chartData.budgetChart(agg),
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    title: { display: true, text: 'Budget: Plan vs. Ist nach Jahr' },
+                    tooltip: {
+                        callbacks: {
+                            label: ctx => ctx.dataset.label + ': ' + eurFormatter.format(ctx.raw) + ' EUR'
+                        }
+                    }
+                },
+                scales: {
+                    y: {
+                        ticks: { callback: v => eurFormatter.format(v) }
                     }
-                }
-            },
-            scales: {
-                y: {
-                    ticks: { callback: v => eurFormatter.format(v) }
                 }
             }
-        }
-    });
-
-    // Table
-    const tbody = container.querySelector('tbody');
-    const sorted = [...projects].sort((a, b) => (b.plankosten_gesamt || 0) - (a.plankosten_gesamt || 0));
-    let totalPlan = 0, totalIst = 0;
+        });
+    }
 
-    sorted.forEach(p => {
-        const plan = p.plankosten_gesamt || 0;
-        const ist = p.istkosten_gesamt || 0;
-        const pct = plan > 0 ? ist / plan : 0;
-        totalPlan += plan;
-        totalIst += ist;
+    // Table: ausgefilterte Zeilen werden aus dem DOM genommen (Zebra-Streifen bleiben korrekt)
+    const sorted = APP_STATE.allProjects.filter(p => p.plankosten_gesamt > 0)
+        .sort((a, b) => (b.plankosten_gesamt || 0) - (a.plankosten_gesamt || 0));
+    syncKeyed(container.querySelector('tbody'), APP_STATE.budgetRows, sorted, visible,
+        p => htmlToElement(budgetRowHtml(p), 'tbody'), false);
+    container.querySelector('tfoot').innerHTML = budgetTotalHtml([...visible]);
+}
 
-        const pctClass = pct > 0.8 ? 'value--missed' : pct > 0.6 ? 'value--warning' : '';
-        tbody.innerHTML += `<tr>
+function budgetRowHtml(p) {
+    const plan = p.plankosten_gesamt || 0;
+    const ist = p.istkosten_gesamt || 0;
+    const pct = plan > 0 ? ist / plan : 0;
+    const pctClass = pct > 0.8 ? 'value--missed' : pct > 0.6 ? 'value--warning' : '';
+    return `<tr>
             <td>${escapeHtml(p.lv_nummer)}</td>
             <td>${escapeHtml(String(p.projektname || '').substring(0, 40))}</td>
             <td class="text-right">${eurFormatter.format(plan)}</td>
             <td class="text-right">${eurFormatter.format(ist)}</td>
             <td class="text-right ${pctClass}">${formatPct(pct)}</td>
         </tr>`;
-    });
+}
 
+function budgetTotalHtml(projects) {
+    let totalPlan = 0, totalIst = 0;
+    projects.forEach(p => {
+        totalPlan += p.plankosten_gesamt || 0;
+        totalIst += p.istkosten_gesamt || 0;
+    });
     const totalPct = totalPlan > 0 ? totalIst / totalPlan : 0;
-    tbody.innerHTML += `<tr class="data-table__total">
+    return `<tr class="data-table__total">
         <td colspan="2"><strong>Gesamt</strong></td>
         <td class="text-right"><strong>${eurFormatter.format(totalPlan)}</strong></td>
         <td class="text-right"><strong>${eurFormatter.format(totalIst)}</strong></td>
@@ -371,87 +501,68 @@ function renderBudgetSection() {
 
 // ---- 9. Verteilungs-Charts ----
 
-function renderDistributionCharts() {
+// Charts werden einmal angelegt; danach nur noch Labels und Datensaetze aktualisiert
+function renderDistributionCharts(agg) {
     const container = document.getElementById('verteilungContent');
-    const projects = APP_STATE.filteredProjects;
 
-    container.innerHTML = `
+    if (!document.getElementById('chartAmpel')) {
+        container.innerHTML = `
         <div class="section__grid section__grid--3col">
             <div class="chart-container"><canvas id="chartAmpel"></canvas></div>
             <div class="chart-container"><canvas id="chartLeistungsbereich"></canvas></div>
             <div class="chart-container"><canvas id="chartPhase"></canvas></div>
         </div>`;
+    }
 
     // Ampel-Donut
-    const ampelCounts = {};
-    AMPEL_ORDER.forEach(a => ampelCounts[a] = 0);
-    projects.forEach(p => { if (p.ampelstatus in ampelCounts) ampelCounts[p.ampelstatus]++; });
-    const ampelLabels = AMPEL_ORDER.filter(a => ampelCounts[a] > 0);
-    const ampelValues = ampelLabels.map(a => ampelCounts[a]);
-    const ampelColors = ampelLabels.map(a => AMPEL_COLORS[a].color);
-
-    destroyChart('chartAmpel');
-    APP_STATE.charts.chartAmpel = new Chart(document.getElementById('chartAmpel'), {
-        type: 'doughnut',
-        data: { labels: ampelLabels, datasets: [{ data: ampelValues, backgroundColor: ampelColors }] },
-        options: {
-            responsive: true, maintainAspectRatio: false,
-            plugins: { title: { display: true, text: 'Ampelverteilung' } }
-        }
-    });
+    if (!updateChart('chartAmpel', agg)) {
+        APP_STATE.charts.chartAmpel = new Chart(document.getElementById('chartAmpel'), {
+            type: 'doughnut',
+            data: chartData.chartAmpel(agg),
+            options: {
+                responsive: true, maintainAspectRatio: false,
+                plugins: { title: { display: true, text: 'Ampelverteilung' } }
+            }
+        });
+    }
 
     // Leistungsbereich-Pie
-    const lbCounts = {};
-    projects.forEach(p => {
-        const lb = getLeistungsbereich(p.lv_nummer);
-        if (lb) lbCounts[lb] = (lbCounts[lb] || 0) + 1;
-    });
-    const lbLabels = Object.keys(lbCounts).sort();
-    const lbValues = lbLabels.map(l => lbCounts[l]);
-    const lbColors = lbLabels.map(l => LEISTUNGSBEREICH_COLORS[l] || '#999');
-    const lbDisplayLabels = lbLabels.map(l => LEISTUNGSBEREICH_LABELS[l] || l);
-
-    destroyChart('chartLeistungsbereich');
-    APP_STATE.charts.chartLeistungsbereich = new Chart(document.getElementById('chartLeistungsbereich'), {
-        type: 'pie',
-        data: { labels: lbDisplayLabels, datasets: [{ data: lbValues, backgroundColor: lbColors }] },
-        options: {
-            responsive: true, maintainAspectRatio: false,
-            plugins: { title: { display: true, text: 'Nach Leistungsbereich' } }
-        }
-    });
+    if (!updateChart('chartLeistungsbereich', agg)) {
+        APP_STATE.charts.chartLeistungsbereich = new Chart(document.getElementById('chartLeistungsbereich'), {
+            type: 'pie',
+            data: chartData.chartLeistungsbereich(agg),
+            options: {
+                responsive: true, maintainAspectRatio: false,
+                plugins: { title: { display: true, text: 'Nach Leistungsbereich' } }
+            }
+        });
+    }
 
     // Phase-Bar
-    const phaseCounts = {};
-    projects.forEach(p => { if (p.projektphase) phaseCounts[p.projektphase] = (phaseCounts[p.projektphase] || 0) + 1; });
-    const phaseLabels = Object.keys(phaseCounts);
-    const phaseValues = phaseLabels.map(l => phaseCounts[l]);
-    const phaseColors = phaseLabels.map(l => PHASE_COLORS[l] || '#999');
-
-    destroyChart('chartPhase');
-    APP_STATE.charts.chartPhase = new Chart(document.getElementById('chartPhase'), {
-        type: 'bar',
-        data: {
-            labels: phaseLabels,
-            datasets: [{ data: phaseValues, backgroundColor: phaseColors }]
-        },
-        options: {
-            responsive: true, maintainAspectRatio: false,
-            indexAxis: 'y',
-            plugins: {
-                title: { display: true, text: 'Nach Projektphase' },
-                legend: { display: false }
-            },
-            scales: { x: { beginAtZero: true, ticks: { stepSize: 1 } } }
-        }
-    });
+    if (!updateChart('chartPhase', agg)) {
+        APP_STATE.charts.chartPhase = new Chart(document.getElementById('chartPhase'), {
+            type: 'bar',
+            data: chartData.chartPhase(agg),
+            options: {
+                responsive: true, maintainAspectRatio: false,
+                indexAxis: 'y',
+                plugins: {
+                    title: { display: true, text: 'Nach Projektphase' },
+                    legend: { display: false }
+                },
+                scales: { x: { beginAtZero: true, ticks: { stepSize: 1 } } }
+            }
+        });
+    }
 }
 
 // ---- 10. Detail-Modal ----
 
-function openDetailModal(lv_nummer) {
-    const p = APP_STATE.allProjects.find(x => x.lv_nummer === lv_nummer);
+// Schluessel ist die Detaildatei (_detail): eindeutig, auch wenn eine LV-Nummer mehrfach vorkommt
+async function openDetailModal(name) {
+    const p = APP_STATE.allProjects.find(x => x._detail === name);
     if (!p) return;
+    APP_STATE.openDetail = name;
 
     const ampelClass = getAmpelClass(p.ampelstatus);
     document.getElementById('modalAmpel').className = 'ampel ampel--' + ampelClass;
@@ -474,11 +585,8 @@ function openDetailModal(lv_nummer) {
         <div class="modal__meta-item"><strong>Istkosten:</strong> ${formatEUR(p.istkosten_gesamt)} EUR (${formatPct(p.istkosten_prozent)})</div>
     `;
 
-    document.getElementById('modalKurzbeschreibung').textContent = p.kurzbeschreibung || 'Keine Kurzbeschreibung vorhanden.';
-    document.getElementById('modalMeilensteine').textContent = p.meilensteine || 'Keine Meilensteine erfasst.';
-    document.getElementById('modalStatus').textContent = p.status_aktuell || 'Kein Statusbericht vorhanden.';
-    document.getElementById('modalRisiken').textContent = p.risiken_aktuell || 'Keine Risiken erfasst.';
-    document.getElementById('modalEntscheidung').textContent = p.entscheidung_aktuell || 'Kein Entscheidungsbedarf.';
+    // Langtexte kommen aus der Detaildatei; bis dahin Platzhalter
+    renderDetailTexts(null);
 
     // Validierung
     const valSection = document.getElementById('modalValidierungSection');
@@ -492,9 +600,28 @@ function openDetailModal(lv_nummer) {
 
     document.getElementById('modalBackdrop').classList.add('is-open');
     document.body.style.overflow = 'hidden';
+
+    try {
+        const detail = await loadDetail(p);
+        // Inzwischen ein anderes Projekt geoeffnet: dessen Texte nicht ueberschreiben
+        if (APP_STATE.openDetail === name) renderDetailTexts(detail);
+    } catch (err) {
+        console.error('[Dashboard]', err);
+        if (APP_STATE.openDetail === name) renderDetailTexts(null, 'Details konnten nicht geladen werden.');
+    }
+}
+
+function renderDetailTexts(d, placeholder = 'Wird geladen …') {
+    const text = (value, empty) => d ? (value || empty) : placeholder;
+    document.getElementById('modalKurzbeschreibung').textContent = text(d && d.kurzbeschreibung, 'Keine Kurzbeschreibung vorhanden.');
+    document.getElementById('modalMeilensteine').textContent = text(d && d.meilensteine, 'Keine Meilensteine erfasst.');
+    document.getElementById('modalStatus').textContent = text(d && d.status_aktuell, 'Kein Statusbericht vorhanden.');
+    document.getElementById('modalRisiken').textContent = text(d && d.risiken_aktuell, 'Keine Risiken erfasst.');
+    document.getElementById('modalEntscheidung').textContent = text(d && d.entscheidung_aktuell, 'Kein Entscheidungsbedarf.');
 }
 
 function closeDetailModal() {
+    APP_STATE.openDetail = null;
     document.getElementById('modalBackdrop').classList.remove('is-open');
     document.body.style.overflow = '';
 }
@@ -511,28 +638,128 @@ function setupModalListeners() {
 
 // ---- 11. Chart-Verwaltung ----
 
-function destroyChart(id) {
-    if (APP_STATE.charts[id]) {
-        APP_STATE.charts[id].destroy();
-        delete APP_STATE.charts[id];
+// Labels und Datensaetze je Chart aus den Aggregaten (fuer Neuanlage und updateChart())
+const chartData = {
+    budgetChart: agg => ({
+        labels: JAHRE,
+        datasets: [
+            { label: 'Plan', data: agg.plan_je_jahr, backgroundColor: '#1F4E79' },
+            { label: 'Ist', data: agg.ist_je_jahr, backgroundColor: '#2E86AB' }
+        ]
+    }),
+    chartAmpel: agg => {
+        const labels = AMPEL_ORDER.filter(a => agg.ampel[a] > 0);
+        return {
+            labels,
+            datasets: [{ data: labels.map(a => agg.ampel[a]), backgroundColor: labels.map(a => AMPEL_COLORS[a].color) }]
+        };
+    },
+    chartLeistungsbereich: agg => {
+        const lbs = Object.keys(agg.leistungsbereich);
+        return {
+            labels: lbs.map(l => LEISTUNGSBEREICH_LABELS[l] || l),
+            datasets: [{ data: lbs.map(l => agg.leistungsbereich[l]), backgroundColor: lbs.map(l => LEISTUNGSBEREICH_COLORS[l] || '#999') }]
+        };
+    },
+    chartPhase: agg => {
+        const phases = Object.keys(agg.phase);
+        return {
+            labels: phases,
+            datasets: [{ data: phases.map(l => agg.phase[l]), backgroundColor: phases.map(l => PHASE_COLORS[l] || '#999') }]
+        };
     }
-}
+};
 
-function destroyAllCharts() {
-    Object.keys(APP_STATE.charts).forEach(destroyChart);
+// Bestehendes Chart mit neuen Daten aktualisieren (Datensatz-Objekte bleiben erhalten);
+// false, wenn das Chart nicht existiert
+function updateChart(id, agg) {
+    const chart = APP_STATE.charts[id];
+    if (!chart) return false;
+    const data = chartData[id](agg);
+    chart.data.labels = data.labels;
+    data.datasets.forEach((ds, i) => Object.assign(chart.data.datasets[i], ds));
+    chart.update();
+    return true;
 }
 
 // ---- 12. Haupt-Render-Funktion ----
 
+// Inkrementell: Charts, Karten und Tabellenzeilen bleiben erhalten und werden nur aktualisiert
+// (Filterwechsel, Live-Aktualisierung); erzeugt wird nur, was noch fehlt oder sich geaendert hat
 function renderAll() {
-    destroyAllCharts();
-    renderKPIs();
+    const agg = currentAggregates();
+    renderKPIs(agg);
     renderAmpelGrid();
-    renderBudgetSection();
-    renderDistributionCharts();
+    renderBudgetSection(agg);
+    renderDistributionCharts(agg);
+}
+
+// ---- 13. Live-Aktualisierung ----
+
+// Delta aus prototype/dashboarddaten.py delta(): geaenderte Projekte austauschen; renderAll()
+// erzeugt danach nur deren Karten und Tabellenzeilen neu und aktualisiert die Charts in place
+function applyDelta(delta) {
+    if (delta.format !== DATA_FORMAT) {
+        location.reload();
+        return;
+    }
+    const byDetail = new Map(APP_STATE.allProjects.map(p => [p._detail, p]));
+    const alt = new Map(byDetail);
+    delta.entfernt.forEach(name => byDetail.delete(name));
+    delta.projekte.forEach(p => byDetail.set(p._detail, p));
+    [...delta.entfernt, ...delta.details, ...delta.projekte.map(p => p._detail)]
+        .forEach(name => APP_STATE.details.delete(name));
+
+    APP_STATE.allProjects = delta.reihenfolge
+        ? delta.reihenfolge.map(name => byDetail.get(name)).filter(Boolean)
+        : APP_STATE.allProjects.map(p => byDetail.get(p._detail));
+    APP_STATE.meta = delta.meta;
+    APP_STATE.aggregate = delta.aggregate;
+    const f = currentFilter();
+    APP_STATE.filteredProjects = APP_STATE.allProjects.filter(p => matchesFilter(p, f));
+
+    renderMeta();
+    populateFilterDropdowns();
+    renderAll();
+
+    // Offener Detail-Dialog zeigt das aktualisierte Projekt
+    const open = APP_STATE.openDetail;
+    if (open) {
+        const p = byDetail.get(open);
+        if (!p) closeDetailModal();
+        else if (p !== alt.get(open) || delta.details.includes(open)) openDetailModal(open);
+    }
+}
+
+async function reloadData() {
+    await loadData();
+    APP_STATE.details.clear();
+    renderMeta();
+    populateFilterDropdowns();
+    applyFilters();
+}
+
+// Nur wenn ueber start_dashboard.py ausgeliefert; ohne --beobachten antwortet der Server
+// mit 204 und EventSource verbindet sich nicht erneut. seit = Ereignis-ID der geladenen Daten:
+// der Server schickt alle danach gesendeten Deltas nach (auch die vor dem Verbinden)
+function connectLiveUpdates() {
+    if (!window.EventSource || !location.protocol.startsWith('http')) return;
+    const seit = APP_STATE.meta.ereignis;
+    const events = new EventSource(seit == null ? 'events' : 'events?seit=' + encodeURIComponent(seit));
+    events.addEventListener('delta', e => {
+        try {
+            applyDelta(JSON.parse(e.data));
+        } catch (err) {
+            console.error('[Dashboard]', err);
+            reloadData().catch(err => console.error('[Dashboard]', err));
+        }
+    });
+    // Verbindung war zu lange unterbrochen: alles neu laden
+    events.addEventListener('neu', () => reloadData().catch(err => console.error('[Dashboard]', err)));
+    APP_STATE.events = events;
 }
 
-// ---- 13. Initialisierung ----
+// ---- 14. Initialisierung ----
 
 document.addEventListener('DOMContentLoaded', async () => {
     try {
@@ -542,6 +769,7 @@ document.addEventListener('DOMContentLoaded', async () => {
         setupFilterListeners();
         setupModalListeners();
         renderAll();
+        connectLiveUpdates();
     } catch (err) {
         console.error('[Dashboard]', err);
         document.getElementById('ampelGrid').innerHTML =
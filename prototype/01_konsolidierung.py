@@ -2,47 +2,68 @@
 01_konsolidierung.py — PSBs + SAP einlesen, validieren, konsolidiertes Excel exportieren.
 
 Ausfuehrung: python 01_konsolidierung.py
-Ergebnis:    output/review/konsolidiert.xlsx
+Ergebnis:    output/review/konsolidiert.xlsx (Durchsicht), output/review/konsolidiert.parquet (Folgestufen),
+             output/review/meilensteine.parquet (Meilenstein-Termine fuer die Gantt-Zeitleiste)
 """
 
 import sys
+import copy
+import hashlib
+import pickle
+import time
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, date
 from typing import Any
 
 import openpyxl
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 import pandas as pd
 import numpy as np
 
 from config import (
-    PSB_DIR, DASHBOARD_FILE, SAP_FILE,
-    OUTPUT_REVIEW,
+    DASHBOARD_FILE, SAP_FILE,
+    KONSOLIDIERT_XLSX,
     AMPEL_NORM, PAG_NORM, PHASE_NORM,
     PSB_CELLS, PSB_MEILENSTEIN_ROWS, PSB_MEILENSTEIN_COLS,
-    PSB_TEXT_RANGES, PSB_ZIELWERT_CELLS,
-    DASHBOARD_COLS, FEIERTAGE, AMPEL_FARBEN, STICHTAG, QUARTAL,
+    PSB_TEXT_RANGES, PSB_ZIELWERT_CELLS, PSB_WORKERS,
+    PSB_CACHE_AKTIV, PSB_CACHE_FILE, PSB_CACHE_MAX_EINTRAEGE,
+    DASHBOARD_COLS, AMPEL_FARBEN, STICHTAG, QUARTAL, feiertage, psb_dateien,
 )
+from datenbasis import export_spalten, schreibe_parquet, schreibe_meilensteine, MEILENSTEIN_SPALTEN
+from excelexport import schreibe_tabelle, zeilenwerte, ampel
 
 
 # =============================================================================
 # 1. PSB-Reader
 # =============================================================================
 
-def _get_merged_value(ws, cell_ref: str) -> Any:
-    """Liest den Wert einer Zelle, auch wenn sie Teil einer Merged-Region ist."""
+def _merged_index(ws) -> dict[tuple[int, int], tuple[int, int]]:
+    """Baut einmal pro Sheet einen Index (Zeile, Spalte) → linke obere Zelle der Merged-Region."""
+    index = {}
+    for merged_range in ws.merged_cells.ranges:
+        top_left = (merged_range.min_row, merged_range.min_col)
+        for row in range(merged_range.min_row, merged_range.max_row + 1):
+            for col in range(merged_range.min_col, merged_range.max_col + 1):
+                index[(row, col)] = top_left
+    return index
+
+
+def _get_merged_value(ws, cell_ref: str, merged_index: dict) -> Any:
+    """Liest den Wert einer Zelle, auch wenn sie Teil einer Merged-Region ist.
+
+    merged_index: _merged_index(ws), einmal pro Sheet gebaut und fuer alle Lookups verwendet.
+    """
     cell = ws[cell_ref]
     if cell.value is not None:
         return cell.value
-    for merged_range in ws.merged_cells.ranges:
-        if cell.coordinate in merged_range:
-            top_left = ws.cell(row=merged_range.min_row, column=merged_range.min_col)
-            return top_left.value
+    top_left = merged_index.get((cell.row, cell.column))
+    if top_left is not None:
+        return ws.cell(row=top_left[0], column=top_left[1]).value
     return None
 
 
-def _read_text_block(ws, start_ref: str, end_ref: str) -> str:
+def _read_text_block(ws, start_ref: str, end_ref: str, merged_index: dict) -> str:
     """Liest einen Merged-Textblock und gibt den zusammengefuegten Text zurueck."""
     start_cell = ws[start_ref]
     start_row, start_col = start_cell.row, start_cell.column
@@ -56,7 +77,7 @@ def _read_text_block(ws, start_ref: str, end_ref: str) -> str:
             if val is not None:
                 texts.append(str(val).strip())
     # Auch merged-cell Wert pruefen
-    merged_val = _get_merged_value(ws, start_ref)
+    merged_val = _get_merged_value(ws, start_ref, merged_index)
     if merged_val and str(merged_val).strip() not in texts:
         texts.insert(0, str(merged_val).strip())
     return "\n".join(texts) if texts else ""
@@ -106,12 +127,13 @@ def read_psb(filepath: Path) -> dict:
     """Liest einen einzelnen PSB ein und gibt ein Dictionary mit allen Feldern zurueck."""
     wb = openpyxl.load_workbook(filepath, data_only=True)
     ws = wb["Statusbericht"]
+    merged_index = _merged_index(ws)
 
     record = {}
 
     # Identifikation
     for key, cell_ref in PSB_CELLS.items():
-        record[key] = _get_merged_value(ws, cell_ref)
+        record[key] = _get_merged_value(ws, cell_ref, merged_index)
 
     # Normalisierungen
     if record.get("ampelstatus"):
@@ -162,12 +184,12 @@ def read_psb(filepath: Path) -> dict:
 
     # Textbloecke
     for key, (start, end) in PSB_TEXT_RANGES.items():
-        record[key] = _read_text_block(ws, start, end)
+        record[key] = _read_text_block(ws, start, end, merged_index)
 
     # Zielwerte
     zielwerte = {}
     for key, cell_ref in PSB_ZIELWERT_CELLS.items():
-        zielwerte[key] = _get_merged_value(ws, cell_ref)
+        zielwerte[key] = _get_merged_value(ws, cell_ref, merged_index)
     record["zielwerte"] = zielwerte
 
     # Start-Datum: erstes Meilenstein-Plan-Datum
@@ -186,70 +208,223 @@ def read_psb(filepath: Path) -> dict:
     return record
 
 
-def read_all_psbs() -> list[dict]:
-    """Liest alle PSB-Dateien im PSB_DIR ein."""
+# --- PSB-Cache ---
+
+# Bei Aenderungen an read_psb() erhoehen, damit alte Cache-Eintraege verworfen werden
+_PSB_CACHE_VERSION = 1
+
+
+def _mapping_fingerprint() -> str:
+    """Hash ueber alle Zellpositionen und Normalisierungen, die read_psb() verwendet."""
+    mapping = (
+        _PSB_CACHE_VERSION,
+        PSB_CELLS, list(PSB_MEILENSTEIN_ROWS), PSB_MEILENSTEIN_COLS,
+        PSB_TEXT_RANGES, PSB_ZIELWERT_CELLS,
+        AMPEL_NORM, PAG_NORM, PHASE_NORM,
+    )
+    return hashlib.sha256(repr(mapping).encode("utf-8")).hexdigest()
+
+
+def _datei_hash(filepath: Path) -> str:
+    """SHA-256 ueber den Dateiinhalt."""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class PSBCache:
+    """Persistenter Cache fuer read_psb()-Ergebnisse, Schluessel ist der Datei-Hash.
+
+    Der Cache wird komplett verworfen, wenn sich das Zellmapping in config.py aendert.
+    Ueberschreitet er max_eintraege, werden die am laengsten nicht genutzten Eintraege entfernt."""
+
+    def __init__(self, pfad: Path = PSB_CACHE_FILE, max_eintraege: int = PSB_CACHE_MAX_EINTRAEGE):
+        self.pfad = pfad
+        self.max_eintraege = max_eintraege
+        self.fingerprint = _mapping_fingerprint()
+        self.eintraege = {}  # datei_hash -> (letzte_nutzung, record)
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self.verdraengt = 0
+        self._geaendert = False
+        self._laden()
+
+    def _laden(self):
+        if not self.pfad.exists():
+            return
+        try:
+            with open(self.pfad, "rb") as f:
+                daten = pickle.load(f)
+        except Exception:
+            self._geaendert = True  # Defekter Cache wird beim Sichern ueberschrieben
+            return
+        if daten.get("fingerprint") != self.fingerprint:
+            self._geaendert = True  # Mapping geaendert: alle Eintraege ungueltig
+            return
+        self.eintraege = daten.get("eintraege", {})
+
+    def hole(self, datei_hash: str) -> dict | None:
+        eintrag = self.eintraege.get(datei_hash)
+        if eintrag is None:
+            self.fehlschlaege += 1
+            return None
+        self.treffer += 1
+        self.eintraege[datei_hash] = (time.time(), eintrag[1])
+        self._geaendert = True
+        return copy.deepcopy(eintrag[1])
+
+    def speichere(self, datei_hash: str, record: dict):
+        record = {k: v for k, v in record.items() if k != "_quelldatei"}
+        self.eintraege[datei_hash] = (time.time(), record)
+        self._geaendert = True
+
+    def leeren(self):
+        """Verwirft alle Eintraege (z.B. nach Aenderungen an der Einlese-Logik)."""
+        self.eintraege.clear()
+        self._geaendert = True
+
+    def sichern(self):
+        """Schreibt den Cache auf die Platte und verdraengt dabei die aeltesten Eintraege."""
+        if not self._geaendert:
+            return
+        ueberschuss = len(self.eintraege) - self.max_eintraege
+        if ueberschuss > 0:
+            aelteste = sorted(self.eintraege, key=lambda h: self.eintraege[h][0])[:ueberschuss]
+            for h in aelteste:
+                del self.eintraege[h]
+            self.verdraengt += ueberschuss
+        self.pfad.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.pfad.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"fingerprint": self.fingerprint, "eintraege": self.eintraege}, f)
+        tmp.replace(self.pfad)
+        self._geaendert = False
+
+    def statistik(self) -> str:
+        return (f"{self.treffer} Treffer, {self.fehlschlaege} neu eingelesen, "
+                f"{self.verdraengt} verdraengt, {len(self.eintraege)} Eintraege")
+
+
+def _read_psb_job(filepath: Path) -> tuple[dict | None, str | None]:
+    """Liest einen PSB und faengt Fehler ab, damit ein defekter PSB den Lauf nicht abbricht.
+    Auf Modulebene, damit der Job an Worker-Prozesse uebergeben werden kann."""
+    try:
+        psb = read_psb(filepath)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    psb["_quelldatei"] = filepath.name
+    return psb, None
+
+
+def read_all_psbs(workers: int | None = None, cache: PSBCache | None = None,
+                  dateien: list[Path] | None = None) -> tuple[list[dict], list[tuple[str, str]]]:
+    """Liest alle PSB-Dateien im PSB_DIR (oder nur dateien) ein, bei workers > 1 parallel
+    in Worker-Prozessen.
+
+    Mit cache werden nur neue oder geaenderte Dateien eingelesen, alle anderen kommen
+    aus dem Cache. Die Reihenfolge entspricht immer den sortierten Dateinamen. Fehlerhafte
+    Dateien werden uebersprungen und als (Dateiname, Fehlermeldung) zurueckgegeben."""
+    if workers is None:
+        workers = PSB_WORKERS
+    if dateien is None:
+        dateien = psb_dateien()
+
+    ergebnisse = {}
+    hashes = {}
+    if cache is not None:
+        for f in dateien:
+            hashes[f] = _datei_hash(f)
+            psb = cache.hole(hashes[f])
+            if psb is not None:
+                psb["_quelldatei"] = f.name
+                ergebnisse[f] = (psb, None)
+    zu_lesen = [f for f in dateien if f not in ergebnisse]
+
+    if workers > 1 and len(zu_lesen) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(zu_lesen))) as pool:
+            ergebnisse.update(zip(zu_lesen, pool.map(_read_psb_job, zu_lesen)))
+    else:
+        for f in zu_lesen:
+            ergebnisse[f] = _read_psb_job(f)
+
     psbs = []
-    for f in sorted(PSB_DIR.glob("PSB_*.xlsx")):
-        if f.name.startswith("~$"):
+    fehler = []
+    for f in dateien:
+        psb, err = ergebnisse[f]
+        if err:
+            print(f"  FEHLER beim Lesen: {f.name} ({err})")
+            fehler.append((f.name, err))
             continue
-        print(f"  Lese PSB: {f.name}")
-        psb = read_psb(f)
-        psb["_quelldatei"] = f.name
+        if f in zu_lesen:
+            print(f"  Lese PSB: {f.name}")
+            if cache is not None:
+                cache.speichere(hashes[f], psb)
         psbs.append(psb)
-    return psbs
+
+    if cache is not None:
+        cache.sichern()
+    return psbs, fehler
 
 
 # =============================================================================
 # 2. SAP-Reader
 # =============================================================================
 
-def read_sap() -> pd.DataFrame:
-    """Liest SAP-Finanzdaten ein. Betraege werden negiert (Ausgaben → positiv)."""
-    wb = openpyxl.load_workbook(SAP_FILE, data_only=True)
+# Spalten im SAP-Auszug (0-basiert, ab Spalte D: Plan/Ist je Jahr)
+_SAP_BETRAG_COLS = {
+    3: "plankosten_2025",
+    4: "istkosten_2025",
+    5: "plankosten_2026",
+    6: "istkosten_2026",
+    7: "plankosten_2027",
+}
+
+_LV_NR_PATTERN = r"[A-D]\d+(?:\.\d+)*"
+
+
+def read_sap(pfad: Path = SAP_FILE) -> pd.DataFrame:
+    """Liest SAP-Finanzdaten ein. Betraege werden negiert (Ausgaben → positiv).
+
+    Das Sheet wird im read-only-Modus zeilenweise gestreamt; es werden nur die benoetigten
+    Spalten gesammelt, Betragsumrechnung und Budget-Teilung laufen vektorisiert."""
+    wb = openpyxl.load_workbook(pfad, read_only=True, data_only=True)
     ws = wb.active
 
-    records = []
-    for row in ws.iter_rows(min_row=5, values_only=False):
-        vals = [c.value for c in row]
-        if not vals[0]:
+    n_cols = max(_SAP_BETRAG_COLS) + 1
+    le_nummern, objekt_texte = [], []
+    betraege = {name: [] for name in _SAP_BETRAG_COLS.values()}
+    for vals in ws.iter_rows(min_row=5, max_col=n_cols, values_only=True):
+        if not vals or not vals[0]:
             continue
-        le_nummer = str(vals[0]).strip()
-        objekt_text = str(vals[1]).strip() if vals[1] else ""
-
-        # LV-Nrn aus Objekt-Text extrahieren (kann mehrere enthalten)
-        lv_nrs = _extract_lv_nrs(objekt_text)
-
-        def neg(v):
-            """Negiert Betraege (SAP: negativ = Ausgabe)."""
-            if v is None:
-                return 0.0
-            try:
-                return abs(float(v))
-            except (ValueError, TypeError):
-                return 0.0
-
-        base = {
-            "le_nummer": le_nummer,
-            "objekt_text": objekt_text,
-            "kostenstelle": le_nummer,
-            "plankosten_2025": neg(vals[3]),
-            "istkosten_2025": neg(vals[4]),
-            "plankosten_2026": neg(vals[5]),
-            "istkosten_2026": neg(vals[6]),
-            "plankosten_2027": neg(vals[7]),
-        }
-        # Eine Zeile pro LV-Nr (bei Mehrfach-Zuordnung wird Budget geteilt)
-        for lv_nr in (lv_nrs or [objekt_text]):
-            rec = {**base, "lv_nr_sap": lv_nr}
-            if len(lv_nrs) > 1:
-                for k in ["plankosten_2025", "istkosten_2025", "plankosten_2026",
-                           "istkosten_2026", "plankosten_2027"]:
-                    rec[k] = base[k] / len(lv_nrs)
-            records.append(rec)
+        vals = tuple(vals) + (None,) * (n_cols - len(vals))
+        le_nummern.append(str(vals[0]).strip())
+        objekt_texte.append(str(vals[1]).strip() if vals[1] else "")
+        for col_idx, name in _SAP_BETRAG_COLS.items():
+            betraege[name].append(vals[col_idx])
 
     wb.close()
 
-    df = pd.DataFrame(records)
+    df = pd.DataFrame({"le_nummer": le_nummern, "objekt_text": objekt_texte}, dtype=str)
+    df["kostenstelle"] = df["le_nummer"]
+    # SAP: negativ = Ausgabe; nicht numerische Werte zaehlen als 0
+    for name, werte in betraege.items():
+        df[name] = pd.to_numeric(pd.Series(werte, dtype=object), errors="coerce").abs().fillna(0.0).astype(float)
+
+    # LV-Nrn aus Objekt-Text extrahieren (kann mehrere enthalten)
+    lv_nrs = df["objekt_text"].str.findall(_LV_NR_PATTERN)
+    anzahl = lv_nrs.str.len()
+    # Ohne erkannte LV-Nr bleibt der Objekt-Text als Schluessel
+    df["lv_nr_sap"] = lv_nrs.where(anzahl > 0, df["objekt_text"].map(lambda t: [t]))
+
+    # Eine Zeile pro LV-Nr (bei Mehrfach-Zuordnung wird Budget geteilt)
+    teiler = anzahl.clip(lower=1).to_numpy(dtype=float)
+    betrag_cols = list(_SAP_BETRAG_COLS.values())
+    df[betrag_cols] = df[betrag_cols].to_numpy() / teiler[:, None]
+    df = df.explode("lv_nr_sap", ignore_index=True)
+
     # Plankosten Gesamt
     df["plankosten_gesamt"] = df["plankosten_2025"] + df["plankosten_2026"] + df["plankosten_2027"]
     # Istkosten 2027 noch nicht vorhanden
@@ -268,7 +443,7 @@ def _extract_lv_nrs(text: str) -> list[str]:
     z.B. 'D3.3.2+D3.3.3 Bauvorhaben' → ['D3.3.2', 'D3.3.3']
     z.B. 'A1.1.1.1.1 Labor' → ['A1.1.1.1.1']"""
     import re
-    return re.findall(r"[A-D]\d+(?:\.\d+)*", text)
+    return re.findall(_LV_NR_PATTERN, text)
 
 
 # =============================================================================
@@ -309,43 +484,123 @@ def read_dashboard_ppm_fields() -> pd.DataFrame:
 # 4. Konsolidierung
 # =============================================================================
 
+@lru_cache(maxsize=32)
+def _feiertagskalender(von_jahr: int, bis_jahr: int) -> np.busdaycalendar:
+    """Werktagskalender mit den berechneten Feiertagen fuer einen Jahresbereich (gecacht)."""
+    tage = [tag for jahr in range(von_jahr, bis_jahr + 1) for tag in feiertage(jahr)]
+    return np.busdaycalendar(weekmask="1111100", holidays=np.array(tage, dtype="datetime64[D]"))
+
+
+def _werktagskalender(von_jahr: int, bis_jahr: int, holidays=None) -> np.busdaycalendar:
+    """Werktagskalender (Mo-Fr ohne Feiertage) fuer np.busday_count.
+    Ohne holidays werden die oesterreichischen Feiertage der betroffenen Jahre verwendet."""
+    if holidays is None:
+        return _feiertagskalender(von_jahr, bis_jahr)
+    return np.busdaycalendar(weekmask="1111100", holidays=np.array(list(holidays), dtype="datetime64[D]"))
+
+
 def networkdays(start_date, end_date, holidays=None):
     """Berechnet Werktage zwischen zwei Daten (analog NETWORKDAYS in Excel)."""
     if not isinstance(start_date, date) or not isinstance(end_date, date):
         return None
-    if holidays is None:
-        holidays = FEIERTAGE
-    holiday_set = set(holidays)
-    count = 0
-    current = start_date
-    from datetime import timedelta
-    while current <= end_date:
-        if current.weekday() < 5 and current not in holiday_set:
-            count += 1
-        current += timedelta(days=1)
-    return count
+    if end_date < start_date:
+        return 0
+    return int(np.busday_count(
+        np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1,
+        busdaycal=_werktagskalender(start_date.year, end_date.year, holidays),
+    ))
+
+
+def networkdays_vektor(start: pd.Series, ende: pd.Series, holidays=None) -> pd.Series:
+    """networkdays() fuer ganze Spalten in einem np.busday_count-Aufruf.
+    Zeilen ohne gueltiges Start- oder Ende-Datum ergeben None."""
+    gueltig = (start.map(lambda d: isinstance(d, date)) & ende.map(lambda d: isinstance(d, date))).to_numpy(dtype=bool)
+    ergebnis = np.full(len(start), None, dtype=object)
+    if gueltig.any():
+        s = pd.to_datetime(start[gueltig]).to_numpy().astype("datetime64[D]")
+        e = pd.to_datetime(ende[gueltig]).to_numpy().astype("datetime64[D]")
+        jahre = np.concatenate([s, e]).astype("datetime64[Y]").astype(int) + 1970
+        kalender = _werktagskalender(int(jahre.min()), int(jahre.max()), holidays)
+        anzahl = np.busday_count(s, e + 1, busdaycal=kalender)
+        ergebnis[gueltig] = np.maximum(anzahl, 0).tolist()
+    return pd.Series(ergebnis.tolist(), index=start.index)
+
+
+class LVIndex:
+    """Index ueber eine LV-Nummern-Spalte fuer den Join in konsolidiere().
+
+    Exakte LV-Nrn werden per Hash nachgeschlagen. Fuer hierarchische Treffer (PSB A1.1.1.1,
+    SAP A1.1.1.1.1) gibt es eine sortierte Schluesselliste, in der alle untergeordneten
+    LV-Nrn per Binaersuche als zusammenhaengender Block gefunden werden. Bei mehreren Treffern
+    gewinnt wie bisher die erste Zeile in Tabellenreihenfolge."""
+
+    def __init__(self, df: pd.DataFrame, spalte: str):
+        self.rows = df.to_dict("records")
+        self.exakt = {}
+        for pos, key in enumerate(df[spalte]):
+            if isinstance(key, str) and key not in self.exakt:
+                self.exakt[key] = pos
+        self.keys = sorted(self.exakt)
+
+    def finde(self, lv_nr: str, praefix: bool = True) -> tuple[dict, str]:
+        """Gibt (Zeile, Regel) zurueck. Regel ist "exakt", "praefix" oder "keine"."""
+        pos = self.exakt.get(lv_nr)
+        if pos is not None:
+            return self.rows[pos], "exakt"
+        if praefix and lv_nr:
+            # Nur echte Unterpositionen: "A1.1" passt auf "A1.1.2", nicht auf "A1.10"
+            prefix = lv_nr + "."
+            i = bisect_left(self.keys, prefix)
+            treffer = []
+            while i < len(self.keys) and self.keys[i].startswith(prefix):
+                treffer.append(self.exakt[self.keys[i]])
+                i += 1
+            if treffer:
+                return self.rows[min(treffer)], "praefix"
+        return {}, "keine"
+
+
+def sap_zuordnung_geaendert(lv_nummern, sap_df: pd.DataFrame) -> list[tuple[str, str | None, str | None]]:
+    """LV-Nrn, deren SAP-Zeile sich durch die Praefixregel von LVIndex aendert.
+
+    Frueher passte jede SAP-LV-Nr, die mit der LV-Nr beginnt (startswith(lv_nr), also auch
+    "A1.10" fuer "A1.1"); jetzt nur echte Unterpositionen (lv_nr + "."). Gibt je betroffener
+    LV-Nr (LV-Nr, SAP-LV-Nr bisher, SAP-LV-Nr jetzt) zurueck; None = keine SAP-Zeile.
+    """
+    index = LVIndex(sap_df, "lv_nr_sap")
+    spalte = sap_df["lv_nr_sap"]
+    geaendert = []
+    for lv_nr in lv_nummern:
+        lv_nr = str(lv_nr or "").strip()
+        if lv_nr in index.exakt:
+            continue
+        alt = spalte[spalte.str.startswith(lv_nr, na=False)]
+        alt_lv = alt.iloc[0] if len(alt) else None
+        neu_lv = index.finde(lv_nr)[0].get("lv_nr_sap")
+        if alt_lv != neu_lv:
+            geaendert.append((lv_nr, alt_lv, neu_lv))
+    return geaendert
 
 
 def konsolidiere(psbs: list[dict], sap_df: pd.DataFrame, ppm_df: pd.DataFrame) -> pd.DataFrame:
-    """Fuehrt PSBs, SAP-Daten und PPM-Felder zu einem DataFrame zusammen."""
+    """Fuehrt PSBs, SAP-Daten und PPM-Felder zu einem DataFrame zusammen.
+
+    Die angewandte SAP-Zuordnungsregel pro Projekt steht in der Spalte _sap_zuordnung."""
+    sap_index = LVIndex(sap_df, "lv_nr_sap")
+    ppm_index = LVIndex(ppm_df, "lv_nummer")
+
     rows = []
     for psb in psbs:
         lv_nr = str(psb.get("lv_nr", "")).strip()
 
-        # SAP-Daten per LV-Nr joinen (exact oder startswith)
-        sap_match = sap_df[sap_df["lv_nr_sap"] == lv_nr]
-        if sap_match.empty:
-            sap_match = sap_df[sap_df["lv_nr_sap"].str.startswith(lv_nr, na=False)]
-        sap_row = sap_match.iloc[0].to_dict() if len(sap_match) > 0 else {}
+        # SAP-Daten per LV-Nr joinen (exakt oder untergeordnete LV-Nr)
+        sap_row, sap_regel = sap_index.finde(lv_nr)
 
         # PPM-Felder per LV-Nr joinen
-        ppm_match = ppm_df[ppm_df["lv_nummer"] == lv_nr]
-        ppm_row = ppm_match.iloc[0].to_dict() if len(ppm_match) > 0 else {}
+        ppm_row, _ = ppm_index.finde(lv_nr, praefix=False)
 
-        # Dauer berechnen
         start = psb.get("start")
         ende = psb.get("ende")
-        dauer = networkdays(start, ende) if start and ende else None
 
         # Berechnete Kostenfelder
         istkosten_gesamt = (
@@ -377,7 +632,7 @@ def konsolidiere(psbs: list[dict], sap_df: pd.DataFrame, ppm_df: pd.DataFrame) -
             "risiko": psb.get("risikoeinschaetzung", ""),
             "start": start,
             "ende": ende,
-            "dauer_werktage": dauer,
+            "dauer_werktage": None,  # unten fuer alle Zeilen gemeinsam berechnet
             "kostenstelle": sap_row.get("kostenstelle", ""),
             "plankosten_2025": sap_row.get("plankosten_2025", 0),
             "plankosten_2026": sap_row.get("plankosten_2026", 0),
@@ -399,10 +654,24 @@ def konsolidiere(psbs: list[dict], sap_df: pd.DataFrame, ppm_df: pd.DataFrame) -
             "risiken_vorperiode": "",
             "entscheidung_vorperiode": "",
             "_quelldatei": psb.get("_quelldatei", ""),
+            "_sap_zuordnung": sap_regel if sap_regel != "praefix" else f"praefix ({sap_row['lv_nr_sap']})",
         }
         rows.append(row)
 
-    return pd.DataFrame(rows)
+    df = pd.DataFrame(rows)
+    # Dauer berechnen
+    if not df.empty:
+        df["dauer_werktage"] = networkdays_vektor(df["start"], df["ende"])
+    return df
+
+
+def meilensteine_tabelle(psbs: list[dict]) -> pd.DataFrame:
+    """Alle Meilensteine der PSBs als eine Zeile pro Meilenstein (fuer die Gantt-Zeitleiste)."""
+    zeilen = [
+        {"lv_nummer": str(psb.get("lv_nr", "")).strip(), **{k: ms.get(k) for k in MEILENSTEIN_SPALTEN[1:]}}
+        for psb in psbs for ms in psb.get("meilensteine", [])
+    ]
+    return pd.DataFrame(zeilen, columns=MEILENSTEIN_SPALTEN)
 
 
 # =============================================================================
@@ -451,66 +720,21 @@ def validiere(df: pd.DataFrame) -> pd.DataFrame:
 
 def export_review_excel(df: pd.DataFrame, output_path: Path):
     """Exportiert das konsolidierte DataFrame als formatiertes Excel."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        # Spalten ohne interne Felder (ausser _validierung)
-        export_cols = [c for c in df.columns if not c.startswith("_") or c == "_validierung"]
-        df[export_cols].to_excel(writer, sheet_name="Konsolidiert", index=False)
-
-        ws = writer.sheets["Konsolidiert"]
-
-        # Formatierung
-        header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True, size=10)
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
-        # Header formatieren
-        for col_idx, col_name in enumerate(export_cols, 1):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", wrap_text=True)
-            cell.border = thin_border
-
-        # Ampelstatus einfaerben
-        ampel_col = export_cols.index("ampelstatus") + 1 if "ampelstatus" in export_cols else None
-        validierung_col = export_cols.index("_validierung") + 1 if "_validierung" in export_cols else None
-
-        fills = {
-            "In Ordnung": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-            "Vorsicht": PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
-            "Krise": PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
-        }
-
-        for row_idx in range(2, len(df) + 2):
-            for col_idx in range(1, len(export_cols) + 1):
-                ws.cell(row=row_idx, column=col_idx).border = thin_border
-
-            # Ampelfarbe
-            if ampel_col:
-                ampel_val = ws.cell(row=row_idx, column=ampel_col).value
-                if ampel_val in fills:
-                    ws.cell(row=row_idx, column=ampel_col).fill = fills[ampel_val]
-
-            # Validierungsspalte rot wenn nicht OK
-            if validierung_col:
-                val_cell = ws.cell(row=row_idx, column=validierung_col)
-                if val_cell.value and val_cell.value != "OK":
-                    val_cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                    val_cell.font = Font(color="9C0006")
-
-        # Spaltenbreiten
-        for col_idx in range(1, len(export_cols) + 1):
-            ws.column_dimensions[get_column_letter(col_idx)].width = 18
-
-        # Autofilter
-        ws.auto_filter.ref = ws.dimensions
+    # Spalten ohne interne Felder (ausser _validierung)
+    export_cols = export_spalten(df)
+
+    # Ampelstatus einfaerben, Validierungsspalte rot wenn nicht OK
+    stile = ["rahmen"] * len(export_cols)
+    if "ampelstatus" in export_cols:
+        stile[export_cols.index("ampelstatus")] = ampel("rahmen", strip=False)
+    if "_validierung" in export_cols:
+        stile[export_cols.index("_validierung")] = lambda v: "fehler" if v and v != "OK" else "rahmen"
+
+    schreibe_tabelle(
+        output_path, "Konsolidiert",
+        kopf=export_cols, zeilen=zeilenwerte(df, export_cols), stile=stile,
+        breiten=[18] * len(export_cols), autofilter=True,
+    )
 
     print(f"  Exportiert: {output_path}")
 
@@ -524,8 +748,14 @@ def main():
 
     # 1. PSBs lesen
     print("1. PSBs einlesen...")
-    psbs = read_all_psbs()
-    print(f"   {len(psbs)} PSBs gelesen.\n")
+    cache = PSBCache() if PSB_CACHE_AKTIV else None
+    psbs, psb_fehler = read_all_psbs(cache=cache)
+    print(f"   {len(psbs)} PSBs gelesen.")
+    if psb_fehler:
+        print(f"   {len(psb_fehler)} PSBs nicht lesbar:")
+        for name, err in psb_fehler:
+            print(f"   ! {name}: {err}")
+    print()
 
     # Verifikation: Kernwerte ausgeben
     for psb in psbs:
@@ -548,7 +778,14 @@ def main():
     # 4. Konsolidieren
     print("4. Konsolidierung...")
     df = konsolidiere(psbs, sap_df, ppm_df)
-    print(f"   {len(df)} konsolidierte Eintraege.\n")
+    print(f"   {len(df)} konsolidierte Eintraege.")
+    for regel, n in df["_sap_zuordnung"].str.split(" ").str[0].value_counts().items():
+        print(f"   SAP-Zuordnung {regel}: {n}")
+    for _, row in df[df["_sap_zuordnung"] != "exakt"].iterrows():
+        print(f"   - {row['lv_nummer']}: {row['_sap_zuordnung']}")
+    for lv_nr, alt, neu in sap_zuordnung_geaendert(df["lv_nummer"], sap_df):
+        print(f"   ! {lv_nr}: SAP-Zeile nach bisheriger Regel {alt or '-'}, jetzt {neu or '-'}")
+    print()
 
     # 5. Validieren
     print("5. Validierung...")
@@ -561,12 +798,16 @@ def main():
             print(f"   ! {row['lv_nummer']}: {row['_validierung']}")
     print()
 
-    # 6. Excel exportieren
-    print("6. Excel-Export...")
-    output_path = OUTPUT_REVIEW / "konsolidiert.xlsx"
+    # 6. Excel + Parquet exportieren (Parquet zuletzt, damit es neuer als das Excel ist)
+    print("6. Export...")
+    output_path = KONSOLIDIERT_XLSX
     export_review_excel(df, output_path)
+    schreibe_parquet(df)
+    schreibe_meilensteine(meilensteine_tabelle(psbs))
 
     print(f"\nFertig. Ergebnis: {output_path}")
+    if cache is not None:
+        print(f"PSB-Cache: {cache.statistik()}")
     return df
 
 
@@ -1,51 +1,79 @@
 """
-02_visualisierung.py — Charts generieren aus konsolidiertem Excel.
+02_visualisierung.py — Charts generieren aus den konsolidierten Daten.
 
-Ausfuehrung: python 02_visualisierung.py
-Voraussetzung: output/review/konsolidiert.xlsx muss existieren
-Ergebnis:      output/charts/ (PNG)
+Ausfuehrung: python 02_visualisierung.py                  (alle Charts)
+             python 02_visualisierung.py ampel_gesamt     (nur ausgewaehlte Charts)
+Voraussetzung: output/review/konsolidiert.parquet (oder .xlsx) muss existieren
+Ergebnis:      output/charts/ (PNG, zusaetzlich SVG/PDF je nach CHART_FORMATE)
+
+pandas, numpy und matplotlib werden erst geladen, wenn Daten gelesen bzw. ein Chart
+gezeichnet wird (schneller Start, z.B. fuer pipeline.py ohne geaenderte Charts).
 """
 
-from pathlib import Path
-from datetime import date
+from __future__ import annotations
 
-import pandas as pd
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import numpy as np
+import re
+import sys
+import time
+import traceback
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from config import (
-    OUTPUT_REVIEW, OUTPUT_CHARTS,
-    AMPEL_FARBEN, LEISTUNGSBEREICHE, QUARTAL, STICHTAG,
+    OUTPUT_CHARTS, CHART_WORKERS, CHART_FORMATE, GANTT_ZEILEN_PRO_SEITE, GANTT_MEILENSTEINE, MEILENSTEINE_PARQUET,
+    AMPEL_FARBEN, LEISTUNGSBEREICHE, PAG_NORM, QUARTAL, STICHTAG,
 )
 
-# Matplotlib-Defaults
-plt.rcParams.update({
-    "font.family": "sans-serif",
-    "font.size": 10,
-    "figure.facecolor": "white",
-    "axes.facecolor": "white",
-    "axes.grid": True,
-    "grid.alpha": 0.3,
-})
+if TYPE_CHECKING:
+    import pandas as pd
 
 AMPEL_COLORS = {"In Ordnung": "#4CAF50", "Vorsicht": "#FFC107", "Krise": "#F44336"}
 AMPEL_ORDER = ["In Ordnung", "Vorsicht", "Krise"]
 
 
+@lru_cache(maxsize=None)
+def _pyplot():
+    """Importiert matplotlib beim ersten Chart (Agg-Backend, Matplotlib-Defaults).
+    Der Stil wird einmal pro Prozess gesetzt, nicht pro Chart."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.rcParams.update({
+        "font.family": "sans-serif",
+        "font.size": 10,
+        "figure.facecolor": "white",
+        "axes.facecolor": "white",
+        "axes.grid": True,
+        "grid.alpha": 0.3,
+        "savefig.dpi": 150,
+        # Vektorformate: Text als Text statt Pfaden (kleinere Dateien, im PPTX durchsuchbar)
+        "svg.fonttype": "none",
+        "pdf.fonttype": 42,
+    })
+    return plt
+
+
+def _betrag(wert, _pos) -> str:
+    """Tick-Format fuer EUR-Achsen (1,234,567)."""
+    return f"{wert:,.0f}"
+
+
 def load_data() -> pd.DataFrame:
-    path = OUTPUT_REVIEW / "konsolidiert.xlsx"
-    if not path.exists():
-        raise FileNotFoundError(f"Bitte zuerst 01_konsolidierung.py ausfuehren.\n  {path}")
-    return pd.read_excel(path, sheet_name="Konsolidiert")
+    from datenbasis import lade_konsolidiert
+    return lade_konsolidiert()
+
+
+def _schreibe(fig, stamm: Path, **kwargs):
+    """Schreibt die Figure als PNG und in allen zusaetzlichen CHART_FORMATE (stamm ohne Endung)."""
+    stamm.parent.mkdir(parents=True, exist_ok=True)
+    for fmt in dict.fromkeys(["png", *CHART_FORMATE]):
+        fig.savefig(str(stamm.parent / f"{stamm.name}.{fmt}"), **kwargs)
 
 
 def save(fig, name: str):
-    OUTPUT_CHARTS.mkdir(parents=True, exist_ok=True)
-    fig.savefig(str(OUTPUT_CHARTS / f"{name}.png"), dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    _schreibe(fig, OUTPUT_CHARTS / name, bbox_inches="tight")
+    _pyplot().close(fig)
     print(f"  {name}.png")
 
 
@@ -54,6 +82,8 @@ def save(fig, name: str):
 # =============================================================================
 
 def chart_ampel_gesamt(df: pd.DataFrame):
+    plt = _pyplot()
+
     counts = df["ampelstatus"].value_counts()
     labels = [l for l in AMPEL_ORDER if l in counts.index]
     values = [counts[l] for l in labels]
@@ -78,6 +108,10 @@ def chart_ampel_gesamt(df: pd.DataFrame):
 # =============================================================================
 
 def chart_ampel_nach_pag(df: pd.DataFrame):
+    import numpy as np
+    import pandas as pd
+    plt = _pyplot()
+
     ct = pd.crosstab(df["pag"], df["ampelstatus"])
     ct = ct.reindex(columns=[c for c in AMPEL_ORDER if c in ct.columns], fill_value=0)
 
@@ -105,6 +139,8 @@ def chart_ampel_nach_pag(df: pd.DataFrame):
 # =============================================================================
 
 def chart_projekte_nach_pag(df: pd.DataFrame):
+    plt = _pyplot()
+
     counts = df["pag"].value_counts().sort_values()
 
     fig, ax = plt.subplots(figsize=(8, 5))
@@ -122,6 +158,8 @@ def chart_projekte_nach_pag(df: pd.DataFrame):
 # =============================================================================
 
 def chart_projekte_nach_leistungsbereich(df: pd.DataFrame):
+    plt = _pyplot()
+
     df_copy = df.copy()
     df_copy["lb"] = df_copy["lv_nummer"].astype(str).str.extract(r"^([A-D])", expand=False)
     df_copy["lb_name"] = df_copy["lb"].map(LEISTUNGSBEREICHE).fillna("Unbekannt")
@@ -147,6 +185,8 @@ def chart_projekte_nach_leistungsbereich(df: pd.DataFrame):
 # =============================================================================
 
 def chart_projekte_nach_phase(df: pd.DataFrame):
+    plt = _pyplot()
+
     phase_order = [
         "Idee erfasst/noch nicht gestartet", "Planung", "In Arbeit",
         "Blockiert", "Abgeschlossen", "Abgebrochen",
@@ -177,6 +217,9 @@ def chart_projekte_nach_phase(df: pd.DataFrame):
 # =============================================================================
 
 def chart_budget(df: pd.DataFrame):
+    import numpy as np
+    plt = _pyplot()
+
     years = ["2025", "2026", "2027"]
     plan_vals = [df[f"plankosten_{y}"].sum() for y in years]
     ist_vals = [df[f"istkosten_{y}"].sum() for y in years]
@@ -202,7 +245,7 @@ def chart_budget(df: pd.DataFrame):
                 ax.text(bar.get_x() + bar.get_width() / 2, h, f"{h:,.0f}",
                         ha="center", va="bottom", fontsize=8)
 
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:,.0f}"))
+    ax.yaxis.set_major_formatter(_betrag)
     save(fig, "budget_plan_vs_ist")
 
 
@@ -210,39 +253,110 @@ def chart_budget(df: pd.DataFrame):
 # 7. Gantt-Zeitleiste
 # =============================================================================
 
-def chart_gantt(df: pd.DataFrame):
-    df_gantt = df.dropna(subset=["start", "ende"]).copy()
+def _meilenstein_punkte(ms: pd.DataFrame, zeile_je_lv: dict[str, int]):
+    """Meilensteine → (x als Matplotlib-Datum, Zeile, erreicht). Termin: Ist, sonst Plan aktuell, sonst Plan LV."""
+    import numpy as np
+    import matplotlib.dates as mdates
+
+    termin = ms["ist"].fillna(ms["plan_aktuell"]).fillna(ms["plan_lv"])
+    zeile = ms["lv_nummer"].astype(str).map(zeile_je_lv)
+    gueltig = termin.notna() & zeile.notna()
+    return (mdates.date2num(termin[gueltig]), zeile[gueltig].to_numpy(dtype=int),
+            ms.loc[gueltig, "ist"].notna().to_numpy())
+
+
+def chart_gantt(df: pd.DataFrame, zeilen_pro_seite: int | None = None,
+                meilensteine: pd.DataFrame | None = None):
+    """Zeitleiste aller Projekte, nach Start sortiert, in Seiten zu zeilen_pro_seite Projekten.
+
+    Alle Balken einer Seite sind eine PolyCollection, alle Meilensteine ein scatter-Aufruf;
+    die Laufzeit waechst damit linear mit der Projektanzahl. Alle Seiten teilen die x-Achse.
+    """
+    import numpy as np
+    import pandas as pd
+    import matplotlib.dates as mdates
+    from matplotlib.collections import PolyCollection
+    plt = _pyplot()
+
+    if zeilen_pro_seite is None:
+        zeilen_pro_seite = GANTT_ZEILEN_PRO_SEITE
+    df_gantt = df.dropna(subset=["start", "ende"])
     if df_gantt.empty:
         print("  Keine Projekte mit Start/Ende fuer Gantt.")
         return
 
-    df_gantt["start"] = pd.to_datetime(df_gantt["start"])
-    df_gantt["ende"] = pd.to_datetime(df_gantt["ende"])
-    df_gantt = df_gantt.sort_values("start", ascending=True)
-
-    fig, ax = plt.subplots(figsize=(14, max(3, len(df_gantt) * 0.8)))
-
-    for i, (_, row) in enumerate(df_gantt.iterrows()):
-        start = row["start"]
-        ende = row["ende"]
-        dauer = (ende - start).days
-        color = AMPEL_COLORS.get(row.get("ampelstatus", ""), "#1F4E79")
-        ax.barh(i, dauer, left=start, height=0.5, color=color, alpha=0.85, edgecolor="white")
-
-    ax.axvline(x=pd.Timestamp(STICHTAG), color="red", linestyle="--", linewidth=1.5,
-               label=f"Stichtag ({STICHTAG})")
-
-    labels = [f"{r['lv_nummer']}  {str(r['projektname'])[:35]}" for _, r in df_gantt.iterrows()]
-    ax.set_yticks(range(len(df_gantt)))
-    ax.set_yticklabels(labels, fontsize=9)
+    df_gantt = df_gantt.assign(start=pd.to_datetime(df_gantt["start"]), ende=pd.to_datetime(df_gantt["ende"]))
+    df_gantt = df_gantt.sort_values("start", kind="stable", ignore_index=True)
+    links = mdates.date2num(df_gantt["start"])
+    # Mindestens eine Woche breit, damit Vorhaben mit Start = Ende sichtbar bleiben
+    rechts = np.maximum(mdates.date2num(df_gantt["ende"]), links + 7)
+    farben = np.array([AMPEL_COLORS.get(a, "#1F4E79") for a in df_gantt["ampelstatus"]])
+    labels = (df_gantt["lv_nummer"].astype(str) + "  "
+              + df_gantt["projektname"].astype(str).str[:35]).tolist()
+
+    if meilensteine is None and GANTT_MEILENSTEINE:
+        from datenbasis import lade_meilensteine
+        meilensteine = lade_meilensteine()
+    if meilensteine is not None and not meilensteine.empty:
+        zeile_je_lv = {lv: i for i, lv in reversed(list(enumerate(df_gantt["lv_nummer"].astype(str))))}
+        ms_x, ms_zeile, ms_erreicht = _meilenstein_punkte(meilensteine, zeile_je_lv)
+    else:
+        ms_x, ms_zeile, ms_erreicht = np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=bool)
+
+    stichtag = mdates.date2num(pd.Timestamp(STICHTAG))
+    x_min = min(links.min(), ms_x.min(initial=stichtag), stichtag) - 15
+    x_max = max(rechts.max(), ms_x.max(initial=stichtag), stichtag) + 15
+
+    n = len(df_gantt)
+    seiten = -(-n // zeilen_pro_seite)
+    zeilen = min(n, zeilen_pro_seite)
+
+    # Eine Figure fuer alle Seiten mit festen Raendern (Platz fuer die Projekt-Labels);
+    # pro Seite werden nur Balken, Meilensteine, Labels und Titel ausgetauscht.
+    hoehe = max(3, 0.4 * zeilen + 1.6)
+    fig, ax = plt.subplots(figsize=(14, hoehe))
+    fig.subplots_adjust(left=3.6 / 14, right=0.98, top=1 - 0.6 / hoehe, bottom=1.0 / hoehe)
+    balken = PolyCollection([], edgecolors="white", alpha=0.85)
+    ax.add_collection(balken)
+    punkte = ax.scatter([], [], marker="D", s=28, zorder=3, linewidths=1,
+                        facecolors="#333333", edgecolors="#333333", label="Meilenstein (gefuellt = erreicht)")
+    ax.axvline(x=stichtag, color="red", linestyle="--", linewidth=1.5, label=f"Stichtag ({STICHTAG})")
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(zeilen - 0.5, -0.5)
+    ax.xaxis_date()
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %Y"))
     ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
-    plt.xticks(rotation=45)
-    ax.set_title(f"Projektzeitleiste ({QUARTAL})", fontsize=16, fontweight="bold")
+    ax.tick_params(axis="x", labelrotation=45)
+    titel = ax.set_title("", fontsize=16, fontweight="bold")
+    if not len(ms_x):
+        punkte.remove()
     ax.legend(loc="upper right")
-    ax.invert_yaxis()
-    fig.tight_layout()
-    save(fig, "gantt_zeitleiste")
+
+    for seite in range(seiten):
+        von, bis = seite * zeilen_pro_seite, min((seite + 1) * zeilen_pro_seite, n)
+        y = np.arange(bis - von)
+        balken.set_verts(np.stack([
+            np.column_stack([links[von:bis], y - 0.25]), np.column_stack([rechts[von:bis], y - 0.25]),
+            np.column_stack([rechts[von:bis], y + 0.25]), np.column_stack([links[von:bis], y + 0.25]),
+        ], axis=1))
+        balken.set_facecolors(farben[von:bis])
+        if len(ms_x):
+            auf_seite = (ms_zeile >= von) & (ms_zeile < bis)
+            punkte.set_offsets(np.column_stack([ms_x[auf_seite], ms_zeile[auf_seite] - von]))
+            punkte.set_facecolors(np.where(ms_erreicht[auf_seite], "#333333", "white"))
+        ax.set_yticks(y)
+        ax.set_yticklabels(labels[von:bis], fontsize=9)
+        titel.set_text(f"Projektzeitleiste ({QUARTAL})"
+                       + (f" – Seite {seite + 1}/{seiten}" if seiten > 1 else ""))
+        name = "gantt_zeitleiste" if seite == 0 else f"gantt_zeitleiste_{seite + 1}"
+        _schreibe(fig, OUTPUT_CHARTS / name)
+        print(f"  {name}.png")
+    plt.close(fig)
+
+    # Seiten aus frueheren Laeufen mit mehr Projekten entfernen
+    for alt in OUTPUT_CHARTS.glob("gantt_zeitleiste_*.*"):
+        if alt.stem.rsplit("_", 1)[1].isdigit() and int(alt.stem.rsplit("_", 1)[1]) > seiten:
+            alt.unlink()
 
 
 # =============================================================================
@@ -250,6 +364,8 @@ def chart_gantt(df: pd.DataFrame):
 # =============================================================================
 
 def chart_zielwerte(df: pd.DataFrame):
+    plt = _pyplot()
+
     df_show = df[df["fertigstellungsgrad"] > 0].copy() if (df["fertigstellungsgrad"] > 0).any() else df.copy()
 
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -266,28 +382,292 @@ def chart_zielwerte(df: pd.DataFrame):
     save(fig, "zielwerte_fertigstellungsgrad")
 
 
+# =============================================================================
+# 9. Kleine Vielfache nach PAG und Leistungsbereich
+# =============================================================================
+
+_JAHRE = ["2025", "2026", "2027"]
+_BUDGET_SPALTEN = [f"{art}_{j}" for art in ("plankosten", "istkosten") for j in _JAHRE]
+
+
+def _weitere_pags(df: pd.DataFrame) -> list[str]:
+    """PAGs aus df, die nicht unter den normalisierten Werten aus PAG_NORM sind."""
+    return sorted({str(p) for p in df["pag"].dropna() if str(p).strip()} - set(PAG_NORM.values()))
+
+
+def _gruppen(df: pd.DataFrame) -> list[tuple[str, str, str, str]]:
+    """Alle Facetten als (Dimension, Gruppe, Titel, Dateiname ohne Endung), auch ohne Projekte.
+
+    PAG: die normalisierten Werte aus PAG_NORM, danach alle weiteren PAGs aus df (nicht
+    normalisierte Angaben bekommen so ebenfalls ein eigenes Panel statt zu fehlen).
+    """
+    gruppen = [("PAG", pag, f"PAG {pag}") for pag in [*dict.fromkeys(PAG_NORM.values()), *_weitere_pags(df)]]
+    gruppen += [("Leistungsbereich", lb, f"{lb} – {name}") for lb, name in LEISTUNGSBEREICHE.items()]
+    return [(dim, gruppe, titel, f"{dim.lower()}_{re.sub(r'[^A-Za-z0-9_-]', '_', gruppe)}")
+            for dim, gruppe, titel in gruppen]
+
+
+def _gruppiere(df: pd.DataFrame):
+    """Ein groupby ueber (Dimension, Gruppe): Summen fuer Ampel/Budget, Zeilen fuer Gantt.
+
+    Jede Zeile steht einmal unter ihrer PAG und einmal unter ihrem Leistungsbereich.
+    Rueckgabe: (summen je Gruppe, Gantt-Zeilen nach Start sortiert, Positionen je Gruppe).
+    """
+    import pandas as pd
+
+    lb = df["lv_nummer"].astype(str).str.extract(r"^([A-D])", expand=False)
+    lang = pd.concat([
+        df.assign(dimension="PAG", gruppe=df["pag"]),
+        df.assign(dimension="Leistungsbereich", gruppe=lb),
+    ], ignore_index=True)
+    lang["start"] = pd.to_datetime(lang["start"])
+    lang["ende"] = pd.to_datetime(lang["ende"])
+    lang = lang.sort_values("start", kind="stable", ignore_index=True)
+
+    ampel = pd.get_dummies(lang["ampelstatus"]).reindex(columns=AMPEL_ORDER, fill_value=0).astype(int)
+    werte = pd.concat([lang[["dimension", "gruppe"]], ampel,
+                       lang[_BUDGET_SPALTEN].astype(float).fillna(0)], axis=1)
+    gruppiert = werte.groupby(["dimension", "gruppe"], sort=False)
+    return gruppiert.sum(), lang, gruppiert.indices
+
+
+def _panel_ampel(ax, zaehler):
+    werte = [int(zaehler.get(a, 0)) for a in AMPEL_ORDER]
+    if not sum(werte):
+        ax.text(0.5, 0.5, "Keine Projekte", ha="center", va="center", transform=ax.transAxes)
+        ax.set_axis_off()
+        return
+    labels = [a for a, w in zip(AMPEL_ORDER, werte) if w]
+    ax.pie([w for w in werte if w], colors=[AMPEL_COLORS[a] for a in labels],
+           labels=[str(w) for w in werte if w], startangle=90,
+           labeldistance=0.78, wedgeprops=dict(width=0.4), textprops=dict(fontweight="bold"))
+    ax.set_title("Ampelstatus", fontsize=11)
+
+
+def _panel_budget(ax, summen):
+    import numpy as np
+
+    x = np.arange(len(_JAHRE))
+    plan = [summen.get(f"plankosten_{j}", 0) for j in _JAHRE]
+    ist = [summen.get(f"istkosten_{j}", 0) for j in _JAHRE]
+    ax.bar(x - 0.2, plan, 0.4, label="Plan", color="#1F4E79")
+    ax.bar(x + 0.2, ist, 0.4, label="Ist", color="#2E86AB")
+    ax.set_xticks(x)
+    ax.set_xticklabels(_JAHRE)
+    if any(plan) or any(ist):
+        ax.set_ylim(bottom=0)
+    else:
+        ax.set_ylim(0, 1)
+        ax.set_yticks([0])
+    ax.yaxis.set_major_formatter(_betrag)
+    ax.set_title("Budget Plan vs. Ist (EUR)", fontsize=11)
+    ax.legend(fontsize=8)
+
+
+def _panel_gantt(ax, zeilen):
+    import matplotlib.dates as mdates
+    import pandas as pd
+
+    zeilen = zeilen.dropna(subset=["start", "ende"])
+    if zeilen.empty:
+        ax.text(0.5, 0.5, "Keine Projekte mit Start/Ende", ha="center", va="center",
+                transform=ax.transAxes)
+        ax.set_axis_off()
+        return
+    links = mdates.date2num(zeilen["start"])
+    # Mindestens eine Woche breit, damit Vorhaben mit Start = Ende sichtbar bleiben
+    breiten = (mdates.date2num(zeilen["ende"]) - links).clip(min=7)
+    ax.barh(range(len(zeilen)), breiten, left=links, height=0.5,
+            color=[AMPEL_COLORS.get(a, "#1F4E79") for a in zeilen["ampelstatus"]],
+            alpha=0.85, edgecolor="white")
+    ax.axvline(x=mdates.date2num(pd.Timestamp(STICHTAG)), color="red", linestyle="--", linewidth=1)
+    ax.set_yticks(range(len(zeilen)))
+    ax.set_yticklabels(zeilen["lv_nummer"].astype(str), fontsize=8)
+    ax.xaxis_date()
+    ax.xaxis.set_major_locator(mdates.MonthLocator(bymonth=[1, 7]))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%y"))
+    ax.invert_yaxis()
+    ax.set_title("Zeitleiste", fontsize=11)
+
+
+def _zeichne_gruppe(axes, summen, zeilen):
+    _panel_ampel(axes[0], summen)
+    _panel_budget(axes[1], summen)
+    _panel_gantt(axes[2], zeilen)
+
+
+def chart_gruppen(df: pd.DataFrame):
+    """Ampel/Budget/Gantt je PAG und Leistungsbereich: ein PNG pro Gruppe (charts/gruppen/)
+    und eine Uebersicht mit allen Gruppen untereinander.
+
+    Die Kennzahlen aller Gruppen entstehen in einem groupby; fuer die Einzel-PNGs wird
+    eine Figure wiederverwendet (Achsen leeren statt neue Figure pro Gruppe).
+    """
+    import pandas as pd
+    plt = _pyplot()
+
+    weitere = _weitere_pags(df)
+    if weitere:
+        print(f"  Hinweis: PAG ausserhalb von PAG_NORM: {', '.join(weitere)}")
+    summen, lang, positionen = _gruppiere(df)
+    leer = pd.Series(0.0, index=summen.columns)
+    gruppen = [(titel, datei,
+                summen.loc[(dim, gruppe)] if (dim, gruppe) in summen.index else leer,
+                lang.iloc[positionen.get((dim, gruppe), [])])
+               for dim, gruppe, titel, datei in _gruppen(df)]
+
+    ziel = OUTPUT_CHARTS / "gruppen"
+    # Feste Raender statt tight/constrained layout: das Layout wird nicht pro Gruppe neu berechnet
+    raster = dict(width_ratios=[1, 1.3, 2], left=0.04, right=0.98, wspace=0.3)
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4.5), gridspec_kw=dict(raster, top=0.82, bottom=0.12))
+    for titel, datei, summe, zeilen in gruppen:
+        for ax in axes:
+            ax.clear()
+            ax.set_axis_on()
+        _zeichne_gruppe(axes, summe, zeilen)
+        fig.suptitle(f"{titel} ({QUARTAL})", fontsize=14, fontweight="bold")
+        _schreibe(fig, ziel / datei)
+    plt.close(fig)
+    print(f"  gruppen/ ({len(gruppen)} PNGs)")
+
+    # Gruppen aus frueheren Laeufen (z.B. weggefallene PAG) entfernen
+    geschrieben = {datei for _, datei, _, _ in gruppen}
+    for alt in ziel.glob("*.*"):
+        if alt.stem not in geschrieben:
+            alt.unlink()
+
+    hoehe = 3.4 * len(gruppen) + 1.4
+    fig, axes = plt.subplots(len(gruppen), 3, figsize=(15, hoehe), squeeze=False, gridspec_kw=dict(
+        raster, top=1 - 1.4 / hoehe, bottom=0.3 / hoehe, hspace=0.55))
+    fig.suptitle(f"Uebersicht nach PAG und Leistungsbereich ({QUARTAL})", fontsize=16, fontweight="bold")
+    for zeile, (titel, _, summe, zeilen) in zip(axes, gruppen):
+        _zeichne_gruppe(zeile, summe, zeilen)
+        fig.text(0.01, zeile[0].get_position().y1 + 0.35 / hoehe, titel, fontsize=12, fontweight="bold")
+    _schreibe(fig, OUTPUT_CHARTS / "gruppen_uebersicht", dpi=100)
+    plt.close(fig)
+    print("  gruppen_uebersicht.png")
+
+
 # =============================================================================
 # Main
 # =============================================================================
 
-def main():
+# Zusaetzliche Eingabedateien einzelner Charts (fuer pipeline.py)
+CHART_DATEIEN = {
+    "gantt_zeitleiste": [MEILENSTEINE_PARQUET] if GANTT_MEILENSTEINE else [],
+}
+
+
+def chart_ausgaben(name: str, df: pd.DataFrame) -> list[Path]:
+    """Alle Dateien, die das Chart name fuer df schreibt (jede Seite, jede Gruppe, alle
+    CHART_FORMATE); pipeline.py baut das Chart neu, sobald eine davon fehlt."""
+    if name == "gantt_zeitleiste":
+        seiten = -(-int(df[["start", "ende"]].notna().all(axis=1).sum()) // GANTT_ZEILEN_PRO_SEITE)
+        staemme = ["gantt_zeitleiste", *(f"gantt_zeitleiste_{s}" for s in range(2, seiten + 1))][:seiten]
+    elif name == "gruppen_uebersicht":
+        staemme = [name, *(f"gruppen/{datei}" for *_, datei in _gruppen(df))]
+    else:
+        staemme = [name]
+    return [OUTPUT_CHARTS / f"{stamm}.{fmt}" for stamm in staemme for fmt in dict.fromkeys(["png", *CHART_FORMATE])]
+
+# Alle Charts: Name (= Dateiname) → (Funktion, verwendete Spalten).
+# Die Spalten nutzt pipeline.py, um nur Charts mit geaenderten Daten neu zu erzeugen.
+CHARTS = {
+    "ampel_gesamt": (chart_ampel_gesamt, ["ampelstatus"]),
+    "ampel_nach_pag": (chart_ampel_nach_pag, ["pag", "ampelstatus"]),
+    "projekte_nach_pag": (chart_projekte_nach_pag, ["pag"]),
+    "projekte_nach_leistungsbereich": (chart_projekte_nach_leistungsbereich, ["lv_nummer"]),
+    "projekte_nach_phase": (chart_projekte_nach_phase, ["projektphase"]),
+    "budget_plan_vs_ist": (chart_budget, [
+        "plankosten_2025", "plankosten_2026", "plankosten_2027",
+        "istkosten_2025", "istkosten_2026", "istkosten_2027",
+    ]),
+    "gantt_zeitleiste": (chart_gantt, ["start", "ende", "ampelstatus", "lv_nummer", "projektname"]),
+    "zielwerte_fertigstellungsgrad": (chart_zielwerte, ["fertigstellungsgrad", "ampelstatus", "lv_nummer"]),
+    "gruppen_uebersicht": (chart_gruppen, [
+        "pag", "lv_nummer", "ampelstatus", "start", "ende", *_BUDGET_SPALTEN,
+    ]),
+}
+
+
+# DataFrame im Worker-Prozess: wird einmal pro Worker uebergeben, nicht pro Chart
+_WORKER_DF = None
+
+
+def _worker_init(df: pd.DataFrame):
+    global _WORKER_DF
+    _WORKER_DF = df
+
+
+def _render_job(name: str, df: pd.DataFrame | None = None) -> tuple[str, float, str | None]:
+    """Rendert ein Chart und faengt Fehler ab, damit ein Chart die anderen nicht abbricht."""
+    t0 = time.perf_counter()
+    try:
+        CHARTS[name][0](_WORKER_DF if df is None else df)
+        fehler = None
+    except Exception as e:
+        fehler = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+        _pyplot().close("all")
+    return name, time.perf_counter() - t0, fehler
+
+
+def render_charts(df: pd.DataFrame, namen: list[str] | None = None,
+                  workers: int | None = None) -> list[tuple[str, float, str | None]]:
+    """Rendert die angegebenen Charts (Standard: alle), bei workers > 1 in einem Prozess-Pool.
+
+    Rueckgabe: (Name, Sekunden, Fehlermeldung oder None) pro Chart in Reihenfolge von CHARTS.
+    """
+    if namen is None:
+        namen = list(CHARTS)
+    if workers is None:
+        workers = CHART_WORKERS
+    # matplotlib vorab laden: zaehlt sonst zur Laufzeit des ersten Charts
+    # (und wird so von den Worker-Prozessen geerbt)
+    _pyplot()
+
+    if workers > 1 and len(namen) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(namen)),
+                                 initializer=_worker_init, initargs=(df,)) as pool:
+            return list(pool.map(_render_job, namen))
+    return [_render_job(name, df) for name in namen]
+
+
+def zeitbericht(ergebnisse: list[tuple[str, float, str | None]]):
+    """Laufzeit pro Chart, absteigend sortiert, mit Anteil an der Summe."""
+    summe = sum(sekunden for _, sekunden, _ in ergebnisse) or 1.0
+    print("\n  Laufzeit pro Chart:")
+    for name, sekunden, fehler in sorted(ergebnisse, key=lambda e: -e[1]):
+        status = f"FEHLER: {fehler}" if fehler else f"{sekunden / summe:5.1%}"
+        print(f"    {name:<34} {sekunden:6.2f} s  {status}")
+
+
+def main(df: pd.DataFrame | None = None, workers: int | None = None,
+         namen: list[str] | None = None):
+    """Erzeugt alle (oder die angegebenen) Charts. Ohne df werden die konsolidierten
+    Daten von der Platte geladen."""
+    unbekannt = [n for n in namen or [] if n not in CHARTS]
+    if unbekannt:
+        print(f"Unbekannte Charts: {', '.join(unbekannt)} (verfuegbar: {', '.join(CHARTS)})")
+        sys.exit(1)
+
     print(f"=== Visualisierungen ({QUARTAL}) ===\n")
 
-    df = load_data()
+    if df is None:
+        df = load_data()
     print(f"  {len(df)} Projekte geladen.\n")
 
     print("Charts generieren...")
-    chart_ampel_gesamt(df)
-    chart_ampel_nach_pag(df)
-    chart_projekte_nach_pag(df)
-    chart_projekte_nach_leistungsbereich(df)
-    chart_projekte_nach_phase(df)
-    chart_budget(df)
-    chart_gantt(df)
-    chart_zielwerte(df)
+    ergebnisse = render_charts(df, namen, workers=workers)
+    zeitbericht(ergebnisse)
 
+    fehler = [name for name, _, err in ergebnisse if err]
+    if fehler:
+        print(f"\n  {len(fehler)} Chart(s) fehlgeschlagen: {', '.join(fehler)}")
     print(f"\nFertig. Charts in: {OUTPUT_CHARTS}")
+    return ergebnisse
 
 
 if __name__ == "__main__":
-    main()
+    main(namen=sys.argv[1:] or None)
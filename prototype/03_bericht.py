@@ -2,33 +2,56 @@
 03_bericht.py — Quartalsbericht (PPTX) + Dashboard-Excel + LV-Monitoring generieren.
 
 Ausfuehrung: python 03_bericht.py
-Voraussetzung: output/review/konsolidiert.xlsx + output/charts/ muessen existieren
+Voraussetzung: output/review/konsolidiert.parquet (oder .xlsx) + output/charts/ muessen existieren
+               (output/charts/ entfaellt mit PPTX_BILDFORMAT = "nativ")
 Ergebnis:      output/reports/ (PPTX, Dashboard-Excel, LV-Monitoring)
+
+Einzelne Berichte: python 03_bericht.py pptx lv_monitoring
+python-pptx, openpyxl und pandas werden erst im jeweiligen Bericht geladen.
 """
 
-from pathlib import Path
-from datetime import date
-import copy
+from __future__ import annotations
 
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side, numbers
-from openpyxl.utils import get_column_letter
-from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN
+import re
+import sys
+import copy
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from config import (
-    PPTX_TEMPLATE, OUTPUT_REVIEW, OUTPUT_CHARTS, OUTPUT_REPORTS,
-    QUARTAL, STICHTAG, AMPEL_FARBEN, DASHBOARD_COLS,
+    PPTX_TEMPLATE, PPTX_FOLIENPLAN, OUTPUT_CHARTS, OUTPUT_REPORTS, PPTX_BILDFORMAT, PPTX_STATUS_ZEILEN,
+    QUARTAL, STICHTAG, AMPEL_FARBEN, DASHBOARD_COLS, LEISTUNGSBEREICHE,
 )
+from pptxtabelle import tabelle
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+_QUARTAL_DATEI = QUARTAL.replace("/", "")
+PPTX_PFAD = OUTPUT_REPORTS / f"Projektportfolio_LV-Vorhaben_{_QUARTAL_DATEI}.pptx"
+DASHBOARD_EXCEL_PFAD = OUTPUT_REPORTS / f"Portfolio_Dashboard_{_QUARTAL_DATEI}.xlsx"
+LV_MONITORING_PFAD = OUTPUT_REPORTS / f"LV_Monitoring_{_QUARTAL_DATEI}.xlsx"
 
 
 # =============================================================================
 # 1. PPTX-Quartalsbericht
 # =============================================================================
 
+# Charts in der Reihenfolge der Chart-Folien der Vorlage (Folien 5-10, siehe analysiere_template)
+PPTX_CHARTS = [
+    "ampel_gesamt",
+    "ampel_nach_pag",
+    "projekte_nach_leistungsbereich",
+    "projekte_nach_phase",
+    "budget_plan_vs_ist",
+    "gantt_zeitleiste",
+]
+
+# Spalten fuer die Statusbericht-Tabelle (erste Chart-Folie nach dem Abschnitt "Statusberichte")
+PPTX_TABELLEN_SPALTEN = ["lv_nummer", "projektname", "ampelstatus", "projektphase", "risiko"]
+
 def _find_chart_pngs() -> dict[str, Path]:
     """Findet alle generierten Chart-PNGs."""
     charts = {}
@@ -37,134 +60,448 @@ def _find_chart_pngs() -> dict[str, Path]:
     return charts
 
 
-def _clear_slide_content(slide):
-    """Entfernt alle Shapes ausser Titel von einer Folie."""
-    shapes_to_remove = []
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            text = shape.text_frame.text.strip().lower()
-            # Behalte Titel und Subtitel
-            if shape.shape_id <= 2:
-                continue
-        shapes_to_remove.append(shape)
-    for shape in shapes_to_remove:
-        sp = shape._element
-        sp.getparent().remove(sp)
+def pptx_bilddateien(bildformat: str = PPTX_BILDFORMAT) -> list[Path]:
+    """Alle Chart-Dateien, die generate_pptx() einbettet (fuer die Abhaengigkeiten in pipeline.py)."""
+    if bildformat == "nativ":
+        return []
+    endungen = ["png", "svg"] if bildformat == "svg" else ["png"]
+    return [OUTPUT_CHARTS / f"{name}.{e}" for name in PPTX_CHARTS for e in endungen]
+
+
+# Erweiterung fuer SVG-Bilder (PowerPoint 2016+); das PNG im a:blip bleibt als Fallback
+_SVG_EXT_URI = "{96DAC541-7B7A-43D3-8B79-37D633B846F1}"
+_SVG_NS = "http://schemas.microsoft.com/office/drawing/2016/SVG/main"
+
 
+def _add_svg_picture(slide, svg: Path, png: Path, left, top, width, height):
+    """Fuegt ein Bild mit SVG-Inhalt und PNG-Fallback ein (wie PowerPoint beim Einfuegen einer SVG)."""
+    from lxml import etree
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.opc.package import Part
+    from pptx.oxml.ns import qn
+
+    pic = slide.shapes.add_picture(str(png), left, top, width, height)
+    package = slide.part.package
+    svg_part = Part(package.next_image_partname("svg"), "image/svg+xml", package, svg.read_bytes())
+    r_id = slide.part.relate_to(svg_part, RT.IMAGE)
+
+    blip = pic._element.blipFill.find(qn("a:blip"))
+    ext_lst = etree.SubElement(blip, qn("a:extLst"))
+    ext = etree.SubElement(ext_lst, qn("a:ext"), uri=_SVG_EXT_URI)
+    etree.SubElement(ext, f"{{{_SVG_NS}}}svgBlip", {qn("r:embed"): r_id}, nsmap={"asvg": _SVG_NS})
+    return pic
+
+
+# --- Template-Analyse (Folienplan) ---
+# Die Vorlage wird einmal analysiert; das Ergebnis liegt als JSON in PPTX_FOLIENPLAN und gilt,
+# solange sich der Hash der Vorlage nicht aendert. Jeder weitere Bericht (Quartale, PAG-Varianten)
+# wendet nur noch den Plan an, statt alle Shapes und Runs erneut zu durchsuchen.
+
+_FOLIENPLAN_VERSION = 1
+
+# "Q4/2025", "Q4.2025", "Q4 2025" und "4. Quartal 2025"
+_QUARTAL_TOKEN = re.compile(r"Q[1-4](?P<trenner>[/. ])20\d\d|[1-4]\. Quartal 20\d\d")
+
+_folienplaene: dict[str, dict] = {}
+
+
+def _quartal_ersetzen(text: str) -> str:
+    """Ersetzt alle Quartalsangaben im Format der Vorlage durch QUARTAL."""
+    q, jahr = re.fullmatch(r"Q([1-4])/(\d{4})", QUARTAL).groups()
+
+    def ersatz(m):
+        return f"Q{q}{m['trenner']}{jahr}" if m["trenner"] else f"{q}. Quartal {jahr}"
+    return _QUARTAL_TOKEN.sub(ersatz, text)
+
+
+def analysiere_template(prs) -> dict:
+    """Folienplan einer Vorlage: Abschnittsfolien (Titel-Platzhalter), Chart-Plaetze
+    (Bilder ueber mindestens die halbe Folienbreite) und Runs mit Quartalsangaben."""
+    from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+
+    breite, hoehe = prs.slide_width, prs.slide_height
+    plan = {"folien": len(prs.slides), "abschnitte": [], "chart_plaetze": [], "tokens": []}
+    for i, slide in enumerate(prs.slides):
+        bilder = []
+        for shape in slide.shapes:
+            if (shape.is_placeholder and shape.placeholder_format.type == PP_PLACEHOLDER.TITLE
+                    and shape.has_text_frame):
+                plan["abschnitte"].append({"folie": i, "titel": shape.text_frame.text.strip()})
+            elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE and shape.width >= breite // 2:
+                bilder.append(shape)
+            if shape.has_text_frame:
+                for a, para in enumerate(shape.text_frame.paragraphs):
+                    for r, run in enumerate(para.runs):
+                        if _QUARTAL_TOKEN.search(run.text):
+                            plan["tokens"].append([i, shape.shape_id, a, r])
+        if bilder:
+            bild = max(bilder, key=lambda b: b.width * b.height)
+            # Platz = Breite des Vorlagenbilds, Hoehe bis zum unteren Folienrand
+            plan["chart_plaetze"].append({
+                "folie": i,
+                "bilder": [b.shape_id for b in bilder],
+                "position": [bild.left, bild.top, bild.width, hoehe - bild.top],
+            })
+    return plan
+
+
+def folienplan(prs, template: Path = PPTX_TEMPLATE) -> dict:
+    """Folienplan aus Speicher oder PPTX_FOLIENPLAN; bei neuer/geaenderter Vorlage neu analysiert."""
+    from build import datei_hash
+
+    schluessel = f"{_FOLIENPLAN_VERSION}:{datei_hash(template)}"
+    if schluessel in _folienplaene:
+        return _folienplaene[schluessel]
+    plan = None
+    if PPTX_FOLIENPLAN.exists():
+        try:
+            gespeichert = json.loads(PPTX_FOLIENPLAN.read_text(encoding="utf-8"))
+            if gespeichert.get("schluessel") == schluessel:
+                plan = gespeichert["plan"]
+            else:
+                print(f"  Vorlage geaendert, Folienplan wird neu erstellt: {template.name}")
+        except (OSError, ValueError, KeyError):
+            pass
+    if plan is None:
+        plan = analysiere_template(prs)
+        PPTX_FOLIENPLAN.parent.mkdir(parents=True, exist_ok=True)
+        tmp = PPTX_FOLIENPLAN.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"schluessel": schluessel, "vorlage": template.name, "plan": plan},
+                                  indent=1), encoding="utf-8")
+        tmp.replace(PPTX_FOLIENPLAN)
+    _folienplaene[schluessel] = plan
+    return plan
+
+
+def _zuordnung(plan: dict, template: Path = PPTX_TEMPLATE) -> tuple[dict[str, dict], dict | None]:
+    """Chart-Name → Chart-Platz und Platz der Statusbericht-Tabelle.
+
+    Charts belegen die Chart-Plaetze vor dem Abschnitt "Statusberichte" in der Reihenfolge
+    von PPTX_CHARTS, die Tabelle den ersten Platz danach. Passt die Vorlage nicht, wird
+    abgebrochen statt in falsche Folien zu schreiben.
+    """
+    status_ab = next((a["folie"] for a in plan["abschnitte"] if "statusbericht" in a["titel"].lower()),
+                     plan["folien"])
+    vorher = [p for p in plan["chart_plaetze"] if p["folie"] < status_ab]
+    nachher = [p for p in plan["chart_plaetze"] if p["folie"] > status_ab]
+    if len(vorher) < len(PPTX_CHARTS):
+        raise ValueError(
+            f"PPTX-Vorlage {template.name}: {len(vorher)} Chart-Folien vor den Statusberichten "
+            f"gefunden, {len(PPTX_CHARTS)} benoetigt ({', '.join(PPTX_CHARTS)})")
+    return dict(zip(PPTX_CHARTS, vorher)), (nachher[0] if nachher else None)
+
+
+def _anwenden_tokens(prs, plan: dict):
+    """Ersetzt die Quartalsangaben an den im Plan vermerkten Stellen."""
+    shapes = {}
+    for folie, shape_id, absatz, run in plan["tokens"]:
+        if folie not in shapes:
+            shapes[folie] = {s.shape_id: s for s in prs.slides[folie].shapes}
+        r = shapes[folie][shape_id].text_frame.paragraphs[absatz].runs[run]
+        r.text = _quartal_ersetzen(r.text)
+
+
+def _einpassen(position: list[int], png: Path) -> tuple[int, int, int, int]:
+    """Bildgroesse im Chart-Platz mit Seitenverhaeltnis des PNG, horizontal zentriert."""
+    from pptx.parts.image import Image
+
+    left, top, width, height = position
+    px_breite, px_hoehe = Image.from_file(str(png)).size
+    skala = min(width / px_breite, height / px_hoehe)
+    b, h = int(px_breite * skala), int(px_hoehe * skala)
+    return left + (width - b) // 2, top, b, h
+
+
+def _entferne_shapes(slide, shape_ids: list[int]):
+    for shape in [s for s in slide.shapes if s.shape_id in shape_ids]:
+        shape._element.getparent().remove(shape._element)
+
+
+# --- Statusbericht-Tabelle (paginiert) ---
+
+_TABELLEN_KOPF = ["LV-Nr.", "Projektname", "Ampel", "Phase", "Risiko"]
+_TABELLEN_BREITEN = [1.2, 2.9, 0.9, 1.5, 2.9]   # relativ
+_TABELLEN_KUERZEN = {"projektname": 50, "risiko": 60}   # Zeichen, damit jede Zeile einzeilig bleibt
+
+
+def _dupliziere_folie(prs, vorlage):
+    """Kopie einer Folie (gleiches Layout, alle Shapes samt Bildbeziehungen) direkt dahinter."""
+    # Wie Slides.add_slide, aber ohne die Platzhalter des Layouts (werden durch die Kopie ersetzt)
+    r_id, neu = prs.part.add_slide(vorlage.slide_layout)
+    ids = prs.slides._sldIdLst
+    eintrag = ids.add_sldId(r_id)
+    ids.remove(eintrag)
+    ids.insert(next(i for i, e in enumerate(ids) if e.id == vorlage.slide_id) + 1, eintrag)
+    rels = {}
+    for element in vorlage.shapes._spTree.iterchildren():
+        if element.tag.endswith(("}nvGrpSpPr", "}grpSpPr")):
+            continue
+        kopie = copy.deepcopy(element)
+        for knoten in kopie.iter():
+            for attr, alt_id in knoten.attrib.items():
+                if attr.startswith("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"):
+                    if alt_id not in rels:
+                        rel = vorlage.part.rels[alt_id]
+                        rels[alt_id] = neu.part.relate_to(rel.target_part, rel.reltype)
+                    knoten.set(attr, rels[alt_id])
+        neu.shapes._spTree.append(kopie)
+    return neu
+
+
+def _statusfolien(prs, gelb_rot: pd.DataFrame, platz: dict) -> int:
+    """Statustabelle ueber so viele Folien wie noetig (PPTX_STATUS_ZEILEN Projekte je Folie).
+    Die Folgefolien sind Kopien der Statusfolie der Vorlage. Liefert die Anzahl Folien."""
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
+
+    werte = gelb_rot.reindex(columns=PPTX_TABELLEN_SPALTEN).fillna("").astype(str)
+    for spalte, laenge in _TABELLEN_KUERZEN.items():
+        werte[spalte] = werte[spalte].str.slice(0, laenge)
+    werte = werte.to_numpy().tolist()
+    seiten = [werte[i:i + PPTX_STATUS_ZEILEN] for i in range(0, len(werte), PPTX_STATUS_ZEILEN)]
+
+    folie = prs.slides[platz["folie"]]
+    _entferne_shapes(folie, platz["bilder"])
+    folien = [folie]
+    for _ in seiten[1:]:
+        folien.append(_dupliziere_folie(prs, folien[-1]))
+
+    left, top, width, height = platz["position"]
+    rand, kopf = Inches(0.3), Inches(0.4)
+    zeilenhoehe = int((height - kopf - Inches(0.1)) / (PPTX_STATUS_ZEILEN + 1))
+    for nr, (folie, seite) in enumerate(zip(folien, seiten), 1):
+        titel = f"Statusberichte mit Handlungsbedarf ({QUARTAL})"
+        if len(seiten) > 1:
+            titel += f" – {nr}/{len(seiten)}"
+        box = folie.shapes.add_textbox(left + rand, top, width - 2 * rand, kopf)
+        absatz = box.text_frame.paragraphs[0]
+        absatz.text = titel
+        absatz.font.size = Pt(14)
+        absatz.font.bold = True
+        absatz.font.color.rgb = RGBColor(0x1F, 0x4E, 0x79)
+        tabelle(folie, seite, left + rand, top + kopf, width - 2 * rand, zeilenhoehe,
+                kopf=_TABELLEN_KOPF, breiten=_TABELLEN_BREITEN, ampel_spalte=2)
+    return len(folien)
+
+
+# --- Native PPTX-Charts (PPTX_BILDFORMAT = "nativ") ---
+# Direkt aus dem DataFrame, ohne die Chart-Stufe; im PPTX editierbar (Daten im eingebetteten Excel).
+
+_AMPEL_ORDER = ["In Ordnung", "Vorsicht", "Krise"]
+_PHASE_ORDER = [
+    "Idee erfasst/noch nicht gestartet", "Planung", "In Arbeit",
+    "Blockiert", "Abgeschlossen", "Abgebrochen",
+]
+_PHASE_FARBEN = {
+    "Idee erfasst/noch nicht gestartet": "#90CAF9",
+    "Planung": "#42A5F5", "In Arbeit": "#1565C0",
+    "Blockiert": "#FF7043", "Abgeschlossen": "#66BB6A", "Abgebrochen": "#BDBDBD",
+}
+_LB_FARBEN = ["#2E86AB", "#A23B72", "#F18F01", "#C73E1D"]
+_JAHRE = ["2025", "2026", "2027"]
+
+
+def _rgb(hex_farbe: str):
+    from pptx.dml.color import RGBColor
+    return RGBColor.from_string(hex_farbe.lstrip("#"))
+
+
+def _faerbe(serie_oder_punkt, hex_farbe: str):
+    serie_oder_punkt.format.fill.solid()
+    serie_oder_punkt.format.fill.fore_color.rgb = _rgb(hex_farbe)
+
+
+def _nativ_chart(slide, typ, daten, position, titel: str, legende: bool = True):
+    from pptx.enum.chart import XL_LEGEND_POSITION
+    from pptx.util import Pt
+
+    chart = slide.shapes.add_chart(typ, *position, daten).chart
+    chart.has_title = True
+    chart.chart_title.text_frame.text = f"{titel} ({QUARTAL})"
+    chart.chart_title.text_frame.paragraphs[0].font.size = Pt(16)
+    chart.chart_title.text_frame.paragraphs[0].font.bold = True
+    chart.has_legend = legende
+    if legende:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    chart.font.size = Pt(10)
+    return chart
+
+
+def _nativ_ampel_gesamt(slide, df, position):
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    counts = df["ampelstatus"].value_counts()
+    labels = [a for a in _AMPEL_ORDER if a in counts.index]
+    daten = CategoryChartData()
+    daten.categories = labels
+    daten.add_series("Projekte", [int(counts[a]) for a in labels])
+    chart = _nativ_chart(slide, XL_CHART_TYPE.DOUGHNUT, daten, position, "Ampelstatus Gesamt")
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.show_value = True
+    for punkt, ampel in zip(plot.series[0].points, labels):
+        _faerbe(punkt, AMPEL_FARBEN[ampel])
+
+
+def _nativ_ampel_nach_pag(slide, df, position):
+    import pandas as pd
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    ct = pd.crosstab(df["pag"], df["ampelstatus"])
+    ct = ct.reindex(columns=[c for c in _AMPEL_ORDER if c in ct.columns], fill_value=0)
+    daten = CategoryChartData()
+    daten.categories = list(ct.index)
+    for ampel in ct.columns:
+        daten.add_series(ampel, [int(v) for v in ct[ampel]])
+    chart = _nativ_chart(slide, XL_CHART_TYPE.COLUMN_STACKED, daten, position, "Ampelstatus nach PAG")
+    for serie, ampel in zip(chart.plots[0].series, ct.columns):
+        _faerbe(serie, AMPEL_FARBEN.get(ampel, "#999999"))
+    chart.plots[0].has_data_labels = True
+
+
+def _nativ_projekte_nach_leistungsbereich(slide, df, position):
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    lb = df["lv_nummer"].astype(str).str.extract(r"^([A-D])", expand=False)
+    counts = lb.map(LEISTUNGSBEREICHE).fillna("Unbekannt").value_counts()
+    daten = CategoryChartData()
+    daten.categories = list(counts.index)
+    daten.add_series("Projekte", [int(v) for v in counts])
+    chart = _nativ_chart(slide, XL_CHART_TYPE.COLUMN_CLUSTERED, daten, position,
+                         "Projekte nach Leistungsbereich", legende=False)
+    for punkt, farbe in zip(chart.plots[0].series[0].points, _LB_FARBEN):
+        _faerbe(punkt, farbe)
+    chart.plots[0].has_data_labels = True
+
+
+def _nativ_projekte_nach_phase(slide, df, position):
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    counts = df["projektphase"].value_counts()
+    phasen = [p for p in _PHASE_ORDER if p in counts.index]
+    daten = CategoryChartData()
+    daten.categories = phasen
+    daten.add_series("Projekte", [int(counts[p]) for p in phasen])
+    chart = _nativ_chart(slide, XL_CHART_TYPE.BAR_CLUSTERED, daten, position,
+                         "Projekte nach Phase", legende=False)
+    chart.category_axis.reverse_order = True
+    for punkt, phase in zip(chart.plots[0].series[0].points, phasen):
+        _faerbe(punkt, _PHASE_FARBEN[phase])
+    chart.plots[0].has_data_labels = True
+
+
+def _nativ_budget(slide, df, position):
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    daten = CategoryChartData(number_format="#,##0")
+    daten.categories = _JAHRE
+    daten.add_series("Plan", [float(df[f"plankosten_{j}"].sum()) for j in _JAHRE])
+    daten.add_series("Ist", [float(df[f"istkosten_{j}"].sum()) for j in _JAHRE])
+    chart = _nativ_chart(slide, XL_CHART_TYPE.COLUMN_CLUSTERED, daten, position, "Budget: Plan vs. Ist")
+    _faerbe(chart.plots[0].series[0], "#1F4E79")
+    _faerbe(chart.plots[0].series[1], "#2E86AB")
+    chart.value_axis.tick_labels.number_format = "#,##0"
+    chart.value_axis.tick_labels.number_format_is_linked = False
+
+
+def _nativ_gantt(slide, df, position):
+    """Gantt als gestapelte Balken: unsichtbarer Abstand bis zum Start + sichtbare Dauer."""
+    import pandas as pd
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    df_gantt = df.dropna(subset=["start", "ende"])
+    df_gantt = df_gantt.assign(start=pd.to_datetime(df_gantt["start"]), ende=pd.to_datetime(df_gantt["ende"]))
+    df_gantt = df_gantt.sort_values("start", kind="stable")
+    # Excel-Datumswerte (Tage seit 30.12.1899)
+    start = (df_gantt["start"] - pd.Timestamp("1899-12-30")).dt.days
+    dauer = (df_gantt["ende"] - df_gantt["start"]).dt.days.clip(lower=7)
+
+    daten = CategoryChartData()
+    daten.categories = (df_gantt["lv_nummer"].astype(str) + "  "
+                        + df_gantt["projektname"].astype(str).str[:35]).tolist()
+    daten.add_series("Start", start.tolist())
+    daten.add_series("Dauer", dauer.tolist())
+    chart = _nativ_chart(slide, XL_CHART_TYPE.BAR_STACKED, daten, position,
+                         "Projektzeitleiste", legende=False)
+    versatz, balken = chart.plots[0].series
+    versatz.format.fill.background()
+    for punkt, ampel in zip(balken.points, df_gantt["ampelstatus"]):
+        _faerbe(punkt, AMPEL_FARBEN.get(ampel, "#1F4E79"))
+    chart.category_axis.reverse_order = True
+    if len(start):
+        chart.value_axis.minimum_scale = int(start.min()) - 15
+        chart.value_axis.maximum_scale = int((start + dauer).max()) + 15
+    chart.value_axis.tick_labels.number_format = "mmm yy"
+    chart.value_axis.tick_labels.number_format_is_linked = False
+
+
+# Chart-Name (wie in PPTX_CHARTS) → (Funktion, verwendete Spalten)
+NATIVE_CHARTS = {
+    "ampel_gesamt": (_nativ_ampel_gesamt, ["ampelstatus"]),
+    "ampel_nach_pag": (_nativ_ampel_nach_pag, ["pag", "ampelstatus"]),
+    "projekte_nach_leistungsbereich": (_nativ_projekte_nach_leistungsbereich, ["lv_nummer"]),
+    "projekte_nach_phase": (_nativ_projekte_nach_phase, ["projektphase"]),
+    "budget_plan_vs_ist": (_nativ_budget, [f"{art}_{j}" for art in ("plankosten", "istkosten") for j in _JAHRE]),
+    "gantt_zeitleiste": (_nativ_gantt, ["start", "ende", "ampelstatus", "lv_nummer", "projektname"]),
+}
+
+
+def generate_pptx(df: pd.DataFrame, bildformat: str = PPTX_BILDFORMAT, output_path: Path | None = None):
+    """Generiert den Quartalsbericht als PPTX basierend auf dem Template.
+    bildformat "svg" bettet die Charts als Vektorgrafik ein (PNG als Fallback),
+    "nativ" erzeugt PowerPoint-Diagramme direkt aus df (ohne output/charts)."""
+    from pptx import Presentation
 
-def generate_pptx(df: pd.DataFrame):
-    """Generiert den Quartalsbericht als PPTX basierend auf dem Template."""
     OUTPUT_REPORTS.mkdir(parents=True, exist_ok=True)
 
-    # Template oeffnen
+    # Template oeffnen; Folienplan nur bei neuer/geaenderter Vorlage analysieren
     if PPTX_TEMPLATE.exists():
         prs = Presentation(str(PPTX_TEMPLATE))
         print(f"  Template geladen: {PPTX_TEMPLATE.name}")
+        plan = folienplan(prs)
+        chart_plaetze, status_platz = _zuordnung(plan)
+        _anwenden_tokens(prs, plan)
     else:
         prs = Presentation()
         print("  Kein Template gefunden, erstelle neue Praesentation.")
+        chart_plaetze, status_platz = {}, None
 
-    charts = _find_chart_pngs()
+    charts = _find_chart_pngs() if bildformat != "nativ" else {}
 
-    # --- Titelfolie aktualisieren (Folie 1) ---
-    if len(prs.slides) > 0:
-        slide = prs.slides[0]
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                for para in shape.text_frame.paragraphs:
-                    for run in para.runs:
-                        if "Q4/2025" in run.text or "Q4 2025" in run.text:
-                            run.text = run.text.replace("Q4/2025", QUARTAL).replace("Q4 2025", QUARTAL)
-                        if "2025" in run.text and "Q" not in run.text and "LV" not in run.text:
-                            run.text = run.text.replace("2025", "2026")
-
-    # --- Chart-Folien: Bestehende Bilder ersetzen (Folien 5-10) ---
-    chart_mapping = {
-        4: "ampel_gesamt",           # Folie 5
-        5: "ampel_nach_pag",         # Folie 6
-        6: "projekte_nach_leistungsbereich",  # Folie 7
-        7: "projekte_nach_phase",    # Folie 8
-        8: "budget_plan_vs_ist",     # Folie 9
-        9: "gantt_zeitleiste",       # Folie 10
-    }
-
-    for slide_idx, chart_name in chart_mapping.items():
-        if slide_idx < len(prs.slides) and chart_name in charts:
-            slide = prs.slides[slide_idx]
-            # Bestehende Bilder entfernen
-            pics_to_remove = []
-            for shape in slide.shapes:
-                if shape.shape_type == 13:  # Picture
-                    pics_to_remove.append(shape)
-            for pic in pics_to_remove:
-                sp = pic._element
-                sp.getparent().remove(sp)
-            # Neues Chart-Bild einfuegen
-            slide.shapes.add_picture(
-                str(charts[chart_name]),
-                Inches(0.5), Inches(1.5),
-                Inches(9), Inches(5.5),
-            )
-
-    # --- Statusbericht-Folien: Gelbe/Rote Projekte (Folien 12-13) ---
-    gelb_rot = df[df["ampelstatus"].isin(["Vorsicht", "Krise"])].copy()
-
-    if len(prs.slides) > 11 and not gelb_rot.empty:
-        # Folie 12: Tabelle mit gelben/roten Projekten
-        slide = prs.slides[11]
-        _clear_slide_content(slide)
-
-        # Titel setzen
-        if slide.shapes.title:
-            slide.shapes.title.text = f"Statusberichte mit Handlungsbedarf ({QUARTAL})"
-
-        # Tabelle erstellen
-        rows_count = len(gelb_rot) + 1  # +1 fuer Header
-        cols_count = 5
-        table_shape = slide.shapes.add_table(
-            rows_count, cols_count,
-            Inches(0.3), Inches(1.5), Inches(9.4), Inches(0.4 * rows_count),
-        )
-        table = table_shape.table
-
-        # Header
-        headers = ["LV-Nr.", "Projektname", "Ampel", "Phase", "Risiko"]
-        for j, h in enumerate(headers):
-            cell = table.cell(0, j)
-            cell.text = h
-            for para in cell.text_frame.paragraphs:
-                para.font.size = Pt(9)
-                para.font.bold = True
-                para.font.color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = RGBColor(0x1F, 0x4E, 0x79)
-
-        # Daten
-        for i, (_, row) in enumerate(gelb_rot.iterrows(), 1):
-            vals = [
-                str(row.get("lv_nummer", "")),
-                str(row.get("projektname", ""))[:50],
-                str(row.get("ampelstatus", "")),
-                str(row.get("projektphase", "")),
-                str(row.get("risiko", "")),
-            ]
-            for j, val in enumerate(vals):
-                cell = table.cell(i, j)
-                cell.text = val
-                for para in cell.text_frame.paragraphs:
-                    para.font.size = Pt(8)
-                # Ampelfarbe
-                if j == 2:
-                    ampel = row.get("ampelstatus", "")
-                    if ampel == "Krise":
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = RGBColor(0xF4, 0x43, 0x36)
-                    elif ampel == "Vorsicht":
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = RGBColor(0xFF, 0xC1, 0x07)
+    # --- Chart-Folien: Bilder der Vorlage durch die Charts ersetzen ---
+    for chart_name, platz in chart_plaetze.items():
+        if chart_name in charts or bildformat == "nativ":
+            slide = prs.slides[platz["folie"]]
+            _entferne_shapes(slide, platz["bilder"])
+            if bildformat == "nativ":
+                NATIVE_CHARTS[chart_name][0](slide, df, platz["position"])
+                continue
+            position = _einpassen(platz["position"], charts[chart_name])
+            svg = charts[chart_name].with_suffix(".svg")
+            if bildformat == "svg" and svg.exists():
+                _add_svg_picture(slide, svg, charts[chart_name], *position)
+            else:
+                if bildformat == "svg":
+                    print(f"  Hinweis: {svg.name} fehlt (\"svg\" in CHART_FORMATE?), verwende PNG.")
+                slide.shapes.add_picture(str(charts[chart_name]), *position)
+
+    # --- Statusbericht-Folien: Gelbe/Rote Projekte ---
+    gelb_rot = df[df["ampelstatus"].isin(["Vorsicht", "Krise"])]
+    if status_platz is not None and not gelb_rot.empty:
+        seiten = _statusfolien(prs, gelb_rot, status_platz)
+        if seiten > 1:
+            print(f"  Statusberichte: {len(gelb_rot)} Projekte auf {seiten} Folien")
 
     # Speichern
-    output_path = OUTPUT_REPORTS / f"Projektportfolio_LV-Vorhaben_{QUARTAL.replace('/', '')}.pptx"
+    if output_path is None:
+        output_path = PPTX_PFAD
     prs.save(str(output_path))
     print(f"  PPTX gespeichert: {output_path}")
 
@@ -175,34 +512,13 @@ def generate_pptx(df: pd.DataFrame):
 
 def generate_dashboard_excel(df: pd.DataFrame):
     """Erzeugt ein Dashboard-Excel im Portfolio_Daten-Format mit Conditional Formatting."""
-    OUTPUT_REPORTS.mkdir(parents=True, exist_ok=True)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Portfolio_Daten"
+    from excelexport import schreibe_tabelle, zeilenwerte, ampel, prozent
 
     # Spaltenreihenfolge gemaess DASHBOARD_COLS
     col_order = [name for _, name in sorted(DASHBOARD_COLS.items())]
     # Nur Spalten die im DataFrame existieren
     col_order = [c for c in col_order if c in df.columns]
 
-    # Header (Zeile 1 = Titel, Daten ab Zeile 5 wie im Original)
-    ws.merge_cells("A1:H1")
-    title_cell = ws["A1"]
-    title_cell.value = f"Projektportfolio LV-Vorhaben 2025-2027 — {QUARTAL}"
-    title_cell.font = Font(size=14, bold=True, color="1F4E79")
-
-    ws.merge_cells("A2:H2")
-    ws["A2"].value = f"Stand: {STICHTAG.strftime('%d.%m.%Y')}"
-    ws["A2"].font = Font(size=10, italic=True)
-
-    # Spaltenheader in Zeile 4
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=9)
-    thin_border = Border(
-        left=Side(style="thin"), right=Side(style="thin"),
-        top=Side(style="thin"), bottom=Side(style="thin"),
-    )
-
     # Lesbare Spaltennamen
     col_labels = {
         "lv_nummer": "LV-Nummer",
@@ -248,77 +564,36 @@ def generate_dashboard_excel(df: pd.DataFrame):
         "entscheidung_vorperiode": "Entscheidungsbedarf (Vorperiode)",
     }
 
-    for col_idx, col_name in enumerate(col_order, 1):
-        cell = ws.cell(row=4, column=col_idx)
-        cell.value = col_labels.get(col_name, col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", wrap_text=True)
-        cell.border = thin_border
-
-    # Daten ab Zeile 5
-    ampel_fills = {
-        "In Ordnung": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-        "Vorsicht": PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
-        "Krise": PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
-    }
-
-    ampel_col_idx = col_order.index("ampelstatus") + 1 if "ampelstatus" in col_order else None
-
-    for row_idx, (_, row) in enumerate(df.iterrows(), 5):
-        for col_idx, col_name in enumerate(col_order, 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            val = row.get(col_name)
-            if pd.isna(val):
-                val = ""
-            cell.value = val
-            cell.border = thin_border
-            cell.font = Font(size=9)
-
-            # Prozentformat
-            if col_name in ("istkosten_prozent", "fertigstellungsgrad"):
-                if val and val != "":
-                    cell.number_format = "0%"
-
-            # Waehrungsformat
-            if "kosten" in col_name and "prozent" not in col_name:
-                cell.number_format = '#,##0.00 "EUR"'
-
-        # Ampelstatus einfaerben
-        if ampel_col_idx:
-            ampel_cell = ws.cell(row=row_idx, column=ampel_col_idx)
-            ampel_val = str(ampel_cell.value).strip()
-            if ampel_val in ampel_fills:
-                ampel_cell.fill = ampel_fills[ampel_val]
+    # Formatvorlage je Spalte: Ampel eingefaerbt, Prozent- und Waehrungsformat
+    stile = []
+    for col_name in col_order:
+        if col_name == "ampelstatus":
+            stile.append(ampel("zelle"))
+        elif col_name in ("istkosten_prozent", "fertigstellungsgrad"):
+            stile.append(prozent("zelle"))
+        elif "kosten" in col_name and "prozent" not in col_name:
+            stile.append("zelle_eur")
+        else:
+            stile.append("zelle")
 
     # Spaltenbreiten
     widths = {"lv_nummer": 12, "projektname": 35, "kurzbeschreibung": 25, "pag": 10,
               "ampelstatus": 15, "projektphase": 20, "projektleitung": 18}
-    for col_idx, col_name in enumerate(col_order, 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = widths.get(col_name, 14)
-
-    # Autofilter
-    last_col = get_column_letter(len(col_order))
-    last_row = 4 + len(df)
-    ws.auto_filter.ref = f"A4:{last_col}{last_row}"
-
-    # Zeile fixieren
-    ws.freeze_panes = "A5"
-
-    # Als Tabelle definieren (Tabelle1)
-    from openpyxl.worksheet.table import Table, TableStyleInfo
-    tab = Table(
-        displayName="Tabelle1",
-        ref=f"A4:{last_col}{last_row}",
-    )
-    tab.tableStyleInfo = TableStyleInfo(
-        name="TableStyleMedium2", showFirstColumn=False,
-        showLastColumn=False, showRowStripes=True, showColumnStripes=False,
-    )
-    ws.add_table(tab)
 
-    output_path = OUTPUT_REPORTS / f"Portfolio_Dashboard_{QUARTAL.replace('/', '')}.xlsx"
-    wb.save(str(output_path))
+    # Zeile 1-2 = Titel, Header in Zeile 4, Daten ab Zeile 5 wie im Original;
+    # Autofilter, fixierte Kopfzeile und Tabelle "Tabelle1"
+    output_path = DASHBOARD_EXCEL_PFAD
+    schreibe_tabelle(
+        output_path, "Portfolio_Daten",
+        kopf=[col_labels.get(c, c) for c in col_order],
+        zeilen=zeilenwerte(df, col_order),
+        stile=stile,
+        breiten=[widths.get(c, 14) for c in col_order],
+        kopfstil="kopf_klein",
+        titel=[(f"Projektportfolio LV-Vorhaben 2025-2027 — {QUARTAL}", "titel"),
+               (f"Stand: {STICHTAG.strftime('%d.%m.%Y')}", "untertitel")],
+        einfrieren=True, autofilter=True, tabelle="Tabelle1",
+    )
     print(f"  Dashboard-Excel gespeichert: {output_path}")
 
 
@@ -328,86 +603,30 @@ def generate_dashboard_excel(df: pd.DataFrame):
 
 def generate_lv_monitoring(df: pd.DataFrame):
     """Erzeugt das LV-Monitoring-Excel: Ampelstatus + Erlaeuterung + Zielwerte pro Vorhaben."""
-    OUTPUT_REPORTS.mkdir(parents=True, exist_ok=True)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "LV-Monitoring"
-
-    # Titel
-    ws.merge_cells("A1:H1")
-    ws["A1"].value = f"LV-Monitoring — {QUARTAL}"
-    ws["A1"].font = Font(size=14, bold=True, color="1F4E79")
+    from excelexport import schreibe_tabelle, zeilenwerte, ampel
 
-    ws.merge_cells("A2:H2")
-    ws["A2"].value = f"Stand: {STICHTAG.strftime('%d.%m.%Y')} | Leistungsvereinbarung 2025-2027"
-    ws["A2"].font = Font(size=10, italic=True)
-
-    # Header
     headers = [
         "LV-Nummer", "Projektname", "Leistungsbereich", "PAG",
         "Ampelstatus", "Erlaeuterung Ampel",
         "Ziele gemaess LV", "Fertigstellungsgrad",
     ]
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=10)
-    thin_border = Border(
-        left=Side(style="thin"), right=Side(style="thin"),
-        top=Side(style="thin"), bottom=Side(style="thin"),
+    spalten = ["lv_nummer", "projektname", "leistungsbereich", "pag",
+               "ampelstatus", "status_aktuell", "ziele", "fertigstellungsgrad"]
+
+    # Alle Zellen mit Umbruch, Ampelstatus eingefaerbt, Fertigstellungsgrad als Prozent
+    stile = ["zelle_umbruch"] * 8
+    stile[4] = ampel("zelle_umbruch")
+    stile[7] = "zelle_umbruch_prozent"
+
+    output_path = LV_MONITORING_PFAD
+    schreibe_tabelle(
+        output_path, "LV-Monitoring",
+        kopf=headers, zeilen=zeilenwerte(df, spalten), stile=stile,
+        breiten=[12, 35, 20, 10, 15, 45, 35, 12],
+        titel=[(f"LV-Monitoring — {QUARTAL}", "titel"),
+               (f"Stand: {STICHTAG.strftime('%d.%m.%Y')} | Leistungsvereinbarung 2025-2027", "untertitel")],
+        einfrieren=True,
     )
-
-    for col_idx, h in enumerate(headers, 1):
-        cell = ws.cell(row=4, column=col_idx)
-        cell.value = h
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", wrap_text=True)
-        cell.border = thin_border
-
-    # Daten
-    ampel_fills = {
-        "In Ordnung": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-        "Vorsicht": PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
-        "Krise": PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
-    }
-
-    for row_idx, (_, row) in enumerate(df.iterrows(), 5):
-        vals = [
-            row.get("lv_nummer", ""),
-            row.get("projektname", ""),
-            row.get("leistungsbereich", ""),
-            row.get("pag", ""),
-            row.get("ampelstatus", ""),
-            row.get("status_aktuell", ""),
-            row.get("ziele", ""),
-            row.get("fertigstellungsgrad", 0),
-        ]
-        for col_idx, val in enumerate(vals, 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            if pd.isna(val):
-                val = ""
-            cell.value = val
-            cell.border = thin_border
-            cell.font = Font(size=9)
-            cell.alignment = Alignment(wrap_text=True, vertical="top")
-
-            # Ampelstatus einfaerben
-            if col_idx == 5:
-                ampel_val = str(val).strip()
-                if ampel_val in ampel_fills:
-                    cell.fill = ampel_fills[ampel_val]
-
-            # Fertigstellungsgrad als Prozent
-            if col_idx == 8:
-                cell.number_format = "0%"
-
-    # Spaltenbreiten
-    for col_idx, width in enumerate([12, 35, 20, 10, 15, 45, 35, 12], 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
-
-    ws.freeze_panes = "A5"
-
-    output_path = OUTPUT_REPORTS / f"LV_Monitoring_{QUARTAL.replace('/', '')}.xlsx"
-    wb.save(str(output_path))
     print(f"  LV-Monitoring gespeichert: {output_path}")
 
 
@@ -415,33 +634,55 @@ def generate_lv_monitoring(df: pd.DataFrame):
 # Main
 # =============================================================================
 
-def main():
+# Alle Berichte: Name → (Funktion, Ausgabedatei, verwendete Spalten).
+# Die Spalten nutzt pipeline.py, um nur Berichte mit geaenderten Daten neu zu erzeugen.
+REPORTS = {
+    "pptx": (generate_pptx, PPTX_PFAD, PPTX_TABELLEN_SPALTEN + (
+        sorted({s for _, spalten in NATIVE_CHARTS.values() for s in spalten})
+        if PPTX_BILDFORMAT == "nativ" else [])),
+    "dashboard_excel": (generate_dashboard_excel, DASHBOARD_EXCEL_PFAD,
+                        [name for _, name in sorted(DASHBOARD_COLS.items())]),
+    "lv_monitoring": (generate_lv_monitoring, LV_MONITORING_PFAD, [
+        "lv_nummer", "projektname", "leistungsbereich", "pag", "ampelstatus",
+        "status_aktuell", "ziele", "fertigstellungsgrad",
+    ]),
+}
+
+_REPORT_TITEL = {
+    "pptx": "Quartalsbericht (PPTX)",
+    "dashboard_excel": "Dashboard-Excel",
+    "lv_monitoring": "LV-Monitoring",
+}
+
+
+def main(df: pd.DataFrame | None = None, namen: list[str] | None = None):
+    """Erzeugt alle (oder die angegebenen) Berichte. Ohne df werden die konsolidierten
+    Daten von der Platte geladen."""
+    unbekannt = [n for n in namen or [] if n not in REPORTS]
+    if unbekannt:
+        print(f"Unbekannte Berichte: {', '.join(unbekannt)} (verfuegbar: {', '.join(REPORTS)})")
+        sys.exit(1)
+
     print(f"=== Berichtsgenerierung ({QUARTAL}) ===\n")
 
     # Daten laden
-    data_path = OUTPUT_REVIEW / "konsolidiert.xlsx"
-    if not data_path.exists():
-        print("FEHLER: Bitte zuerst 01_konsolidierung.py ausfuehren!")
-        return
-    df = pd.read_excel(data_path, sheet_name="Konsolidiert")
+    if df is None:
+        from datenbasis import lade_konsolidiert
+        try:
+            df = lade_konsolidiert()
+        except FileNotFoundError:
+            print("FEHLER: Bitte zuerst 01_konsolidierung.py ausfuehren!")
+            return
     print(f"  {len(df)} Projekte geladen.\n")
 
-    # 1. PPTX
-    print("1. Quartalsbericht (PPTX)...")
-    generate_pptx(df)
-    print()
-
-    # 2. Dashboard-Excel
-    print("2. Dashboard-Excel...")
-    generate_dashboard_excel(df)
-    print()
-
-    # 3. LV-Monitoring
-    print("3. LV-Monitoring...")
-    generate_lv_monitoring(df)
+    gewaehlt = [n for n in REPORTS if not namen or n in namen]
+    for nr, name in enumerate(gewaehlt, 1):
+        print(f"{nr}. {_REPORT_TITEL[name]}...")
+        REPORTS[name][0](df)
+        print()
 
-    print(f"\nFertig. Berichte in: {OUTPUT_REPORTS}")
+    print(f"Fertig. Berichte in: {OUTPUT_REPORTS}")
 
 
 if __name__ == "__main__":
-    main()
+    main(namen=sys.argv[1:] or None)
@@ -0,0 +1,322 @@
+"""
+04_steckbriefe.py — Projekt-Steckbriefe: ein One-Pager (PPTX) pro PSB.
+
+Ausfuehrung: python 04_steckbriefe.py                    (alle PSBs)
+             python 04_steckbriefe.py A1.1.1.1 C1.2.2    (nur ausgewaehlte PSBs, Dateiname ohne PSB_)
+Voraussetzung: quelldaten/psb/, fuer das Budget output/review/konsolidiert.parquet (oder .xlsx)
+Ergebnis:      output/reports/steckbriefe/Steckbrief_<PSB>_<Quartal>.pptx
+
+Inhalt: Kopf (LV-Nr., Bezeichnung, PAG, Projektleitung, Phase, Fertigstellungsgrad), Ampel,
+Meilensteine, Textbloecke (Erlaeuterung Ampel, Risiken, Entscheidungsbedarf), Zielwerte und
+Budget (Plan/Ist je Jahr aus dem SAP-Auszug).
+
+Die PSBs kommen ueber den PSB-Cache (wie in 01_konsolidierung.py). Die Vorlage (Folienformat,
+Kopfband, Ueberschriften, Textformate) wird einmal erzeugt und als Bytes an die Worker
+uebergeben, ebenso das Budget aller Projekte. Jeder Worker schreibt seinen Steckbrief sofort
+auf die Platte und meldet nur (Datei, Sekunden, Fehler) zurueck; im Speicher liegt also nie
+mehr als ein Steckbrief pro Worker.
+"""
+
+from __future__ import annotations
+
+import gc
+import io
+import sys
+import time
+import importlib
+import traceback
+from pathlib import Path
+from datetime import date
+from typing import TYPE_CHECKING
+
+from config import (
+    OUTPUT_STECKBRIEFE, STECKBRIEF_WORKERS, PSB_CACHE_AKTIV, AMPEL_FARBEN, QUARTAL, psb_dateien,
+)
+from pptxtabelle import tabelle
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_QUARTAL_DATEI = QUARTAL.replace("/", "")
+_JAHRE = ["2025", "2026", "2027"]
+BUDGET_SPALTEN = [f"{art}_{j}" for art in ("plankosten", "istkosten") for j in _JAHRE]
+
+# Zeichen je Textblock, damit der Steckbrief auf eine Folie passt
+_TEXT_LAENGE = {"erlaeuterung_ampel": 600, "risiken": 450, "entscheidungsbedarf": 300}
+
+
+def steckbrief_pfad(psb_datei: Path) -> Path:
+    return OUTPUT_STECKBRIEFE / f"Steckbrief_{psb_datei.stem.removeprefix('PSB_')}_{_QUARTAL_DATEI}.pptx"
+
+
+# =============================================================================
+# 1. Vorlage (einmal pro Lauf)
+# =============================================================================
+
+# Textfelder der Vorlage: Name → (left, top, width, height in Zoll, Schriftgroesse pt, fett, Farbe)
+_FELDER = {
+    "titel": (0.3, 0.06, 7.8, 0.4, 16, True, "FFFFFF"),
+    "untertitel": (0.3, 0.44, 7.8, 0.28, 9, False, "FFFFFF"),
+    "indikator": (0.3, 3.66, 5.2, 0.36, 8, False, "333333"),
+    "erlaeuterung_ampel": (5.7, 1.1, 4.0, 1.05, 8, False, "333333"),
+    "risiken": (5.7, 2.4, 4.0, 0.85, 8, False, "333333"),
+    "entscheidungsbedarf": (5.7, 3.5, 4.0, 0.6, 8, False, "333333"),
+    "fusszeile": (0.3, 5.3, 9.4, 0.25, 7, False, "808080"),
+}
+_UEBERSCHRIFTEN = [
+    ("Meilensteine", 0.3, 0.88), ("Zielwerte", 0.3, 3.42),
+    ("Erläuterung zum Ampelstatus", 5.7, 0.88), ("Risiken und Hindernisse", 5.7, 2.18),
+    ("Entscheidungsbedarf, nächste Schritte", 5.7, 3.28), ("Budget (SAP, EUR)", 5.7, 4.12),
+]
+# Tabellen: Name → (left, top, width in Zoll, Kopfzeile, relative Spaltenbreiten)
+_TABELLEN = {
+    "meilensteine": (0.3, 1.12, 5.2, ["Meilenstein", "Plan LV", "Plan aktuell", "Ist"], [3.2, 1, 1, 1]),
+    "zielwerte": (0.3, 4.05, 5.2, ["", "Ausgang 2023", *_JAHRE], [1.2, 1.2, 1, 1, 1]),
+    "budget": (5.7, 4.35, 4.0, ["", *_JAHRE], [1, 1.2, 1.2, 1.2]),
+}
+_ZEILENHOEHE = 0.24  # Zoll
+
+
+def _textstil(shape, sz: int, fett: bool, farbe: str):
+    """Schriftformat als Listenstil der Textbox: bleibt erhalten, wenn der Text ersetzt wird."""
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import nsdecls, qn
+
+    tx_body = shape._element.txBody
+    alt = tx_body.find(qn("a:lstStyle"))
+    b = ' b="1"' if fett else ""
+    tx_body.replace(alt, parse_xml(
+        f'<a:lstStyle {nsdecls("a")}><a:lvl1pPr><a:defRPr sz="{sz * 100}"{b}>'
+        f'<a:solidFill><a:srgbClr val="{farbe}"/></a:solidFill></a:defRPr></a:lvl1pPr></a:lstStyle>'))
+
+
+def erzeuge_vorlage() -> bytes:
+    """Leere Steckbrief-Folie (16:9) mit Kopfband, Ueberschriften und benannten Textfeldern."""
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.enum.text import MSO_AUTO_SIZE
+    from pptx.util import Inches
+
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(10), Inches(5.625)
+    slide = prs.slides.add_slide(prs.slide_layouts[6])  # leer
+
+    band = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(0.78))
+    band.fill.solid()
+    band.fill.fore_color.rgb = RGBColor(0x1F, 0x4E, 0x79)
+    band.line.fill.background()
+
+    ampel = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(8.3), Inches(0.18),
+                                   Inches(1.4), Inches(0.42))
+    ampel.name = "ampel"
+    ampel.line.fill.background()
+    _textstil(ampel, 10, True, "FFFFFF")
+
+    for name, (left, top, width, height, sz, fett, farbe) in _FELDER.items():
+        box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+        box.name = name
+        box.text_frame.word_wrap = True
+        box.text_frame.auto_size = MSO_AUTO_SIZE.NONE
+        _textstil(box, sz, fett, farbe)
+    for text, left, top in _UEBERSCHRIFTEN:
+        box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(4), Inches(0.24))
+        _textstil(box, 10, True, "1F4E79")
+        box.text_frame.text = text
+
+    puffer = io.BytesIO()
+    prs.save(puffer)
+    return puffer.getvalue()
+
+
+# =============================================================================
+# 2. Steckbrief fuer einen PSB
+# =============================================================================
+
+def _datum(wert) -> str:
+    return wert.strftime("%d.%m.%Y") if isinstance(wert, date) else ""
+
+
+def _text(wert, laenge: int | None = None) -> str:
+    """Zellwert als Text; bei Textbloecken ohne die Ueberschrift aus der PSB-Vorlage (erste Zeile)."""
+    if wert is None:
+        return ""
+    text = str(wert).strip()
+    if laenge is not None:
+        zeilen = text.split("\n")
+        text = "\n".join(zeilen[1:]).strip() if len(zeilen) > 1 else text
+        if len(text) > laenge:
+            text = text[:laenge].rsplit(" ", 1)[0] + " …"
+    return text
+
+
+def _betrag(wert) -> str:
+    if wert is None or wert != wert:  # NaN
+        return "–"
+    return f"{wert:,.0f}".replace(",", ".")
+
+
+def budget_je_projekt(df: pd.DataFrame) -> dict[str, list[float | None]]:
+    """LV-Nummer → [Plan 2025-2027, Ist 2025-2027] aus den konsolidierten Daten."""
+    spalten = [s for s in BUDGET_SPALTEN if s in df.columns]
+    werte = df.set_index(df["lv_nummer"].astype(str))[spalten]
+    werte = werte.reindex(columns=BUDGET_SPALTEN).astype(float)
+    return {lv: [None if v != v else v for v in zeile]
+            for lv, zeile in zip(werte.index, werte.to_numpy().tolist())}
+
+
+def erzeuge_steckbrief(psb: dict, vorlage: bytes, budget: list[float | None] | None, pfad: Path):
+    """Fuellt die Vorlage mit einem read_psb()-Datensatz und speichert den Steckbrief unter pfad."""
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches
+
+    prs = Presentation(io.BytesIO(vorlage))
+    slide = prs.slides[0]
+    felder = {s.name: s for s in slide.shapes}
+
+    def setze(name: str, text: str):
+        felder[name].text_frame.text = text
+
+    setze("titel", f"{psb.get('lv_nr') or ''}  {_text(psb.get('bezeichnung'))}"[:80])
+    fg = psb.get("fertigstellungsgrad") or 0.0
+    setze("untertitel", "  |  ".join([
+        f"PAG: {_text(psb.get('pag'))}", f"Projektleitung: {_text(psb.get('projektleitung'))}",
+        f"Phase: {_text(psb.get('projektphase'))}", f"Fertigstellungsgrad: {fg:.0%}",
+    ]))
+    ampel = _text(psb.get("ampelstatus")) or "–"
+    felder["ampel"].fill.solid()
+    felder["ampel"].fill.fore_color.rgb = RGBColor.from_string(AMPEL_FARBEN.get(ampel, "#9E9E9E").lstrip("#"))
+    setze("ampel", ampel)
+    for name, laenge in _TEXT_LAENGE.items():
+        setze(name, _text(psb.get(name), laenge))
+
+    ziele = psb.get("zielwerte") or {}
+    setze("indikator", _text(ziele.get("indikator"), 200) or _text(ziele.get("ziel_text"), 200))
+    setze("fusszeile", f"Projektportfolio {QUARTAL}  ·  Stand PSB: {_datum(psb.get('berichtsdatum'))}"
+                       f"  ·  Datei: {psb.get('_quelldatei', '')}")
+
+    tabellen = {
+        "meilensteine": [
+            [_text(m["bezeichnung"])[:60], _datum(m["plan_lv"]), _datum(m["plan_aktuell"]), _datum(m["ist"])]
+            for m in psb.get("meilensteine", []) if m["bezeichnung"] not in ("…", "...")
+        ],
+        "zielwerte": [
+            ["Zielwert", _text(ziele.get("ausgangswert_2023")), *[_text(ziele.get(f"zielwert_{j}")) for j in _JAHRE]],
+            ["Istwert", "", *[_text(ziele.get(f"istwert_{j}")) for j in _JAHRE]],
+        ],
+        "budget": [
+            ["Plan", *[_betrag(b) for b in (budget or [None] * 6)[:3]]],
+            ["Ist", *[_betrag(b) for b in (budget or [None] * 6)[3:]]],
+        ],
+    }
+    for name, werte in tabellen.items():
+        left, top, width, kopf, breiten = _TABELLEN[name]
+        tabelle(slide, werte, Inches(left), Inches(top), Inches(width), Inches(_ZEILENHOEHE),
+                kopf=kopf, breiten=breiten)
+
+    prs.save(str(pfad))
+
+
+# =============================================================================
+# 3. Alle PSBs (Worker-Prozesse)
+# =============================================================================
+
+# Vorlage und Budget im Worker-Prozess: einmal pro Worker uebergeben, nicht pro Steckbrief
+_WORKER_VORLAGE = None
+_WORKER_BUDGET = None
+_WORKER_ANZAHL = 0
+
+# python-pptx-Objekte bilden Referenzzyklen (Part <-> Package); erst die zyklische
+# Speicherbereinigung gibt sie frei. Alle GC_INTERVALL Steckbriefe explizit aufraeumen,
+# damit der Speicher nicht mit der Anzahl Steckbriefe waechst.
+GC_INTERVALL = 20
+
+
+def _worker_init(vorlage: bytes, budget: dict):
+    global _WORKER_VORLAGE, _WORKER_BUDGET
+    _WORKER_VORLAGE, _WORKER_BUDGET = vorlage, budget
+
+
+def _steckbrief_job(psb: dict) -> tuple[str, float, str | None]:
+    """Schreibt den Steckbrief zu einem PSB-Datensatz und faengt Fehler ab."""
+    t0 = time.perf_counter()
+    try:
+        erzeuge_steckbrief(psb, _WORKER_VORLAGE, _WORKER_BUDGET.get(str(psb.get("lv_nr", "")).strip()),
+                           steckbrief_pfad(Path(psb["_quelldatei"])))
+        fehler = None
+    except Exception as e:
+        fehler = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    global _WORKER_ANZAHL
+    _WORKER_ANZAHL += 1
+    if _WORKER_ANZAHL % GC_INTERVALL == 0:
+        gc.collect()
+    return psb["_quelldatei"], time.perf_counter() - t0, fehler
+
+
+def erzeuge_steckbriefe(psbs: list[dict], budget: dict, workers: int | None = None,
+                        vorlage: bytes | None = None) -> list[tuple[str, float, str | None]]:
+    """Erzeugt die Steckbriefe zu read_psb()-Datensaetzen, bei workers > 1 in einem Prozess-Pool.
+
+    Rueckgabe: (PSB-Datei, Sekunden, Fehlermeldung oder None) in Reihenfolge von psbs.
+    """
+    if workers is None:
+        workers = STECKBRIEF_WORKERS
+    if vorlage is None:
+        vorlage = erzeuge_vorlage()
+    OUTPUT_STECKBRIEFE.mkdir(parents=True, exist_ok=True)
+
+    if workers > 1 and len(psbs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(psbs)),
+                                 initializer=_worker_init, initargs=(vorlage, budget)) as pool:
+            # Mehrere Datensaetze pro Round-Trip; zurueck kommen nur (Datei, Sekunden, Fehler)
+            chunks = max(1, len(psbs) // (workers * 4))
+            return list(pool.map(_steckbrief_job, psbs, chunksize=chunks))
+    _worker_init(vorlage, budget)
+    return [_steckbrief_job(psb) for psb in psbs]
+
+
+def lies_psbs(dateien: list[Path] | None = None) -> tuple[list[dict], list[tuple[str, float, str]]]:
+    """read_psb()-Datensaetze ueber den PSB-Cache (nur neue/geaenderte PSBs werden gelesen).
+
+    Rueckgabe: (Datensaetze, nicht lesbare PSBs), letztere im Format von erzeuge_steckbriefe()
+    als (PSB-Datei, 0.0, Fehlermeldung), damit sie im Ergebnis der Stufe mitzaehlen."""
+    konsolidierung = importlib.import_module("01_konsolidierung")
+    cache = konsolidierung.PSBCache() if PSB_CACHE_AKTIV else None
+    psbs, fehler = konsolidierung.read_all_psbs(cache=cache, dateien=dateien)
+    return psbs, [(name, 0.0, f"PSB nicht lesbar: {err}") for name, err in fehler]
+
+
+def main(df: pd.DataFrame | None = None, namen: list[str] | None = None,
+         workers: int | None = None):
+    """Erzeugt die Steckbriefe aller (oder der angegebenen) PSBs. Ohne df werden die
+    konsolidierten Daten fuer das Budget von der Platte geladen. Rueckgabe wie
+    erzeuge_steckbriefe(), dazu die nicht lesbaren PSBs (None ohne konsolidierte Daten)."""
+    dateien = psb_dateien()
+    if namen:
+        dateien = [f for f in dateien if f.stem.removeprefix("PSB_") in namen]
+
+    print(f"=== Projekt-Steckbriefe ({QUARTAL}) ===\n")
+    if df is None:
+        from datenbasis import lade_konsolidiert
+        try:
+            df = lade_konsolidiert()
+        except FileNotFoundError:
+            print("FEHLER: Bitte zuerst 01_konsolidierung.py ausfuehren!")
+            return
+    psbs, ergebnisse = lies_psbs(dateien)
+    t0 = time.perf_counter()
+    ergebnisse += erzeuge_steckbriefe(psbs, budget_je_projekt(df), workers=workers)
+    fehler = [(name, err) for name, _, err in ergebnisse if err]
+    for name, err in fehler:
+        print(f"  FEHLER: {name} ({err})")
+    print(f"  {len(ergebnisse) - len(fehler)} Steckbriefe in {time.perf_counter() - t0:.2f} s")
+    print(f"\nFertig. Steckbriefe in: {OUTPUT_STECKBRIEFE}")
+    return ergebnisse
+
+
+if __name__ == "__main__":
+    ergebnisse = main(namen=sys.argv[1:] or None)
+    sys.exit(1 if ergebnisse is None or any(fehler for _, _, fehler in ergebnisse) else 0)
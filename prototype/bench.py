@@ -0,0 +1,52 @@
+"""
+bench.py — Micro-Benchmarks fuer einzelne Schritte der Pipeline.
+
+Ausfuehrung: python bench.py              (alle Benchmarks)
+             python bench.py merged       (nur ausgewaehlte Benchmarks)
+
+Die Benchmarks liegen je Bereich in einem Modul (Beschreibung dort im Modul-Docstring),
+Zeitmessung und Ausgabe gemeinsam in benchhilfe.py:
+  bench_konsolidierung.py  merged, sap, join
+  bench_charts.py          charts, gantt, formate, startup
+  bench_berichte.py        statustabelle, steckbriefe, excel
+  bench_dashboard.py       payload, rendering, server
+
+Ein Benchmark, der False zurueckgibt, gilt als fehlgeschlagen (Exit-Code 1).
+"""
+
+import sys
+import warnings
+
+import bench_konsolidierung
+import bench_charts
+import bench_berichte
+import bench_dashboard
+
+warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+
+BENCHMARKS = {
+    **bench_konsolidierung.BENCHMARKS,
+    **bench_charts.BENCHMARKS,
+    **bench_berichte.BENCHMARKS,
+    **bench_dashboard.BENCHMARKS,
+}
+
+
+def main():
+    namen = sys.argv[1:] or list(BENCHMARKS)
+    unbekannt = [n for n in namen if n not in BENCHMARKS]
+    if unbekannt:
+        print(f"Unbekannte Benchmarks: {', '.join(unbekannt)} (verfuegbar: {', '.join(BENCHMARKS)})")
+        sys.exit(1)
+    fehlgeschlagen = []
+    for n in namen:
+        if BENCHMARKS[n]() is False:
+            fehlgeschlagen.append(n)
+        print()
+    if fehlgeschlagen:
+        print(f"Fehlgeschlagen: {', '.join(fehlgeschlagen)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
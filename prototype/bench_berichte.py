@@ -0,0 +1,257 @@
+"""
+bench_berichte.py — Benchmarks der Berichte (03_bericht.py, 04_steckbriefe.py), Aufruf ueber bench.py.
+
+  statustabelle  Statusbericht-Tabelle mit 200 gelben/roten Projekten: eine Tabelle
+           Zelle fuer Zelle vs. paginierte Folien mit XML-Zellvorlagen
+  steckbriefe  300 Projekt-Steckbriefe (PSB-Datensaetze vervielfacht): Laufzeit seriell/Worker und
+           Spitzenspeicher (darf mit der Anzahl Steckbriefe nicht wachsen)
+  excel    Dashboard-Excel und konsolidiert.xlsx mit 500/2000 Zeilen: Formatierung Zelle fuer
+           Zelle vs. write-only mit benannten Formatvorlagen (Laufzeit, Spitzenspeicher)
+"""
+
+import os
+import tempfile
+import importlib
+from pathlib import Path
+
+from benchhilfe import zeit, ausgabe, spitzenspeicher, portfolio, still, ersetzt
+
+konsolidierung = importlib.import_module("01_konsolidierung")
+
+
+# =============================================================================
+# Statusbericht-Tabelle im PPTX
+# =============================================================================
+
+def _statustabelle_alt(prs, gelb_rot):
+    """Bisherige Variante: eine Tabelle mit 0.4 Zoll je Zeile, Formatierung je Zelle und Absatz."""
+    from pptx.util import Inches, Pt
+    from pptx.dml.color import RGBColor
+
+    slide = prs.slides[11]
+    rows_count = len(gelb_rot) + 1
+    table = slide.shapes.add_table(rows_count, 5, Inches(0.3), Inches(1.5), Inches(9.4),
+                                   Inches(0.4 * rows_count)).table
+    for j, h in enumerate(["LV-Nr.", "Projektname", "Ampel", "Phase", "Risiko"]):
+        cell = table.cell(0, j)
+        cell.text = h
+        for para in cell.text_frame.paragraphs:
+            para.font.size = Pt(9)
+            para.font.bold = True
+            para.font.color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
+        cell.fill.solid()
+        cell.fill.fore_color.rgb = RGBColor(0x1F, 0x4E, 0x79)
+    for i, (_, row) in enumerate(gelb_rot.iterrows(), 1):
+        vals = [str(row.get("lv_nummer", "")), str(row.get("projektname", ""))[:50],
+                str(row.get("ampelstatus", "")), str(row.get("projektphase", "")), str(row.get("risiko", ""))]
+        for j, val in enumerate(vals):
+            cell = table.cell(i, j)
+            cell.text = val
+            for para in cell.text_frame.paragraphs:
+                para.font.size = Pt(8)
+            if j == 2:
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = (RGBColor(0xF4, 0x43, 0x36) if row["ampelstatus"] == "Krise"
+                                            else RGBColor(0xFF, 0xC1, 0x07))
+    return Inches(1.5) + Inches(0.4 * rows_count)
+
+
+def bench_statustabelle(n: int = 200) -> bool:
+    from pptx import Presentation
+    from datenbasis import lade_konsolidiert
+    bericht = importlib.import_module("03_bericht")
+    if not bericht.PPTX_TEMPLATE.exists():
+        print("Statustabelle: keine PPTX-Vorlage, uebersprungen.")
+        return True
+    gelb_rot = portfolio(lade_konsolidiert(), n)
+    gelb_rot["ampelstatus"] = ["Vorsicht" if i % 3 else "Krise" for i in range(n)]
+    print(f"Statusbericht-Tabelle ({n} gelbe/rote Projekte, {bericht.PPTX_STATUS_ZEILEN} je Folie)")
+
+    # Je Wiederholung eine frisch geladene Vorlage (nicht gemessen)
+    def vorlage():
+        prs = Presentation(str(bericht.PPTX_TEMPLATE))
+        return prs, bericht._zuordnung(bericht.analysiere_template(prs))[1]
+
+    letzte = {}
+
+    def alt(vorbereitet):
+        letzte["unterkante"] = _statustabelle_alt(vorbereitet[0], gelb_rot)
+
+    def neu(vorbereitet):
+        prs, platz = vorbereitet
+        letzte["prs"], letzte["seiten"] = prs, bericht._statusfolien(prs, gelb_rot, platz)
+
+    ausgabe("Tabelle erzeugen", zeit(alt, wiederholungen=3, schleifen=1, vorbereitung=vorlage),
+            zeit(neu, wiederholungen=3, schleifen=1, vorbereitung=vorlage))
+    prs, seiten = letzte["prs"], letzte["seiten"]
+    hoehe = prs.slide_height
+    tabellen = [s for folie in prs.slides for s in folie.shapes if s.has_table]
+    print(f"  Bisher: 1 Folie, Tabellenunterkante {letzte['unterkante'] / 914400:.1f} Zoll "
+          f"(Folienhoehe {hoehe / 914400:.1f} Zoll)")
+    print(f"  Neu:    {seiten} Folien, Tabellenunterkante max. "
+          f"{max(t.top + t.height for t in tabellen) / 914400:.1f} Zoll")
+    return all(t.top + t.height <= hoehe for t in tabellen) and len(tabellen) == seiten
+
+
+# =============================================================================
+# Projekt-Steckbriefe
+# =============================================================================
+
+def bench_steckbriefe(n: int = 300) -> bool:
+    from datenbasis import lade_konsolidiert
+    steckbriefe = importlib.import_module("04_steckbriefe")
+    with still():
+        vorlagen, _ = konsolidierung.read_all_psbs(workers=1)
+    # n Datensaetze aus den vorhandenen PSBs, je mit eigener Quelldatei (= eigener Ausgabedatei)
+    psbs = [dict(vorlagen[i % len(vorlagen)], _quelldatei=f"PSB_X{i:04d}.xlsx") for i in range(n)]
+    budget = steckbriefe.budget_je_projekt(lade_konsolidiert())
+    print(f"Projekt-Steckbriefe ({n} PSB-Datensaetze aus {len(vorlagen)} PSBs, {os.cpu_count()} CPU-Kerne)")
+
+    with tempfile.TemporaryDirectory() as tmp, ersetzt(steckbriefe, OUTPUT_STECKBRIEFE=Path(tmp)):
+        vorlage = steckbriefe.erzeuge_vorlage()
+        fehler = []
+
+        def erzeugen(teil, workers=1):
+            ergebnisse = steckbriefe.erzeuge_steckbriefe(teil, budget, workers=workers, vorlage=vorlage)
+            fehler.extend(f for _, _, f in ergebnisse if f)
+
+        zeiten = {workers: zeit(lambda: erzeugen(psbs, workers), wiederholungen=1, schleifen=1)
+                  for workers in (1, 2, 4)}
+        klein = spitzenspeicher(lambda: erzeugen(psbs[:n // 10]))
+        gross = spitzenspeicher(lambda: erzeugen(psbs))
+        anzahl = len(list(Path(tmp).glob("*.pptx")))
+    if fehler:
+        print(f"  FEHLER beim Erzeugen der Steckbriefe: {fehler[0]}")
+        return False
+
+    print(f"  seriell                                  {zeiten[1]:9.2f} s   "
+          f"({zeiten[1] / n * 1000:.0f} ms je Steckbrief)")
+    for workers in (2, 4):
+        ausgabe(f"seriell -> {workers} Worker", zeiten[1], zeiten[workers])
+    zuwachs = (gross - klein) / (n - n // 10)
+    print(f"  Spitzenspeicher {n // 10:>4} Steckbriefe         {klein / 2**20:9.1f} MB")
+    print(f"  Spitzenspeicher {n:>4} Steckbriefe         {gross / 2**20:9.1f} MB"
+          f"   ({zuwachs / 1024:.1f} KB je weiterem Steckbrief)")
+    # Steckbriefe werden sofort geschrieben: pro weiterem Steckbrief bleibt nur das Ergebnis-Tupel
+    # (ein geladener Steckbrief belegt dagegen ueber 150 KB Python-Objekte)
+    return anzahl == n and zuwachs < 5 * 1024
+
+
+# =============================================================================
+# Excel-Exporte (Dashboard-Excel, konsolidiert.xlsx)
+# =============================================================================
+
+def _dashboard_excel_alt(df, pfad: Path, spalten: list[str]):
+    """Bisherige Variante: iterrows(), neue Font je Zelle, Rahmen und Zahlenformat Zelle fuer Zelle."""
+    import pandas as pd
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.table import Table, TableStyleInfo
+
+    wb = Workbook()
+    ws = wb.active
+    ws.merge_cells("A1:H1")
+    ws["A1"].value = "Projektportfolio"
+    ws["A1"].font = Font(size=14, bold=True, color="1F4E79")
+    rahmen = Border(left=Side(style="thin"), right=Side(style="thin"),
+                    top=Side(style="thin"), bottom=Side(style="thin"))
+    for j, name in enumerate(spalten, 1):
+        cell = ws.cell(row=4, column=j)
+        cell.value = name
+        cell.fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
+        cell.font = Font(color="FFFFFF", bold=True, size=9)
+        cell.alignment = Alignment(horizontal="center", wrap_text=True)
+        cell.border = rahmen
+    fills = {k: PatternFill(start_color=f, end_color=f, fill_type="solid")
+             for k, f in [("In Ordnung", "C6EFCE"), ("Vorsicht", "FFEB9C"), ("Krise", "FFC7CE")]}
+    ampel_spalte = spalten.index("ampelstatus") + 1
+    for i, (_, row) in enumerate(df.iterrows(), 5):
+        for j, name in enumerate(spalten, 1):
+            cell = ws.cell(row=i, column=j)
+            val = row.get(name)
+            if pd.isna(val):
+                val = ""
+            cell.value = val
+            cell.border = rahmen
+            cell.font = Font(size=9)
+            if name in ("istkosten_prozent", "fertigstellungsgrad") and val:
+                cell.number_format = "0%"
+            if "kosten" in name and "prozent" not in name:
+                cell.number_format = '#,##0.00 "EUR"'
+        ampel_zelle = ws.cell(row=i, column=ampel_spalte)
+        if str(ampel_zelle.value).strip() in fills:
+            ampel_zelle.fill = fills[str(ampel_zelle.value).strip()]
+    for j in range(1, len(spalten) + 1):
+        ws.column_dimensions[get_column_letter(j)].width = 14
+    ref = f"A4:{get_column_letter(len(spalten))}{4 + len(df)}"
+    ws.auto_filter.ref = ref
+    ws.freeze_panes = "A5"
+    tab = Table(displayName="Tabelle1", ref=ref)
+    tab.tableStyleInfo = TableStyleInfo(name="TableStyleMedium2", showRowStripes=True)
+    ws.add_table(tab)
+    wb.save(str(pfad))
+
+
+def _review_excel_alt(df, pfad: Path, spalten: list[str]):
+    """Bisherige Variante: to_excel, danach jede Zelle erneut fuer Rahmen und Fuellung besuchen."""
+    import pandas as pd
+    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+
+    with pd.ExcelWriter(pfad, engine="openpyxl") as writer:
+        df[spalten].to_excel(writer, sheet_name="Konsolidiert", index=False)
+        ws = writer.sheets["Konsolidiert"]
+        rahmen = Border(left=Side(style="thin"), right=Side(style="thin"),
+                        top=Side(style="thin"), bottom=Side(style="thin"))
+        for j in range(1, len(spalten) + 1):
+            cell = ws.cell(row=1, column=j)
+            cell.fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
+            cell.font = Font(color="FFFFFF", bold=True, size=10)
+            cell.alignment = Alignment(horizontal="center", wrap_text=True)
+            cell.border = rahmen
+        fills = {k: PatternFill(start_color=f, end_color=f, fill_type="solid")
+                 for k, f in [("In Ordnung", "C6EFCE"), ("Vorsicht", "FFEB9C"), ("Krise", "FFC7CE")]}
+        ampel_spalte = spalten.index("ampelstatus") + 1
+        for i in range(2, len(df) + 2):
+            for j in range(1, len(spalten) + 1):
+                ws.cell(row=i, column=j).border = rahmen
+            ampel_zelle = ws.cell(row=i, column=ampel_spalte)
+            if ampel_zelle.value in fills:
+                ampel_zelle.fill = fills[ampel_zelle.value]
+        for j in range(1, len(spalten) + 1):
+            ws.column_dimensions[get_column_letter(j)].width = 18
+        ws.auto_filter.ref = ws.dimensions
+
+
+def bench_excel(groessen: tuple[int, ...] = (500, 2000)):
+    from datenbasis import lade_konsolidiert, export_spalten
+    bericht = importlib.import_module("03_bericht")
+    basis = lade_konsolidiert()
+    dashboard = [name for _, name in sorted(bericht.DASHBOARD_COLS.items()) if name in basis.columns]
+    review = export_spalten(basis)
+    print(f"Excel-Exporte (Dashboard {len(dashboard)} Spalten, konsolidiert.xlsx {len(review)} Spalten)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pfad = Path(tmp) / "export.xlsx"
+        for n in groessen:
+            df = portfolio(basis, n)
+            for name, alt, neu in [
+                ("Dashboard", lambda: _dashboard_excel_alt(df, pfad, dashboard),
+                 lambda: bericht.generate_dashboard_excel(df)),
+                ("konsolidiert.xlsx", lambda: _review_excel_alt(df, pfad, review),
+                 lambda: konsolidierung.export_review_excel(df, pfad)),
+            ]:
+                with ersetzt(bericht, DASHBOARD_EXCEL_PFAD=pfad), still():
+                    t_alt = zeit(alt, wiederholungen=1, schleifen=1)
+                    t_neu = zeit(neu, wiederholungen=1, schleifen=1)
+                    m_alt, m_neu = spitzenspeicher(alt), spitzenspeicher(neu)
+                ausgabe(f"{name}, {n} Zeilen", t_alt, t_neu)
+                print(f"  {'':<40} {m_alt / 2**20:9.1f} MB  -> {m_neu / 2**20:9.1f} MB  Spitzenspeicher")
+
+
+BENCHMARKS = {
+    "statustabelle": bench_statustabelle,
+    "steckbriefe": bench_steckbriefe,
+    "excel": bench_excel,
+}
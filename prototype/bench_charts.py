@@ -0,0 +1,192 @@
+"""
+bench_charts.py — Benchmarks der Chart-Stufe (02_visualisierung.py), Aufruf ueber bench.py.
+
+  charts   Chart-Rendering seriell vs. Prozess-Pool (konsolidierte Daten), langsamstes Chart
+  gantt    Gantt-Zeitleiste: barh pro Projekt vs. PolyCollection mit Seiten (300/1000 Projekte)
+  formate  Dateigroessen der Charts (PNG/SVG/PDF) und des PPTX mit PNG-, SVG- bzw. nativen Charts
+  startup  Importzeit (-X importtime) der Stufen; schlaegt fehl, wenn schwere
+           Bibliotheken geladen werden, die der Aufruf nicht braucht
+"""
+
+import os
+import sys
+import tempfile
+import importlib
+import subprocess
+from pathlib import Path
+from time import perf_counter
+
+from benchhilfe import zeit, ausgabe, portfolio, still, ersetzt
+
+
+# =============================================================================
+# Chart-Rendering
+# =============================================================================
+
+def bench_charts():
+    from datenbasis import lade_konsolidiert
+    visualisierung = importlib.import_module("02_visualisierung")
+    df = lade_konsolidiert()
+    print(f"Chart-Rendering ({len(visualisierung.CHARTS)} Charts, {len(df)} Projekte, "
+          f"{os.cpu_count()} CPU-Kerne)")
+    ergebnisse = {}
+    for workers in (1, 2, 4):
+        def lauf():
+            ergebnisse[workers] = visualisierung.render_charts(df, workers=workers)
+        with still():
+            sekunden = zeit(lauf, wiederholungen=2, schleifen=1)
+        assert not any(fehler for _, _, fehler in ergebnisse[workers])
+        if workers == 1:
+            seriell = sekunden
+        else:
+            ausgabe(f"seriell -> {workers} Worker", seriell, sekunden)
+    langsamstes = max(ergebnisse[1], key=lambda e: e[1])
+    print(f"  Langsamstes Chart (seriell): {langsamstes[0]} ({langsamstes[1] * 1000:.0f} ms)")
+
+
+# =============================================================================
+# Gantt-Zeitleiste
+# =============================================================================
+
+def _gantt_alt(df, pfad: Path):
+    """Bisherige Variante: ein barh-Aufruf pro Projekt, Figure-Hoehe 0.8 Zoll pro Projekt."""
+    import pandas as pd
+    import matplotlib.dates as mdates
+    plt = importlib.import_module("02_visualisierung")._pyplot()
+    df_gantt = df.dropna(subset=["start", "ende"]).copy()
+    df_gantt["start"] = pd.to_datetime(df_gantt["start"])
+    df_gantt["ende"] = pd.to_datetime(df_gantt["ende"])
+    df_gantt = df_gantt.sort_values("start", ascending=True)
+    fig, ax = plt.subplots(figsize=(14, max(3, len(df_gantt) * 0.8)))
+    for i, (_, row) in enumerate(df_gantt.iterrows()):
+        ax.barh(i, (row["ende"] - row["start"]).days, left=row["start"], height=0.5, alpha=0.85)
+    labels = [f"{r['lv_nummer']}  {str(r['projektname'])[:35]}" for _, r in df_gantt.iterrows()]
+    ax.set_yticks(range(len(df_gantt)))
+    ax.set_yticklabels(labels, fontsize=9)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %Y"))
+    ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
+    ax.invert_yaxis()
+    fig.tight_layout()
+    fig.savefig(str(pfad), dpi=150, bbox_inches="tight")
+    plt.close(fig)
+
+
+def bench_gantt():
+    import numpy as np
+    import pandas as pd
+    from datenbasis import lade_konsolidiert, lade_meilensteine
+    visualisierung = importlib.import_module("02_visualisierung")
+    visualisierung._pyplot()
+    basis = lade_konsolidiert()
+    ms_basis = lade_meilensteine()
+    print(f"Gantt-Zeitleiste (Seiten zu {visualisierung.GANTT_ZEILEN_PRO_SEITE} Projekten, mit Meilensteinen)")
+    with tempfile.TemporaryDirectory() as tmp, ersetzt(visualisierung, OUTPUT_CHARTS=Path(tmp)):
+        for n in (300, 1000):
+            df = portfolio(basis, n)
+            ms = None
+            if ms_basis is not None:
+                # Zeile i stammt aus Projekt i % len(basis): dessen Meilensteine uebernehmen
+                herkunft = pd.DataFrame({"vorlage": basis["lv_nummer"].to_numpy()[np.arange(n) % len(basis)],
+                                         "neu": df["lv_nummer"].to_numpy()})
+                ms = (ms_basis.merge(herkunft, left_on="lv_nummer", right_on="vorlage")
+                      .assign(lv_nummer=lambda m: m["neu"]))
+            with still():
+                vorher = zeit(lambda: _gantt_alt(df, Path(tmp) / "alt.png"), wiederholungen=1, schleifen=1)
+                nachher = zeit(lambda: visualisierung.chart_gantt(df, meilensteine=ms),
+                               wiederholungen=1, schleifen=1)
+            ausgabe(f"{n} Projekte", vorher, nachher)
+            print(f"  {'':<40} {nachher / n * 1000:9.3f} ms pro Projekt (neu)")
+
+
+# =============================================================================
+# Chart-Formate und PPTX-Groesse
+# =============================================================================
+
+def bench_formate():
+    from datenbasis import lade_konsolidiert
+    visualisierung = importlib.import_module("02_visualisierung")
+    bericht = importlib.import_module("03_bericht")
+    df = lade_konsolidiert()
+    namen = list(bericht.PPTX_CHARTS)
+    print(f"Chart-Formate ({len(namen)} Charts im PPTX)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        with (ersetzt(visualisierung, OUTPUT_CHARTS=tmp, CHART_FORMATE=["svg", "pdf"]),
+              ersetzt(bericht, OUTPUT_CHARTS=tmp), still()):
+            visualisierung.render_charts(df, namen, workers=1)
+            for fmt in ("png", "svg", "nativ"):
+                bericht.generate_pptx(df, bildformat=fmt, output_path=tmp / f"bericht_{fmt}.pptx")
+
+        for fmt in ("png", "svg", "pdf"):
+            groesse = sum((tmp / f"{n}.{fmt}").stat().st_size for n in namen)
+            print(f"  Charts {fmt.upper():<33} {groesse / 1024:9.1f} KB")
+        vorlage = bericht.PPTX_TEMPLATE.stat().st_size if bericht.PPTX_TEMPLATE.exists() else 0
+        print(f"  {'PPTX-Vorlage':<40} {vorlage / 1024:9.1f} KB")
+        for fmt, text in (("png", "PNG 150 dpi"), ("svg", "SVG + PNG-Fallback"),
+                          ("nativ", "nativen Diagrammen")):
+            groesse = (tmp / f"bericht_{fmt}.pptx").stat().st_size
+            print(f"  PPTX mit {text:<31} {groesse / 1024:9.1f} KB")
+
+
+# =============================================================================
+# Startzeit (-X importtime)
+# =============================================================================
+
+_IMPORT = "import importlib; importlib.import_module({!r})"
+
+# (Aufruf, Argumente fuer python, Bibliotheken, die dabei nicht geladen werden duerfen)
+STARTUP_FAELLE = [
+    ("import 02_visualisierung", ["-c", _IMPORT.format("02_visualisierung")],
+     {"pandas", "numpy", "matplotlib"}),
+    ("import 03_bericht", ["-c", _IMPORT.format("03_bericht")],
+     {"pandas", "numpy", "pptx", "openpyxl", "matplotlib"}),
+    ("02_visualisierung.py ampel_gesamt", ["02_visualisierung.py", "ampel_gesamt"],
+     {"pptx"}),
+    ("03_bericht.py lv_monitoring", ["03_bericht.py", "lv_monitoring"],
+     {"pptx", "matplotlib"}),
+    ("03_bericht.py pptx", ["03_bericht.py", "pptx"],
+     {"matplotlib"}),
+]
+
+
+def _importzeiten(args: list[str]) -> tuple[float, dict[str, float]]:
+    """Startet python -X importtime und liefert (Wandzeit s, kumulierte Importzeit s je Top-Level-Paket)."""
+    t0 = perf_counter()
+    lauf = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=Path(__file__).parent,
+                          capture_output=True, text=True, check=True)
+    wand = perf_counter() - t0
+    pakete = {}
+    for zeile in lauf.stderr.splitlines():
+        if not zeile.startswith("import time:") or "cumulative" in zeile:
+            continue
+        _, kumuliert, name = zeile[len("import time:"):].split("|")
+        paket = name.strip().split(".")[0]
+        if not name.startswith("  "):  # nur Top-Level-Importe, sonst doppelt gezaehlt
+            pakete[paket] = pakete.get(paket, 0.0) + int(kumuliert) / 1e6
+        else:
+            pakete.setdefault(paket, 0.0)
+    return wand, pakete
+
+
+def bench_startup() -> bool:
+    print("Startzeit der Stufen (python -X importtime, kalter Prozess)")
+    ok = True
+    for name, args, verboten in STARTUP_FAELLE:
+        wand, pakete = _importzeiten(args)
+        geladen = sorted(verboten & set(pakete))
+        schwer = sorted(pakete.items(), key=lambda p: -p[1])[:3]
+        print(f"  {name:<36} {wand * 1000:7.0f} ms gesamt, {sum(pakete.values()) * 1000:6.0f} ms Importe"
+              f"  ({', '.join(f'{p} {t * 1000:.0f}' for p, t in schwer)})")
+        if geladen:
+            print(f"  {'':<36} REGRESSION: laedt {', '.join(geladen)}")
+            ok = False
+    return ok
+
+
+BENCHMARKS = {
+    "charts": bench_charts,
+    "gantt": bench_gantt,
+    "formate": bench_formate,
+    "startup": bench_startup,
+}
@@ -0,0 +1,360 @@
+"""
+bench_dashboard.py — Benchmarks des Dashboards (dashboarddaten.py, docs/app.js, start_dashboard.py),
+Aufruf ueber bench.py.
+
+  payload  consolidated.json mit 300/1000 Projekten: Objekt je Projekt vs. kompaktes Spaltenformat
+           (Groesse, gzip, JSON.parse + Aufbereitung in node)
+  rendering  Dashboard (docs/app.js) mit 300/1000 Projekten unter node: Filterwechsel mit
+           vollstaendigem Neuaufbau vs. inkrementell (Charts in place, Karten je Projekt wiederverwendet)
+  server   Dashboard-Server: http.server mit einem Thread vs. DashboardServer (Threads, gzip, ETag/304)
+           unter Last von 16 parallelen Clients, auch neben einem langsamen Client
+"""
+
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+from benchhilfe import ausgabe, portfolio, node_skript
+
+PROTOTYPE_DIR = Path(__file__).resolve().parent
+DOCS_DIR = PROTOTYPE_DIR.parent / "docs"
+
+
+# =============================================================================
+# Dashboard-Daten (consolidated.json)
+# =============================================================================
+
+def _dashboard_json_alt(df) -> str:
+    """Bisheriges Format: ein Objekt je Projekt mit allen Spalten, eingerueckt."""
+    from datetime import datetime, date
+    from datenbasis import export_spalten
+    df = df[export_spalten(df)].astype(object)
+    df = df.where(df.notna(), None)
+    projekte = []
+    for rec in df.to_dict("records"):
+        for key, val in rec.items():
+            if isinstance(val, (datetime, date)):
+                rec[key] = val.isoformat()
+        projekte.append(rec)
+    daten = {"meta": {"anzahl_projekte": len(projekte)}, "projekte": projekte}
+    return json.dumps(daten, ensure_ascii=False, indent=2, default=str)
+
+
+# Laedt app.js ohne DOM und misst JSON.parse + Aufbereitung bis zum ersten Rendern:
+# bisher KPIs/Verteilungen im Browser berechnen, neu Spalten dekodieren (Aggregate liegen vor)
+_PARSE_JS = r"""
+const fs = require('fs'), vm = require('vm');
+const ctx = { document: { addEventListener() {} }, console, Intl, Map };
+vm.createContext(ctx);
+vm.runInContext(fs.readFileSync(process.argv[2], 'utf8'), ctx);
+const messen = (datei, fn) => {
+    const text = fs.readFileSync(datei, 'utf8');
+    let beste = Infinity;
+    for (let i = 0; i < 30; i++) {
+        const t0 = process.hrtime.bigint();
+        fn(JSON.parse(text));
+        beste = Math.min(beste, Number(process.hrtime.bigint() - t0) / 1e6);
+    }
+    return beste;
+};
+console.log(JSON.stringify([
+    messen(process.argv[3], d => ctx.computeAggregates(d.projekte)),
+    messen(process.argv[4], d => ctx.decodeProjects(d)),
+]));
+"""
+
+
+def bench_payload(groessen: tuple[int, ...] = (300, 1000)) -> bool:
+    import gzip
+    from datenbasis import lade_konsolidiert
+    from dashboarddaten import kompakt, _json
+
+    print("Dashboard-Daten: consolidated.json bisher (Objekt je Projekt, eingerueckt) vs. kompakt")
+    basis = lade_konsolidiert()
+    ok = True
+    for n in groessen:
+        df = portfolio(basis, n)
+        alt = _dashboard_json_alt(df).encode("utf-8")
+        daten, details = kompakt(df, "bench")
+        neu = _json(daten)
+        detail_bytes = sum(len(_json(d)) for d in details.values())
+        print(f"  {n} Projekte")
+        print(f"    {'Groesse':<32} {len(alt) / 1024:9.0f} KB  -> {len(neu) / 1024:9.0f} KB"
+              f"   (+ {detail_bytes / 1024:.0f} KB Details, {detail_bytes / n / 1024:.1f} KB je Projekt)")
+        print(f"    {'gzip':<32} {len(gzip.compress(alt)) / 1024:9.0f} KB  -> "
+              f"{len(gzip.compress(neu)) / 1024:9.0f} KB")
+        ok &= len(neu) < len(alt) / 2
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "alt.json").write_bytes(alt)
+            (Path(tmp) / "neu.json").write_bytes(neu)
+            gemessen = node_skript(_PARSE_JS, str(DOCS_DIR / "app.js"),
+                                   str(Path(tmp) / "alt.json"), str(Path(tmp) / "neu.json"))
+        if gemessen is None:
+            print("    node nicht gefunden: keine Parse-Zeiten")
+            continue
+        t_alt, t_neu = json.loads(gemessen)
+        ausgabe("    Parse + Aufbereitung (node)", t_alt / 1000, t_neu / 1000)
+    return ok
+
+
+# =============================================================================
+# Rendering im Dashboard (docs/app.js)
+# =============================================================================
+
+# Laedt index.html und app.js in das DOM aus bench_dom.js (Chart.js durch einen Zaehler ersetzt)
+# und misst eine Folge von Filterwechseln: bisher vollstaendiger Neuaufbau (alle Charts zerstoeren,
+# Grid/Budget neu erzeugen, wie renderAll() vor dem inkrementellen Rendering), neu applyFilters()
+_RENDER_JS = r"""
+const fs = require('fs'), vm = require('vm'), path = require('path');
+const [domshim, docs, daten] = process.argv.slice(2);
+const { createDocument, Event } = require(domshim);
+
+function laden(modus) {
+    const doc = createDocument(fs.readFileSync(path.join(docs, 'index.html'), 'utf8'));
+    const charts = { angelegt: 0, aktualisiert: 0, zerstoert: 0 };
+    class Chart {
+        constructor(canvas, config) { this.canvas = canvas; this.data = config.data; charts.angelegt++; }
+        update() { charts.aktualisiert++; }
+        destroy() { charts.zerstoert++; }
+    }
+    const ctx = {
+        document: doc, console, Intl, Map, Set, Promise, JSON, Math, Date, Chart,
+        location: { protocol: 'file:' }, setTimeout: () => 0,
+        fetch: async url => ({ ok: true, json: async () => JSON.parse(fs.readFileSync(daten, 'utf8')) }),
+    };
+    ctx.window = ctx;
+    vm.createContext(ctx);
+    vm.runInContext(fs.readFileSync(path.join(docs, 'app.js'), 'utf8'), ctx);
+    if (modus === 'bisher') {
+        vm.runInContext(`renderAll = (render => () => {
+            Object.keys(APP_STATE.charts).forEach(id => {
+                APP_STATE.charts[id].destroy();
+                delete APP_STATE.charts[id];
+            });
+            APP_STATE.cards.clear();
+            APP_STATE.budgetRows.clear();
+            ['ampelGrid', 'budgetContent', 'verteilungContent']
+                .forEach(id => document.getElementById(id).innerHTML = '');
+            render();
+        })(renderAll);`, ctx);
+    }
+    return { doc, ctx, charts };
+}
+
+async function messen(modus) {
+    const { doc, ctx, charts } = laden(modus);
+    doc.dispatchEvent(new Event('DOMContentLoaded'));
+    for (let i = 0; i < 5; i++) await new Promise(r => setImmediate(r));
+
+    // Jeder Wert jedes Filters einzeln, danach zuruecksetzen
+    const schritte = [];
+    ['filterAmpel', 'filterPAG', 'filterPhase', 'filterLeistungsbereich'].forEach(id => {
+        doc.getElementById(id).options.slice(1).forEach(o => schritte.push([id, o.value]));
+        schritte.push([id, '']);
+    });
+    const zeiten = [];
+    const vorher = { mutationen: doc._mutations, geparst: doc._parsed, ...charts };
+    let fehler = 0;
+    for (let runde = 0; runde < 3; runde++) {
+        for (const [id, wert] of schritte) {
+            const select = doc.getElementById(id);
+            select.value = wert;
+            const t0 = process.hrtime.bigint();
+            select.dispatchEvent(new Event('change'));
+            zeiten.push(Number(process.hrtime.bigint() - t0) / 1e6);
+            // Sichtbare Karten muessen genau die gefilterten Projekte in Ampel-Reihenfolge sein
+            const sichtbar = doc.getElementById('ampelGrid').querySelectorAll('.ampel-card')
+                .filter(c => !c.hidden).map(c => c.dataset.lv).join('|');
+            const erwartet = vm.runInContext('sortByAmpel(APP_STATE.filteredProjects)', ctx)
+                .map(p => String(p.lv_nummer)).join('|');
+            if (sichtbar !== erwartet) fehler++;
+        }
+    }
+    const n = zeiten.length;
+    zeiten.sort((a, b) => a - b);
+    return {
+        ms: zeiten[Math.floor(n / 2)],
+        mutationen: (doc._mutations - vorher.mutationen) / n,
+        geparst: (doc._parsed - vorher.geparst) / n,
+        angelegt: (charts.angelegt - vorher.angelegt) / n,
+        zerstoert: (charts.zerstoert - vorher.zerstoert) / n,
+        wechsel: n,
+        fehler,
+    };
+}
+
+(async () => {
+    console.log(JSON.stringify({ bisher: await messen('bisher'), neu: await messen('neu') }));
+})();
+"""
+
+
+def bench_rendering(groessen: tuple[int, ...] = (300, 1000)) -> bool:
+    from datenbasis import lade_konsolidiert
+    from dashboarddaten import kompakt, _json
+
+    print("Rendering im Dashboard: Filterwechsel mit vollstaendigem Neuaufbau vs. inkrementell "
+          "(node, DOM aus bench_dom.js)")
+    basis = lade_konsolidiert()
+    ok = True
+    for n in groessen:
+        with tempfile.TemporaryDirectory() as tmp:
+            daten = Path(tmp) / "consolidated.json"
+            daten.write_bytes(_json(kompakt(portfolio(basis, n), "bench")[0]))
+            gemessen = node_skript(_RENDER_JS, str(PROTOTYPE_DIR / "bench_dom.js"), str(DOCS_DIR), str(daten))
+        if gemessen is None:
+            print("  node nicht gefunden, uebersprungen")
+            return True
+        e = json.loads(gemessen)
+        a, b = e["bisher"], e["neu"]
+        print(f"  {n} Projekte ({b['wechsel']} Filterwechsel)")
+        ausgabe("    Zeit je Filterwechsel (Median)", a["ms"] / 1000, b["ms"] / 1000)
+        print(f"    {'DOM-Aenderungen je Wechsel':<32} {a['mutationen']:9.0f}     -> {b['mutationen']:9.0f}")
+        print(f"    {'per innerHTML geparst':<32} {a['geparst'] / 1024:9.1f} KB  -> {b['geparst'] / 1024:9.1f} KB")
+        print(f"    {'Charts angelegt/zerstoert':<32} {a['angelegt']:4.0f}/{a['zerstoert']:<4.0f}     -> "
+              f"{b['angelegt']:4.0f}/{b['zerstoert']:<4.0f}")
+        if a["fehler"] or b["fehler"]:
+            print(f"    FEHLER: sichtbare Karten weichen ab (bisher {a['fehler']}, neu {b['fehler']})")
+        ok &= (not a["fehler"] and not b["fehler"] and b["ms"] < a["ms"]
+               and b["angelegt"] == 0 and b["zerstoert"] == 0 and b["mutationen"] < a["mutationen"] / 2)
+    return ok
+
+
+# =============================================================================
+# Dashboard-Server (start_dashboard.py)
+# =============================================================================
+
+_DASHBOARD_DATEIEN = ["/", "/app.js", "/style.css", "/consolidated.json"]
+
+
+def _lastgenerator(port: int, clients: int, runden: int, etags: bool) -> dict:
+    """clients Threads rufen je runden-mal das Dashboard ab (Keep-Alive, falls der Server es kann)."""
+    import http.client
+    import threading
+
+    latenzen, bytes_gesamt, status = [], [0], {}
+    sperre = threading.Lock()
+
+    def client():
+        verbindung = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        bekannt = {}
+        for _ in range(runden):
+            for url in _DASHBOARD_DATEIEN:
+                kopf = {"Accept-Encoding": "gzip, deflate, br"}
+                if etags and url in bekannt:
+                    kopf["If-None-Match"] = bekannt[url]
+                t0 = time.perf_counter()
+                try:
+                    verbindung.request("GET", url, headers=kopf)
+                    antwort = verbindung.getresponse()
+                except (http.client.HTTPException, OSError):
+                    verbindung.close()
+                    verbindung = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                    verbindung.request("GET", url, headers=kopf)
+                    antwort = verbindung.getresponse()
+                inhalt = antwort.read()
+                dauer = time.perf_counter() - t0
+                if antwort.getheader("ETag"):
+                    bekannt[url] = antwort.getheader("ETag")
+                if antwort.getheader("Connection", "").lower() == "close" or antwort.version == 10:
+                    verbindung.close()
+                with sperre:
+                    latenzen.append(dauer)
+                    bytes_gesamt[0] += len(inhalt)
+                    status[antwort.status] = status.get(antwort.status, 0) + 1
+        verbindung.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    dauer = time.perf_counter() - t0
+    latenzen.sort()
+    return {"rps": len(latenzen) / dauer, "p50": latenzen[len(latenzen) // 2],
+            "p95": latenzen[int(len(latenzen) * 0.95)], "bytes": bytes_gesamt[0], "status": status}
+
+
+def _langsamer_client(port: int, sekunden: float):
+    """Oeffnet eine Verbindung und schickt die Anfrage erst nach sekunden (langsames Netz)."""
+    import socket
+    s = socket.create_connection(("127.0.0.1", port))
+    s.sendall(b"GET /consolidated.json HTTP/1.1\r\n")
+    time.sleep(sekunden)
+    s.sendall(b"Host: localhost\r\nConnection: close\r\n\r\n")
+    while s.recv(1 << 16):
+        pass
+    s.close()
+
+
+def bench_server(n: int = 300, clients: int = 16, runden: int = 5) -> bool:
+    import shutil
+    import threading
+    import http.server
+    from functools import partial
+    from datenbasis import lade_konsolidiert
+    from dashboarddaten import schreibe_dashboard
+
+    sys.path.insert(0, str(PROTOTYPE_DIR.parent))
+    import start_dashboard
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = Path(tmp)
+        for name in ("index.html", "app.js", "style.css"):
+            shutil.copy(start_dashboard.DOCS_DIR / name, docs / name)
+        schreibe_dashboard(portfolio(lade_konsolidiert(), n), docs / "consolidated.json", "bench")
+        groesse = (docs / "consolidated.json").stat().st_size
+        print(f"Dashboard-Server ({n} Projekte, consolidated.json {groesse / 1024:.0f} KB, "
+              f"{clients} Clients x {runden} Aufrufe von {len(_DASHBOARD_DATEIEN)} Dateien)")
+
+        class AlterHandler(http.server.SimpleHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        alt = http.server.HTTPServer(("127.0.0.1", 0), partial(AlterHandler, directory=str(docs)))
+        neu = start_dashboard.DashboardServer(("127.0.0.1", 0), verzeichnis=docs)
+        neu.dateien.vorwaermen()
+        for server in (alt, neu):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            ergebnisse = {}
+            for name, server in (("bisher", alt), ("neu", neu)):
+                port = server.server_address[1]
+                erst = _lastgenerator(port, clients, 1, etags=False)
+                wieder = _lastgenerator(port, clients, runden, etags=True)
+                # Ein Client mit langsamer Verbindung blockiert einen Server mit nur einem Thread
+                bremse = threading.Thread(target=_langsamer_client, args=(port, 1.0))
+                bremse.start()
+                time.sleep(0.05)
+                gebremst = _lastgenerator(port, clients, 1, etags=False)
+                bremse.join()
+                ergebnisse[name] = (erst, wieder, gebremst)
+        finally:
+            for server in (alt, neu):
+                server.shutdown()
+                server.server_close()
+
+    for titel, i in (("Erstaufruf", 0), ("Wiederholte Aufrufe (If-None-Match)", 1),
+                     ("Erstaufruf neben langsamem Client", 2)):
+        a, b = ergebnisse["bisher"][i], ergebnisse["neu"][i]
+        print(f"  {titel}")
+        print(f"    {'Anfragen/s':<30} {a['rps']:9.0f}     -> {b['rps']:9.0f}")
+        print(f"    {'Latenz p50 / p95':<30} {a['p50'] * 1000:6.1f}/{a['p95'] * 1000:6.1f} ms"
+              f" -> {b['p50'] * 1000:6.1f}/{b['p95'] * 1000:6.1f} ms")
+        print(f"    {'Uebertragen':<30} {a['bytes'] / 2**20:9.2f} MB  -> {b['bytes'] / 2**20:9.2f} MB"
+              f"   (Status {b['status']})")
+    erst_neu, wieder_neu, gebremst_neu = ergebnisse["neu"]
+    return (erst_neu["bytes"] < ergebnisse["bisher"][0]["bytes"] / 3
+            and wieder_neu["status"].get(304, 0) >= clients * (runden - 1) * len(_DASHBOARD_DATEIEN)
+            and gebremst_neu["p95"] < 0.5)
+
+
+BENCHMARKS = {
+    "payload": bench_payload,
+    "rendering": bench_rendering,
+    "server": bench_server,
+}
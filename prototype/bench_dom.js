@@ -0,0 +1,331 @@
+/**
+ * bench_dom.js — Minimales DOM, um docs/app.js ohne Browser unter node zu messen (bench.py rendering).
+ *
+ * Kein jsdom: im Projekt gibt es keine npm-Abhaengigkeiten, dieses DOM kommt ohne aus.
+ * Unterstuetzt genau das, was app.js verwendet: getElementById, querySelector(All) mit
+ * einfachen Selektoren (#id, .klasse, tag, tag.klasse, Nachfahren mit Leerzeichen),
+ * innerHTML/outerHTML (Parser fuer das HTML aus app.js und index.html), textContent,
+ * classList, dataset, style, hidden, Events, appendChild/insertBefore/remove und <select>.value.
+ * Zaehlt DOM-Aenderungen (document._mutations) und per innerHTML geparste Zeichen
+ * (document._parsed); Layout und Zeichnen misst es nicht.
+ */
+
+'use strict';
+
+const VOID = new Set(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr']);
+const ENTITIES = { amp: '&', lt: '<', gt: '>', quot: '"', apos: "'", nbsp: ' ', ndash: '–', mdash: '—', times: '×' };
+
+function decode(text) {
+    return text.replace(/&(#x?[0-9a-fA-F]+|\w+);/g, (m, e) => {
+        if (e[0] === '#') return String.fromCodePoint(e[1] === 'x' ? parseInt(e.slice(2), 16) : parseInt(e.slice(1), 10));
+        return e in ENTITIES ? ENTITIES[e] : m;
+    });
+}
+
+function escapeText(text) {
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+function escapeAttr(text) {
+    return text.replace(/&/g, '&amp;').replace(/"/g, '&quot;');
+}
+
+class Text {
+    constructor(text) {
+        this.nodeType = 3;
+        this.data = text;
+        this.parentNode = null;
+    }
+    get textContent() { return this.data; }
+    set textContent(v) { this.data = String(v); }
+    get outerHTML() { return escapeText(this.data); }
+}
+
+class ClassList {
+    constructor(el) { this.el = el; }
+    _get() { return (this.el.getAttribute('class') || '').split(/\s+/).filter(Boolean); }
+    _set(list) { this.el.setAttribute('class', list.join(' ')); }
+    contains(c) { return this._get().includes(c); }
+    add(...cs) { const l = this._get(); cs.forEach(c => { if (!l.includes(c)) l.push(c); }); this._set(l); }
+    remove(...cs) { this._set(this._get().filter(c => !cs.includes(c))); }
+    toggle(c, force) {
+        const on = force === undefined ? !this.contains(c) : Boolean(force);
+        if (on) this.add(c); else this.remove(c);
+        return on;
+    }
+}
+
+function styleProxy(el) {
+    // style.display usw. lesen/schreiben das style-Attribut
+    const parse = () => Object.fromEntries((el.getAttribute('style') || '').split(';')
+        .map(s => s.split(':').map(t => t.trim())).filter(([k]) => k));
+    const camel = k => k.replace(/[A-Z]/g, c => '-' + c.toLowerCase());
+    return new Proxy({}, {
+        get: (_, k) => parse()[camel(String(k))] || '',
+        set: (_, k, v) => {
+            const s = parse();
+            if (v === '' || v == null) delete s[camel(String(k))]; else s[camel(String(k))] = String(v);
+            el.setAttribute('style', Object.entries(s).map(([a, b]) => `${a}: ${b}`).join('; '));
+            return true;
+        }
+    });
+}
+
+class Element {
+    constructor(tagName, ownerDocument) {
+        this.nodeType = 1;
+        this.tagName = tagName.toUpperCase();
+        this.attributes = new Map();
+        this.childNodes = [];
+        this.parentNode = null;
+        this.ownerDocument = ownerDocument;
+        this.listeners = {};
+        this.classList = new ClassList(this);
+        this.style = styleProxy(this);
+        this._value = undefined;
+    }
+
+    getAttribute(name) { return this.attributes.has(name) ? this.attributes.get(name) : null; }
+    setAttribute(name, value) { this.attributes.set(name, String(value)); }
+    removeAttribute(name) { this.attributes.delete(name); }
+    hasAttribute(name) { return this.attributes.has(name); }
+
+    get id() { return this.getAttribute('id') || ''; }
+    set id(v) { this.setAttribute('id', v); }
+    get className() { return this.getAttribute('class') || ''; }
+    set className(v) { this.setAttribute('class', v); }
+    get hidden() { return this.hasAttribute('hidden'); }
+    set hidden(v) { if (v) this.setAttribute('hidden', ''); else this.removeAttribute('hidden'); }
+    get dataset() {
+        const el = this;
+        const attr = k => 'data-' + String(k).replace(/[A-Z]/g, c => '-' + c.toLowerCase());
+        return new Proxy({}, {
+            get: (_, k) => el.getAttribute(attr(k)) ?? undefined,
+            set: (_, k, v) => { el.setAttribute(attr(k), v); return true; }
+        });
+    }
+
+    get children() { return this.childNodes.filter(n => n.nodeType === 1); }
+    get firstChild() { return this.childNodes[0] || null; }
+    get nextSibling() {
+        if (!this.parentNode) return null;
+        const siblings = this.parentNode.childNodes;
+        return siblings[siblings.indexOf(this) + 1] || null;
+    }
+
+    appendChild(node) { return this.insertBefore(node, null); }
+    insertBefore(node, ref) {
+        if (node.parentNode) node.parentNode._detach(node);
+        const i = ref ? this.childNodes.indexOf(ref) : -1;
+        if (i < 0) this.childNodes.push(node); else this.childNodes.splice(i, 0, node);
+        node.parentNode = this;
+        this.ownerDocument._mutations++;
+        return node;
+    }
+    _detach(node) {
+        const i = this.childNodes.indexOf(node);
+        if (i >= 0) this.childNodes.splice(i, 1);
+        node.parentNode = null;
+        this.ownerDocument._mutations++;
+    }
+    remove() { if (this.parentNode) this.parentNode._detach(this); }
+
+    get textContent() { return this.childNodes.map(n => n.textContent).join(''); }
+    set textContent(v) {
+        this.childNodes.forEach(n => { n.parentNode = null; });
+        this.childNodes = [];
+        if (v !== '' && v != null) this.appendChild(new Text(String(v)));
+        this.ownerDocument._mutations++;
+    }
+
+    get innerHTML() { return this.childNodes.map(n => n.outerHTML).join(''); }
+    set innerHTML(html) {
+        this.childNodes.forEach(n => { n.parentNode = null; });
+        this.childNodes = [];
+        parseInto(this, String(html), this.ownerDocument);
+        this.ownerDocument._mutations++;
+        this.ownerDocument._parsed += String(html).length;
+    }
+    get outerHTML() {
+        const attrs = [...this.attributes].map(([k, v]) => ` ${k}="${escapeAttr(v)}"`).join('');
+        const tag = this.tagName.toLowerCase();
+        return VOID.has(tag) ? `<${tag}${attrs}>` : `<${tag}${attrs}>${this.innerHTML}</${tag}>`;
+    }
+    set outerHTML(html) {
+        const parent = this.parentNode;
+        if (!parent) return;
+        const holder = this.ownerDocument.createElement('div');
+        holder.innerHTML = html;
+        [...holder.childNodes].forEach(n => parent.insertBefore(n, this));
+        this.remove();
+    }
+
+    // <select>: value der ausgewaehlten bzw. ersten Option
+    get options() { return this.querySelectorAll('option'); }
+    get value() {
+        if (this.tagName === 'SELECT') {
+            const opts = this.options;
+            const sel = opts.find(o => o.hasAttribute('selected')) || opts[0];
+            return sel ? sel.value : '';
+        }
+        if (this.tagName === 'OPTION') return this.hasAttribute('value') ? this.getAttribute('value') : this.textContent;
+        return this._value ?? this.getAttribute('value') ?? '';
+    }
+    set value(v) {
+        if (this.tagName === 'SELECT') {
+            this.options.forEach(o => { if (o.value === String(v)) o.setAttribute('selected', ''); else o.removeAttribute('selected'); });
+        } else if (this.tagName === 'OPTION') {
+            this.setAttribute('value', v);
+        } else {
+            this._value = String(v);
+        }
+    }
+
+    addEventListener(type, fn) { (this.listeners[type] = this.listeners[type] || []).push(fn); }
+    removeEventListener(type, fn) { this.listeners[type] = (this.listeners[type] || []).filter(f => f !== fn); }
+    dispatchEvent(event) {
+        event.target = event.target || this;
+        for (let node = this; node; node = node.parentNode) {
+            event.currentTarget = node;
+            (node.listeners[event.type] || []).forEach(fn => fn.call(node, event));
+            if (!event.bubbles || event._stopped) break;
+        }
+        return true;
+    }
+    click() { this.dispatchEvent(new Event('click', { bubbles: true })); }
+
+    matches(selector) { return selector.split(',').some(s => matchesComplex(this, s.trim())); }
+    closest(selector) {
+        for (let node = this; node && node.nodeType === 1; node = node.parentNode) {
+            if (node.matches(selector)) return node;
+        }
+        return null;
+    }
+    querySelectorAll(selector) {
+        const out = [];
+        const walk = node => node.childNodes.forEach(n => {
+            if (n.nodeType !== 1) return;
+            if (n.matches(selector)) out.push(n);
+            walk(n);
+        });
+        walk(this);
+        return out;
+    }
+    querySelector(selector) { return this.querySelectorAll(selector)[0] || null; }
+    getElementById(id) {
+        // Treffer werden gemerkt und nur neu gesucht, wenn das Element nicht mehr im Baum haengt
+        const cache = this.ownerDocument._ids;
+        const hit = cache.get(id);
+        if (hit && hit.attributes.get('id') === id) {
+            let node = hit;
+            while (node.parentNode && node !== this) node = node.parentNode;
+            if (node === this) return hit;
+        }
+        const found = this._findId(id);
+        if (found) cache.set(id, found);
+        return found;
+    }
+    _findId(id) {
+        const stack = [...this.childNodes].reverse();
+        while (stack.length) {
+            const node = stack.pop();
+            if (node.nodeType !== 1) continue;
+            if (node.attributes.get('id') === id) return node;
+            for (let i = node.childNodes.length - 1; i >= 0; i--) stack.push(node.childNodes[i]);
+        }
+        return null;
+    }
+    getContext() { return null; }
+}
+
+// Einfache Selektoren werden einmal in (Tag, Ids, Klassen) zerlegt
+const SIMPLE = new Map();
+
+function matchesSimple(el, simple) {
+    let sel = SIMPLE.get(simple);
+    if (!sel) {
+        const m = simple.match(/^([a-zA-Z][\w-]*)?((?:[#.][\w-]+)*)$/);
+        if (!m) throw new Error('Selektor nicht unterstuetzt: ' + simple);
+        const parts = m[2].match(/[#.][\w-]+/g) || [];
+        sel = {
+            tag: m[1] ? m[1].toUpperCase() : null,
+            ids: parts.filter(p => p[0] === '#').map(p => p.slice(1)),
+            classes: parts.filter(p => p[0] === '.').map(p => p.slice(1))
+        };
+        SIMPLE.set(simple, sel);
+    }
+    if (sel.tag && el.tagName !== sel.tag) return false;
+    if (sel.ids.some(id => el.attributes.get('id') !== id)) return false;
+    if (!sel.classes.length) return true;
+    const classes = (el.attributes.get('class') || '').split(/\s+/);
+    return sel.classes.every(c => classes.includes(c));
+}
+
+function matchesComplex(el, selector) {
+    const parts = selector.split(/\s+/).filter(Boolean);
+    if (!matchesSimple(el, parts[parts.length - 1])) return false;
+    let node = el.parentNode;
+    for (let i = parts.length - 2; i >= 0; i--) {
+        while (node && node.nodeType === 1 && !matchesSimple(node, parts[i])) node = node.parentNode;
+        if (!node || node.nodeType !== 1) return false;
+        node = node.parentNode;
+    }
+    return true;
+}
+
+const TOKEN = /<!--[\s\S]*?-->|<!\w[^>]*>|<(\/?)([a-zA-Z][\w-]*)((?:[^>"']|"[^"]*"|'[^']*')*)>|([^<]+)/g;
+const ATTR = /([^\s=\/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?/g;
+
+function parseInto(root, html, doc) {
+    let current = root;
+    for (const m of html.matchAll(TOKEN)) {
+        const [, closing, tag, attrs, text] = m;
+        if (text !== undefined) {
+            current.appendChild(new Text(decode(text)));
+        } else if (tag && closing) {
+            const name = tag.toUpperCase();
+            for (let node = current; node && node !== root; node = node.parentNode) {
+                if (node.tagName === name) { current = node.parentNode; break; }
+            }
+        } else if (tag) {
+            const el = doc.createElement(tag);
+            for (const a of attrs.matchAll(ATTR)) {
+                el.attributes.set(a[1], decode(a[2] ?? a[3] ?? a[4] ?? ''));
+            }
+            current.appendChild(el);
+            if (!VOID.has(tag.toLowerCase()) && !/\/\s*$/.test(attrs)) current = el;
+        }
+    }
+}
+
+class Event {
+    constructor(type, init = {}) {
+        this.type = type;
+        this.bubbles = Boolean(init.bubbles);
+        this.target = null;
+        this.currentTarget = null;
+    }
+    stopPropagation() { this._stopped = true; }
+    preventDefault() {}
+}
+
+class Document extends Element {
+    constructor() {
+        super('#document', null);
+        this.ownerDocument = this;
+        this._mutations = 0;
+        this._parsed = 0;
+        this._ids = new Map();
+    }
+    createElement(tag) { return new Element(tag, this); }
+    get body() { return this.querySelector('body'); }
+    get documentElement() { return this.querySelector('html'); }
+}
+
+function createDocument(html) {
+    const doc = new Document();
+    parseInto(doc, html, doc);
+    return doc;
+}
+
+module.exports = { createDocument, Event };
@@ -0,0 +1,191 @@
+"""
+bench_konsolidierung.py — Benchmarks der Konsolidierung (01_konsolidierung.py), Aufruf ueber bench.py.
+
+  merged   Merged-Cell-Lookup im PSB: lineare Suche vs. Index (PSB-Vorlage)
+  sap      SAP-Reader: Laufzeit und Spitzenspeicher bei wachsender Zeilenzahl
+  join     SAP-/PPM-Zuordnung in konsolidiere(): DataFrame-Scans vs. LVIndex
+"""
+
+import re
+import tempfile
+import importlib
+from pathlib import Path
+
+import openpyxl
+
+from config import QUELLDATEN, SAP_FILE, PSB_CELLS, PSB_ZIELWERT_CELLS, PSB_TEXT_RANGES
+from benchhilfe import zeit, ausgabe, spitzenspeicher
+
+konsolidierung = importlib.import_module("01_konsolidierung")
+
+PSB_VORLAGE = QUELLDATEN / "vorlagen" / "PSB_2026-01_VORLAGE.xlsx"
+
+
+# =============================================================================
+# Merged-Cell-Lookup
+# =============================================================================
+
+def _get_merged_value_linear(ws, cell_ref: str):
+    """Bisherige Variante: durchsucht fuer jede leere Zelle alle Merged-Regionen."""
+    cell = ws[cell_ref]
+    if cell.value is not None:
+        return cell.value
+    for merged_range in ws.merged_cells.ranges:
+        if cell.coordinate in merged_range:
+            return ws.cell(row=merged_range.min_row, column=merged_range.min_col).value
+    return None
+
+
+def bench_merged():
+    print(f"Merged-Cell-Lookup ({PSB_VORLAGE.name})")
+    wb = openpyxl.load_workbook(PSB_VORLAGE, data_only=True)
+    ws = wb["Statusbericht"]
+    # Alle Lookups, die read_psb() pro Workbook ausfuehrt
+    refs = list(PSB_CELLS.values()) + list(PSB_ZIELWERT_CELLS.values())
+    refs += [start for start, _ in PSB_TEXT_RANGES.values()]
+    print(f"  {len(ws.merged_cells.ranges)} Merged-Regionen, {len(refs)} Lookups je PSB\n")
+
+    def mit_index():
+        index = konsolidierung._merged_index(ws)
+        return [konsolidierung._get_merged_value(ws, r, index) for r in refs]
+
+    assert [_get_merged_value_linear(ws, r) for r in refs] == mit_index()
+    ausgabe("read_psb-Lookups", zeit(lambda: [_get_merged_value_linear(ws, r) for r in refs]),
+            zeit(mit_index))
+    wb.close()
+
+
+# =============================================================================
+# SAP-Reader
+# =============================================================================
+
+def _read_sap_alt(pfad: Path):
+    """Bisherige Variante: Vollstaendiges Workbook, Python-Dicts pro Zeile."""
+    import pandas as pd
+    wb = openpyxl.load_workbook(pfad, data_only=True)
+    ws = wb.active
+    records = []
+    for row in ws.iter_rows(min_row=5, values_only=False):
+        vals = [c.value for c in row]
+        if not vals[0]:
+            continue
+        objekt_text = str(vals[1]).strip() if vals[1] else ""
+        lv_nrs = re.findall(r"[A-D]\d+(?:\.\d+)*", objekt_text)
+
+        def neg(v):
+            try:
+                return abs(float(v)) if v is not None else 0.0
+            except (ValueError, TypeError):
+                return 0.0
+
+        base = {"le_nummer": str(vals[0]).strip(), "objekt_text": objekt_text,
+                "kostenstelle": str(vals[0]).strip()}
+        for i, k in enumerate(["plankosten_2025", "istkosten_2025", "plankosten_2026",
+                               "istkosten_2026", "plankosten_2027"], 3):
+            base[k] = neg(vals[i])
+        for lv_nr in (lv_nrs or [objekt_text]):
+            rec = {**base, "lv_nr_sap": lv_nr}
+            if len(lv_nrs) > 1:
+                for k in ["plankosten_2025", "istkosten_2025", "plankosten_2026",
+                          "istkosten_2026", "plankosten_2027"]:
+                    rec[k] = base[k] / len(lv_nrs)
+            records.append(rec)
+    wb.close()
+    return pd.DataFrame(records)
+
+
+def _sap_testdatei(pfad: Path, n_zeilen: int):
+    """Schreibt einen synthetischen SAP-Auszug im Layout von SAP_FILE."""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["CO-Betrag", None, None, "IST"])
+    ws.append([None, None, None, 2025, None, 2026, None, 2027, 2028])
+    ws.append(["Objekt", "Objekt", "Verantwortlich", "PLAN", "IST", "PLAN", "IST", "PLAN", "PLAN"])
+    ws.append(["Globalbudget"])
+    for i in range(n_zeilen):
+        lb = "ABCD"[i % 4]
+        text = f"{lb}{i % 9 + 1}.{i % 7 + 1}.{i}" + (f"+{lb}{i % 9 + 1}.{i}" if i % 5 == 0 else "") + " Vorhaben"
+        ws.append([f"LE{1000000 + i}", text, f"Nachname Vorname {i}",
+                   -1000.0 * (i % 50), -10.0 * (i % 30), -2000.0, None, -500.5, 0])
+    wb.save(pfad)
+
+
+def bench_sap():
+    print(f"SAP-Reader (synthetische Auszuege im Layout von {SAP_FILE.name})")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (2_000, 10_000, 20_000):
+            pfad = Path(tmp) / f"sap_{n}.xlsx"
+            _sap_testdatei(pfad, n)
+            alt, neu = _read_sap_alt(pfad), konsolidierung.read_sap(pfad)
+            assert len(alt) == len(neu)
+            assert (alt["plankosten_2025"].to_numpy() == neu["plankosten_2025"].to_numpy()).all()
+            ausgabe(f"{n} Zeilen", zeit(lambda: _read_sap_alt(pfad), wiederholungen=2, schleifen=1),
+                    zeit(lambda: konsolidierung.read_sap(pfad), wiederholungen=2, schleifen=1))
+            m_alt = spitzenspeicher(lambda: _read_sap_alt(pfad))
+            m_neu = spitzenspeicher(lambda: konsolidierung.read_sap(pfad))
+            print(f"  {'':<40} {m_alt / 2**20:9.1f} MB  -> {m_neu / 2**20:9.1f} MB  Spitzenspeicher")
+
+
+# =============================================================================
+# Join in konsolidiere()
+# =============================================================================
+
+def _join_alt(psbs, sap_df, ppm_df):
+    """Bisherige Variante: zwei volle Scans ueber sap_df und einer ueber ppm_df pro PSB
+    (Praefixregel startswith(lv_nr) wie in 01_konsolidierung.py vor LVIndex)."""
+    ergebnis = []
+    for psb in psbs:
+        lv_nr = psb["lv_nr"]
+        sap_match = sap_df[sap_df["lv_nr_sap"] == lv_nr]
+        if sap_match.empty:
+            sap_match = sap_df[sap_df["lv_nr_sap"].str.startswith(lv_nr, na=False)]
+        sap_row = sap_match.iloc[0].to_dict() if len(sap_match) > 0 else {}
+        ppm_match = ppm_df[ppm_df["lv_nummer"] == lv_nr]
+        ppm_row = ppm_match.iloc[0].to_dict() if len(ppm_match) > 0 else {}
+        ergebnis.append((sap_row.get("le_nummer"), ppm_row.get("prioritaet")))
+    return ergebnis
+
+
+def _join_neu(psbs, sap_df, ppm_df):
+    sap_index = konsolidierung.LVIndex(sap_df, "lv_nr_sap")
+    ppm_index = konsolidierung.LVIndex(ppm_df, "lv_nummer")
+    ergebnis = []
+    for psb in psbs:
+        sap_row, _ = sap_index.finde(psb["lv_nr"])
+        ppm_row, _ = ppm_index.finde(psb["lv_nr"], praefix=False)
+        ergebnis.append((sap_row.get("le_nummer"), ppm_row.get("prioritaet")))
+    return ergebnis
+
+
+def bench_join():
+    import pandas as pd
+    print("SAP-/PPM-Zuordnung (synthetische LV-Nrn, 1/3 exakt, 1/3 Unterposition, "
+          "1/6 ohne SAP, 1/6 nur Nachbarnummer wie Y8 -> Y80.1)")
+    for n_psb, n_sap in ((300, 5_000), (1_000, 20_000)):
+        nachbarn = [f"Y{i}0.1" for i in range(n_psb) if i % 6 == 2]
+        sap_df = pd.DataFrame({
+            "le_nummer": [f"LE{i}" for i in range(n_sap + len(nachbarn))],
+            "lv_nr_sap": [f"{'ABCD'[i % 4]}{i}.1" + (".1" if i % 2 else "") for i in range(n_sap)] + nachbarn,
+        })
+        ppm_df = pd.DataFrame({
+            "lv_nummer": [f"{'ABCD'[i % 4]}{i}.1" for i in range(n_psb)],
+            "prioritaet": ["Mittel"] * n_psb,
+        })
+        psbs = [{"lv_nr": f"{'ABCD'[i % 4]}{i}" + (".1" if i % 3 == 0 else "")
+                           if i % 3 != 2 else f"{'XY'[i % 2 == 0]}{i}"} for i in range(n_psb)]
+        # Nur echte Unterpositionen (lv_nr + "."): Abweichungen zur bisherigen Regel gesondert
+        geaendert = konsolidierung.sap_zuordnung_geaendert([p["lv_nr"] for p in psbs], sap_df)
+        alt, neu = _join_alt(psbs, sap_df, ppm_df), _join_neu(psbs, sap_df, ppm_df)
+        assert sum(a != b for a, b in zip(alt, neu)) == len(geaendert)
+        ausgabe(f"{n_psb} PSBs x {n_sap} SAP-Zeilen",
+                zeit(lambda: _join_alt(psbs, sap_df, ppm_df), wiederholungen=1, schleifen=1),
+                zeit(lambda: _join_neu(psbs, sap_df, ppm_df), wiederholungen=3, schleifen=1))
+        print(f"    andere SAP-Zeile durch lv_nr + \".\": {len(geaendert)} PSBs, z.B. "
+              + ", ".join(f"{lv}: {a} -> {b}" for lv, a, b in geaendert[:3]))
+
+
+BENCHMARKS = {
+    "merged": bench_merged,
+    "sap": bench_sap,
+    "join": bench_join,
+}
@@ -0,0 +1,90 @@
+"""
+benchhilfe.py — Gemeinsame Hilfen der Benchmarks (bench.py und bench_*.py).
+
+Eine Zeitmessung (zeit) und eine Ausgabezeile (ausgabe) fuer alle Vergleiche bisher -> neu,
+dazu Spitzenspeicher, vervielfachte Portfolios, umgeleitete Ausgabepfade und node-Skripte.
+"""
+
+import io
+import shutil
+import tempfile
+import subprocess
+import contextlib
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+
+def zeit(fn: Callable, wiederholungen: int = 5, schleifen: int = 20,
+         vorbereitung: Callable | None = None) -> float:
+    """
+    Beste Laufzeit pro Aufruf in Sekunden (Minimum ueber mehrere Wiederholungen).
+
+    vorbereitung() laeuft vor jeder Wiederholung ausserhalb der Messung, ihr Ergebnis
+    wird fn uebergeben (z.B. eine frisch geladene Vorlage).
+    """
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        argumente = (vorbereitung(),) if vorbereitung else ()
+        t0 = perf_counter()
+        for _ in range(schleifen):
+            fn(*argumente)
+        beste = min(beste, (perf_counter() - t0) / schleifen)
+    return beste
+
+
+def ausgabe(name: str, vorher: float, nachher: float):
+    """Eine Zeile bisher -> neu mit Faktor (Zeiten in Sekunden)."""
+    faktor = vorher / nachher if nachher > 0 else float("inf")
+    print(f"  {name:<40} {vorher * 1000:9.3f} ms  -> {nachher * 1000:9.3f} ms  (x{faktor:.1f})")
+
+
+def spitzenspeicher(fn: Callable) -> int:
+    """Spitzenspeicher eines Aufrufs in Bytes (tracemalloc; separat von der Zeitmessung)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def portfolio(df, n: int):
+    """Vervielfacht die konsolidierten Projekte auf n Zeilen mit wechselnder PAG/Leistungsbereich."""
+    import pandas as pd
+    gross = pd.concat([df] * (n // len(df) + 1), ignore_index=True).iloc[:n].copy()
+    pags = ["Rektor", "VRLK", "VRFDI", "VRFIN"]
+    gross["pag"] = [pags[i % 4] for i in range(n)]
+    gross["lv_nummer"] = [f"{'ABCD'[(i // 4) % 4]}{i}.1" for i in range(n)]
+    return gross
+
+
+def still():
+    """Unterdrueckt die Konsolenausgabe der gemessenen Stufen."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+@contextlib.contextmanager
+def ersetzt(modul, **werte):
+    """Setzt Modulattribute (Ausgabepfade, Formate) fuer die Dauer des Blocks."""
+    alt = {name: getattr(modul, name) for name in werte}
+    for name, wert in werte.items():
+        setattr(modul, name, wert)
+    try:
+        yield
+    finally:
+        for name, wert in alt.items():
+            setattr(modul, name, wert)
+
+
+def node_skript(skript: str, *argumente: str) -> str | None:
+    """Fuehrt ein JavaScript unter node aus und liefert stdout (None, wenn node fehlt)."""
+    node = shutil.which("node")
+    if not node:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        pfad = Path(tmp) / "bench.js"
+        pfad.write_text(skript, encoding="utf-8")
+        return subprocess.run([node, str(pfad), *argumente],
+                              capture_output=True, text=True, check=True).stdout
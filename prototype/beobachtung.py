@@ -0,0 +1,161 @@
+"""
+beobachtung.py — Live-Aktualisierung des HTML-Dashboards bei geaenderten Quelldaten.
+
+Verwendet von start_dashboard.py --beobachten. Beobachtet werden die PSBs in quelldaten/psb,
+der SAP-Auszug (SAP_FILE) und das bestehende Dashboard (DASHBOARD_FILE), per Abfrage von
+Aenderungszeit und Groesse (BEOBACHTUNG_INTERVALL in config.py).
+
+Nach einer Aenderung wird nur die betroffene Konsolidierung wiederholt:
+  - geaenderter/neuer PSB:   nur dieser PSB wird eingelesen, konsolidiert und validiert
+  - geloeschter PSB:         seine Zeile entfaellt
+  - SAP oder Dashboard:      nur diese Quelle wird neu eingelesen; alle Zeilen werden aus den
+                             bereits eingelesenen PSBs neu konsolidiert (ohne PSB-Dateien zu lesen)
+Danach werden docs/consolidated.json und die geaenderten Detaildateien geschrieben und die
+Aenderung als dashboarddaten.delta() an den Server gemeldet. meta.ereignis in der Datei ist die
+letzte vor dem Schreiben gesendete Ereignis-ID; app.js verbindet sich mit events?seit=<id> und
+bekommt so auch die Deltas, die zwischen dem Laden der Datei und dem Verbinden gesendet wurden.
+
+Die Live-Daten entstehen direkt aus den Quelldaten; konsolidiert.xlsx/.parquet werden nicht
+geschrieben (dafuer weiterhin pipeline.py), manuelle Korrekturen im Review-Excel werden
+im Beobachtungsmodus also nicht uebernommen. Die geschriebene Datei traegt daher
+meta.quelle = LIVE_QUELLE und wird nach dem Beobachtungsmodus neu erzeugt (dashboarddaten.ist_live()).
+"""
+
+import time
+import importlib
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from config import (
+    PSB_DIR, SAP_FILE, DASHBOARD_FILE, DASHBOARD_JSON, PSB_CACHE_AKTIV,
+    BEOBACHTUNG_INTERVALL, BEOBACHTUNG_RUHEZEIT, psb_dateien,
+)
+from dashboarddaten import LIVE_QUELLE as QUELLE, kompakt, delta, schreibe_kompakt
+
+
+class LiveKonsolidierung:
+    """Konsolidierte Zeilen je PSB-Datei im Speicher, aktualisiert je geaenderter Quelldatei."""
+
+    def __init__(self, ziel: Path = DASHBOARD_JSON, ereignis: Callable[[], int] | None = None):
+        self.ziel = Path(ziel)
+        self.ereignis = ereignis            # liefert die zuletzt gesendete Ereignis-ID (meta.ereignis)
+        self.konsolidierung = importlib.import_module("01_konsolidierung")
+        self.cache = self.konsolidierung.PSBCache() if PSB_CACHE_AKTIV else None
+        self.psbs: dict[str, dict] = {}     # Dateiname -> eingelesener PSB
+        self.zeilen: dict[str, dict] = {}   # Dateiname -> konsolidierte und validierte Zeile
+        self.sap = None
+        self.ppm = None
+        self.stand = None                   # (daten, details) aus kompakt()
+
+    def quellen(self) -> dict[Path, tuple[int, int]]:
+        """(mtime_ns, Groesse) aller beobachteten Dateien."""
+        stempel = {}
+        for pfad in [*psb_dateien(), SAP_FILE, DASHBOARD_FILE]:
+            try:
+                st = pfad.stat()
+            except OSError:
+                continue
+            stempel[pfad] = (st.st_mtime_ns, st.st_size)
+        return stempel
+
+    def starten(self) -> int:
+        """Liest alle Quellen ein und schreibt consolidated.json; gibt die Anzahl Projekte zurueck."""
+        k = self.konsolidierung
+        self.sap = k.read_sap()
+        self.ppm = k.read_dashboard_ppm_fields()
+        psbs, _ = k.read_all_psbs(workers=1, cache=self.cache)
+        self.psbs = {psb["_quelldatei"]: psb for psb in psbs}
+        self._konsolidiere(list(self.psbs))
+        self.stand = kompakt(self._tabelle(), QUELLE)
+        self._schreiben(self.stand)
+        return len(self.zeilen)
+
+    def _schreiben(self, stand: tuple[dict, dict]):
+        if self.ereignis is not None:
+            stand[0]["meta"]["ereignis"] = self.ereignis()
+        schreibe_kompakt(*stand, self.ziel)
+
+    def _konsolidiere(self, namen: list[str]):
+        if not namen:
+            return
+        k = self.konsolidierung
+        df = k.validiere(k.konsolidiere([self.psbs[n] for n in namen], self.sap, self.ppm))
+        for zeile in df.to_dict("records"):
+            self.zeilen[zeile["_quelldatei"]] = zeile
+
+    def _tabelle(self) -> pd.DataFrame:
+        # Reihenfolge wie in 01_konsolidierung.py: sortiert nach Dateiname
+        return pd.DataFrame([self.zeilen[n] for n in sorted(self.zeilen)])
+
+    def aktualisieren(self, geaendert: set[Path]) -> dict | None:
+        """Wiederholt die von den geaenderten Dateien betroffene Konsolidierung.
+
+        Schreibt consolidated.json und gibt das Delta zum vorigen Stand zurueck
+        (None, wenn sich am Dashboard nichts geaendert hat)."""
+        k = self.konsolidierung
+        psb_dir = PSB_DIR.resolve()
+        psb_geaendert = sorted(p for p in geaendert if p.resolve().parent == psb_dir)
+
+        neu_konsolidieren = set()
+        for pfad in psb_geaendert:
+            if not pfad.exists():
+                self.psbs.pop(pfad.name, None)
+                self.zeilen.pop(pfad.name, None)
+        vorhanden = [p for p in psb_geaendert if p.exists()]
+        if vorhanden:
+            # Nicht lesbare PSBs (z.B. noch nicht fertig gespeichert) behalten ihren alten Stand
+            psbs, _ = k.read_all_psbs(workers=1, cache=self.cache, dateien=vorhanden)
+            for psb in psbs:
+                self.psbs[psb["_quelldatei"]] = psb
+                neu_konsolidieren.add(psb["_quelldatei"])
+
+        if SAP_FILE in geaendert:
+            print(f"  Lese SAP: {SAP_FILE.name}")
+            self.sap = k.read_sap()
+            neu_konsolidieren = set(self.psbs)
+        if DASHBOARD_FILE in geaendert:
+            print(f"  Lese Dashboard: {DASHBOARD_FILE.name}")
+            self.ppm = k.read_dashboard_ppm_fields()
+            neu_konsolidieren = set(self.psbs)
+
+        self._konsolidiere(sorted(neu_konsolidieren))
+        stand = kompakt(self._tabelle(), QUELLE)
+        aenderung = delta(self.stand, stand)
+        if aenderung is not None:
+            self._schreiben(stand)
+            self.stand = stand
+        return aenderung
+
+    def beobachte(self, bei_aenderung: Callable[[dict], None], stop: threading.Event,
+                  intervall: float = BEOBACHTUNG_INTERVALL, ruhezeit: float = BEOBACHTUNG_RUHEZEIT):
+        """Prueft die Quellen bis stop gesetzt ist und ruft bei_aenderung(delta) nach jeder Aenderung auf."""
+        stand = self.quellen()
+        while not stop.wait(intervall):
+            neu = self.quellen()
+            if neu == stand:
+                continue
+            # Warten, bis die Dateien nicht mehr geschrieben werden
+            while not stop.wait(ruhezeit):
+                danach = self.quellen()
+                if danach == neu:
+                    break
+                neu = danach
+            geaendert = {p for p in stand.keys() | neu.keys() if stand.get(p) != neu.get(p)}
+            stand = neu
+
+            t0 = time.perf_counter()
+            try:
+                aenderung = self.aktualisieren(geaendert)
+            except Exception as e:
+                print(f"  FEHLER bei der Aktualisierung: {type(e).__name__}: {e}")
+                continue
+            namen = ", ".join(sorted(p.name for p in geaendert))
+            if aenderung is None:
+                print(f"  {namen}: keine Aenderung im Dashboard")
+                continue
+            print(f"  {namen}: {len(aenderung['projekte'])} Projekte geaendert, "
+                  f"{len(aenderung['entfernt'])} entfernt ({time.perf_counter() - t0:.2f} s)")
+            bei_aenderung(aenderung)
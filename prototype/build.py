@@ -0,0 +1,136 @@
+"""
+build.py — Abhaengigkeiten und Build-Status fuer inkrementelle Pipeline-Laeufe.
+
+Jede Ausgabe (konsolidierte Daten, einzelnes Chart, einzelner Bericht) ist ein Ziel.
+Fuer jedes Ziel wird eine Signatur aus den Hashes seiner Eingaben gebildet:
+Quelldateien, Code der erzeugenden Module, verwendete Spalten des DataFrames und
+bei Berichten die eingebundenen Chart-PNGs. Stimmt die Signatur mit dem letzten
+erfolgreichen Lauf ueberein und existieren alle Ausgabedateien, wird das Ziel
+uebersprungen.
+
+Der Status liegt als JSON in BUILD_STATE_FILE und kann jederzeit geloescht werden
+(naechster Lauf = Vollbuild).
+"""
+
+import ast
+import json
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from config import BUILD_STATE_FILE
+
+PROTOTYPE_DIR = Path(__file__).resolve().parent
+
+
+# =============================================================================
+# Hashes
+# =============================================================================
+
+def datei_hash(pfad: Path) -> str:
+    """SHA-256 ueber den Dateiinhalt, 'fehlt' fuer nicht vorhandene Dateien."""
+    pfad = Path(pfad)
+    if not pfad.exists():
+        return "fehlt"
+    h = hashlib.sha256()
+    with open(pfad, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _lokale_importe(modul: str) -> frozenset[str]:
+    """Module im Prototyp-Ordner, die modul importiert (import, from ... import und
+    importlib.import_module("...") mit festem Namen, auch innerhalb von Funktionen)."""
+    pfad = PROTOTYPE_DIR / f"{modul}.py"
+    if not pfad.exists():
+        return frozenset()
+    namen = set()
+    for knoten in ast.walk(ast.parse(pfad.read_text(encoding="utf-8"))):
+        if isinstance(knoten, ast.Import):
+            namen.update(a.name.split(".")[0] for a in knoten.names)
+        elif isinstance(knoten, ast.ImportFrom) and knoten.module and not knoten.level:
+            namen.add(knoten.module.split(".")[0])
+        elif (isinstance(knoten, ast.Call) and isinstance(knoten.func, ast.Attribute)
+              and knoten.func.attr == "import_module" and knoten.args
+              and isinstance(knoten.args[0], ast.Constant) and isinstance(knoten.args[0].value, str)):
+            namen.add(knoten.args[0].value)
+    return frozenset(n for n in namen if (PROTOTYPE_DIR / f"{n}.py").exists())
+
+
+def abhaengigkeiten(*module: str) -> list[str]:
+    """Die angegebenen Module und alle direkt oder indirekt von ihnen importierten Prototyp-Module."""
+    gefunden, offen = set(), list(module)
+    while offen:
+        m = offen.pop()
+        if m not in gefunden:
+            gefunden.add(m)
+            offen.extend(_lokale_importe(m))
+    return sorted(gefunden)
+
+
+def code_hash(*module: str) -> str:
+    """Hash ueber die Quelltexte der angegebenen Module und aller von ihnen importierten
+    Module im Prototyp-Ordner (siehe abhaengigkeiten())."""
+    return hashlib.sha256("".join(f"{m}:{datei_hash(PROTOTYPE_DIR / f'{m}.py')}" for m in abhaengigkeiten(*module))
+                          .encode("utf-8")).hexdigest()
+
+
+def daten_hash(df: pd.DataFrame, spalten: list[str]) -> str:
+    """Hash ueber Inhalt und Reihenfolge der angegebenen Spalten (fehlende Spalten zaehlen mit)."""
+    vorhanden = [s for s in spalten if s in df.columns]
+    h = hashlib.sha256(repr(sorted(set(spalten) - set(vorhanden))).encode("utf-8"))
+    h.update(repr(vorhanden).encode("utf-8"))
+    if vorhanden:
+        h.update(pd.util.hash_pandas_object(df[vorhanden], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def signatur(eingaben: dict[str, str]) -> str:
+    """Eine Signatur pro Ziel aus den einzelnen Eingabe-Hashes."""
+    return hashlib.sha256(json.dumps(eingaben, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Build-Status
+# =============================================================================
+
+class BuildStatus:
+    """Signatur des letzten erfolgreichen Laufs je Ziel (persistent als JSON)."""
+
+    def __init__(self, pfad: Path = BUILD_STATE_FILE, voll: bool = False):
+        self.pfad = Path(pfad)
+        self.voll = voll
+        self.ziele = {}
+        self.gebaut = []
+        self.uebersprungen = []
+        if self.pfad.exists():
+            try:
+                self.ziele = json.loads(self.pfad.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                print(f"  Build-Status unlesbar, Vollbuild: {self.pfad.name}")
+
+    def aktuell(self, ziel: str, sig: str, ausgaben: list[Path]) -> bool:
+        """True, wenn das Ziel mit dieser Signatur bereits gebaut wurde und alle Ausgaben existieren."""
+        ok = (not self.voll and self.ziele.get(ziel) == sig
+              and all(Path(p).exists() for p in ausgaben))
+        if ok:
+            self.uebersprungen.append(ziel)
+        return ok
+
+    def erledigt(self, ziel: str, sig: str):
+        self.ziele[ziel] = sig
+        self.gebaut.append(ziel)
+
+    def vergessen(self, ziel: str):
+        """Ziel beim naechsten Lauf in jedem Fall neu bauen (z.B. nach einem Fehler)."""
+        self.ziele.pop(ziel, None)
+
+    def sichern(self):
+        self.pfad.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.pfad.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.ziele, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.pfad)
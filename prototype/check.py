@@ -4,48 +4,38 @@ check.py — Verifikation der konsolidierten Daten gegen Quelldateien und Regeln
 Ausfuehrung: python check.py
 Voraussetzung: python 01_konsolidierung.py muss vorher gelaufen sein.
 
-Prueft 6 Kategorien:
+Prueft 7 Kategorien:
   1. Quelldaten-Abgleich (bekannte Sollwerte pro PSB)
   2. Normalisierung (Ampel, PAG, Phase)
   3. Datumsfelder (kein Jahr < 2000, keine Platzhalter)
-  4. Budget/SAP (keine negativen Betraege, keine Division by Zero)
+  4. Budget/SAP (keine negativen Betraege, keine Division by Zero, SAP-Zuordnung wie bisher)
   5. Vollstaendigkeit (Pflichtfelder, Projekt-Anzahl)
-  6. Validierungsspalte (_validierung vorhanden)
+  6. Validierungsspalte (_validierung vorhanden, keine verworfenen Werte)
+  7. Werktage (dauer_werktage und networkdays gegen tageweise Referenzzaehlung)
 """
 
 import sys
+import random
+import importlib
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
-import openpyxl
 import pandas as pd
 
 from config import (
-    OUTPUT_REVIEW, PSB_DIR, ERWARTETE_WERTE,
-    AMPEL_NORM, PAG_NORM, PHASE_NORM,
+    KONSOLIDIERT_XLSX, KONSOLIDIERT_PARQUET, PSB_DIR, SAP_FILE, ERWARTETE_WERTE,
+    AMPEL_NORM, PAG_NORM, PHASE_NORM, FEIERTAGE, feiertage, ist_feiertag,
 )
 
+from datenbasis import lade_konsolidiert
 
-def lade_konsolidiert(pfad: Path) -> pd.DataFrame:
-    """Liest konsolidiert.xlsx als DataFrame."""
-    wb = openpyxl.load_workbook(pfad, data_only=True)
-    ws = wb["Konsolidiert"]
+konsolidierung = importlib.import_module("01_konsolidierung")
 
-    headers = []
-    for col in range(1, ws.max_column + 1):
-        val = ws.cell(row=1, column=col).value
-        headers.append(str(val).strip() if val else f"col_{col}")
 
-    rows = []
-    for row in range(2, ws.max_row + 1):
-        vals = {}
-        for col_idx, header in enumerate(headers, 1):
-            vals[header] = ws.cell(row=row, column=col_idx).value
-        if vals.get("lv_nummer") or vals.get("projektname"):
-            rows.append(vals)
-
-    wb.close()
-    return pd.DataFrame(rows)
+def als_pruefdaten(df: pd.DataFrame) -> pd.DataFrame:
+    """Fehlende Werte als None wie in den Quelldateien, damit die Checks einheitlich greifen."""
+    df = df.astype(object)
+    return df.where(df.notna(), None)
 
 
 class Verifikation:
@@ -87,7 +77,7 @@ def pruefe_quelldaten(df: pd.DataFrame, v: Verifikation):
         zeile = df[df["lv_nummer"] == lv_nr]
 
         if zeile.empty:
-            v.check(False, f"{lv_nr}: Nicht im konsolidierten Excel gefunden")
+            v.check(False, f"{lv_nr}: Nicht in den konsolidierten Daten gefunden")
             continue
 
         row = zeile.iloc[0]
@@ -176,6 +166,11 @@ def pruefe_datumsfelder(df: pd.DataFrame, v: Verifikation):
             if isinstance(val, str) and "TT.MM" in val:
                 platzhalter_fehler.append(f"{lv}/{spalte}: {val}")
 
+    # Nach typisiere() sind Platzhalter leer, der Originalwert steht in _validierung
+    for idx, val in df.get("_validierung", pd.Series(dtype=object)).items():
+        if isinstance(val, str) and "TT.MM" in val:
+            platzhalter_fehler.append(f"{df.at[idx, 'lv_nummer']}: {val}")
+
     v.check(len(jahr_fehler) == 0,
             f"Keine Datumswerte mit Jahr < 2000" +
             (f" (gefunden: {jahr_fehler})" if jahr_fehler else ""))
@@ -248,6 +243,14 @@ def pruefe_budget(df: pd.DataFrame, v: Verifikation):
             f"plankosten_gesamt = Summe Jahreswerte" +
             (f" (Abweichungen: {summen_fehler})" if summen_fehler else ""))
 
+    # SAP-Zeilen, die nach der frueheren Regel startswith(lv_nr) zugeordnet waren und nicht mehr
+    if SAP_FILE.exists():
+        geaendert = konsolidierung.sap_zuordnung_geaendert(df["lv_nummer"], konsolidierung.read_sap())
+        v.check(len(geaendert) == 0,
+                f"SAP-Zuordnung unveraendert gegenueber startswith(lv_nr)" +
+                (f" (geaendert: {[f'{lv}: {alt} -> {neu}' for lv, alt, neu in geaendert]})"
+                 if geaendert else ""))
+
 
 def pruefe_vollstaendigkeit(df: pd.DataFrame, v: Verifikation):
     """Kategorie 5: Prueft Pflichtfelder und Projektanzahl."""
@@ -284,22 +287,78 @@ def pruefe_validierung(df: pd.DataFrame, v: Verifikation):
     v.check("_validierung" in df.columns,
             f"Spalte '_validierung' vorhanden")
 
+    # Von datenbasis.typisiere() verworfene, nicht parsebare Werte
+    verworfen = [f"{df.at[idx, 'lv_nummer']}: {val}"
+                 for idx, val in df.get("_validierung", pd.Series(dtype=object)).items()
+                 if isinstance(val, str) and " verworfen: " in val]
+    v.check(len(verworfen) == 0,
+            f"Keine beim Typisieren verworfenen Werte" +
+            (f" (gefunden: {verworfen})" if verworfen else ""))
+
+
+def _werktage_referenz(start: date, ende: date) -> int:
+    """Zaehlt Werktage Tag fuer Tag (Definition von NETWORKDAYS, ohne Optimierung)."""
+    anzahl = 0
+    tag = start
+    while tag <= ende:
+        if tag.weekday() < 5 and not ist_feiertag(tag):
+            anzahl += 1
+        tag += timedelta(days=1)
+    return anzahl
+
+
+def pruefe_werktage(df: pd.DataFrame, v: Verifikation):
+    """Kategorie 7: Prueft die Werktagsberechnung gegen eine tageweise Referenzzaehlung."""
+    v.abschnitt("Werktage")
+
+    # dauer_werktage in den konsolidierten Daten
+    abweichungen = []
+    for _, row in df.iterrows():
+        start, ende = row.get("start"), row.get("ende")
+        if not isinstance(start, date) or not isinstance(ende, date):
+            continue
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(ende, datetime):
+            ende = ende.date()
+        soll = _werktage_referenz(start, ende)
+        if row.get("dauer_werktage") != soll:
+            abweichungen.append(f"{row.get('lv_nummer')}: {row.get('dauer_werktage')} != {soll}")
+    v.check(len(abweichungen) == 0,
+            f"dauer_werktage = Referenzzaehlung" +
+            (f" (Abweichungen: {abweichungen})" if abweichungen else ""))
+
+    # Feiertagsberechnung: bekannte Ostertermine und 13 Feiertage pro Jahr
+    ostermontage = {2025: date(2025, 4, 21), 2026: date(2026, 4, 6), 2027: date(2027, 3, 29),
+                    2028: date(2028, 4, 17), 2029: date(2029, 4, 2), 2030: date(2030, 4, 22)}
+    falsch = [j for j, tag in ostermontage.items() if tag not in feiertage(j) or len(feiertage(j)) != 13]
+    v.check(len(falsch) == 0,
+            f"Feiertage 2025-2030 berechnet (Ostermontag, 13 pro Jahr)" +
+            (f" (falsch: {falsch})" if falsch else ""))
+
+    # Zufaellige Datumspaare bis in die naechste LV-Periode (fester Seed):
+    # skalar, vektorisiert und Referenz stimmen ueberein
+    rnd = random.Random(20260310)
+    basis = min(FEIERTAGE)
+    spanne = (date(2030, 12, 31) - basis).days
+    paare = []
+    for _ in range(500):
+        start = basis + timedelta(days=rnd.randint(-30, spanne))
+        paare.append((start, start + timedelta(days=rnd.randint(-10, 400))))
+    vektor = konsolidierung.networkdays_vektor(
+        pd.Series([p[0] for p in paare]), pd.Series([p[1] for p in paare])).tolist()
+    fehler = [
+        f"{s}..{e}" for (s, e), vek in zip(paare, vektor)
+        if not (konsolidierung.networkdays(s, e) == vek == _werktage_referenz(s, e))
+    ]
+    v.check(len(fehler) == 0,
+            f"networkdays = Referenzzaehlung fuer {len(paare)} zufaellige Datumspaare" +
+            (f" (Abweichungen: {fehler[:5]})" if fehler else ""))
 
-def main():
-    konsolidiert_pfad = OUTPUT_REVIEW / "konsolidiert.xlsx"
-
-    print(f"{'='*60}")
-    print(f"  Verifikation: {konsolidiert_pfad.name}")
-    print(f"{'='*60}")
-
-    if not konsolidiert_pfad.exists():
-        print(f"\n  FEHLER: {konsolidiert_pfad} nicht gefunden.")
-        print(f"  Bitte zuerst: python 01_konsolidierung.py")
-        sys.exit(1)
-
-    df = lade_konsolidiert(konsolidiert_pfad)
-    print(f"\n  {len(df)} Projekte geladen.\n")
 
+def pruefe_alles(df: pd.DataFrame) -> int:
+    """Fuehrt alle Pruefkategorien aus und gibt die Anzahl Fehler zurueck."""
+    df = als_pruefdaten(df)
     v = Verifikation()
 
     pruefe_quelldaten(df, v)
@@ -308,8 +367,25 @@ def main():
     pruefe_budget(df, v)
     pruefe_vollstaendigkeit(df, v)
     pruefe_validierung(df, v)
+    pruefe_werktage(df, v)
+
+    return v.zusammenfassung()
+
+
+def main():
+    print(f"{'='*60}")
+    print(f"  Verifikation: {KONSOLIDIERT_PARQUET.name} / {KONSOLIDIERT_XLSX.name}")
+    print(f"{'='*60}")
+
+    if not KONSOLIDIERT_PARQUET.exists() and not KONSOLIDIERT_XLSX.exists():
+        print(f"\n  FEHLER: {KONSOLIDIERT_XLSX} nicht gefunden.")
+        print(f"  Bitte zuerst: python 01_konsolidierung.py")
+        sys.exit(1)
+
+    df = lade_konsolidiert()
+    print(f"\n  {len(df)} Projekte geladen.\n")
 
-    n_fehler = v.zusammenfassung()
+    n_fehler = pruefe_alles(df)
     sys.exit(1 if n_fehler > 0 else 0)
 
 
@@ -4,7 +4,8 @@ Pfade, Normalisierungs-Mappings, Feiertage, Spaltendefinitionen.
 """
 
 from pathlib import Path
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 
 # --- Pfade ---
 
@@ -20,6 +21,57 @@ PPTX_TEMPLATE = QUELLDATEN / "berichte" / "Projektportfolio_LV-Vorhaben25-27_Q42
 OUTPUT_REVIEW = OUTPUT / "review"
 OUTPUT_CHARTS = OUTPUT / "charts"
 OUTPUT_REPORTS = OUTPUT / "reports"
+OUTPUT_CACHE = OUTPUT / "cache"
+OUTPUT_STECKBRIEFE = OUTPUT_REPORTS / "steckbriefe"
+
+# Konsolidierte Daten: Excel fuer die manuelle Durchsicht, Parquet als typisierte Uebergabe
+KONSOLIDIERT_XLSX = OUTPUT_REVIEW / "konsolidiert.xlsx"
+KONSOLIDIERT_PARQUET = OUTPUT_REVIEW / "konsolidiert.parquet"
+# Meilensteine aller PSBs (eine Zeile pro Meilenstein, fuer die Gantt-Zeitleiste)
+MEILENSTEINE_PARQUET = OUTPUT_REVIEW / "meilensteine.parquet"
+# HTML-Dashboard: kompaktes JSON + Detaildateien je Projekt (docs/details/), siehe dashboarddaten.py
+DOCS_DIR = BASE_DIR / "docs"
+DASHBOARD_JSON = DOCS_DIR / "consolidated.json"
+
+# --- Einlesen ---
+
+# Anzahl Worker-Prozesse fuer das Einlesen der PSBs (1 = seriell)
+PSB_WORKERS = 1
+
+# Cache fuer eingelesene PSBs (Schluessel: Datei-Hash + Zellmapping)
+PSB_CACHE_AKTIV = True
+PSB_CACHE_FILE = OUTPUT_CACHE / "psb_cache.pkl"
+PSB_CACHE_MAX_EINTRAEGE = 2000
+
+# Anzahl Worker-Prozesse fuer das Rendern der Charts (1 = seriell, lohnt nur bei mehreren CPU-Kernen)
+CHART_WORKERS = 1
+# Anzahl Worker-Prozesse fuer die Projekt-Steckbriefe (04_steckbriefe.py, ein One-Pager pro PSB)
+STECKBRIEF_WORKERS = 1
+
+# Zusaetzliche Vektorformate fuer alle Charts ("svg", "pdf"); PNG wird immer geschrieben
+CHART_FORMATE = []
+# Bildformat der Charts im PPTX: "png", "svg" (Vektor; das PNG wird als Fallback fuer
+# PowerPoint-Versionen ohne SVG-Unterstuetzung mit eingebettet, erfordert "svg" in CHART_FORMATE)
+# oder "nativ" (editierbare PowerPoint-Diagramme direkt aus den Daten, ohne output/charts/)
+PPTX_BILDFORMAT = "png"
+# Statusbericht-Tabelle im PPTX: Projekte pro Folie (weitere Folien werden aus der ersten kopiert)
+PPTX_STATUS_ZEILEN = 12
+
+# Gantt-Zeitleiste: Projekte pro PNG (weitere Seiten als gantt_zeitleiste_2.png, ...)
+# und Meilensteine aus den PSBs als Rauten einzeichnen
+GANTT_ZEILEN_PRO_SEITE = 40
+GANTT_MEILENSTEINE = True
+
+# Build-Status fuer pipeline.py (Eingabe-Hashes je Ausgabe, siehe build.py)
+BUILD_STATE_FILE = OUTPUT_CACHE / "build_state.json"
+
+# Folienplan der PPTX-Vorlage (Chart-Plaetze, Abschnitte, Quartals-Tokens), gueltig fuer einen Vorlagen-Hash
+PPTX_FOLIENPLAN = OUTPUT_CACHE / "pptx_folienplan.json"
+
+# Beobachtungsmodus (start_dashboard.py --beobachten): Abfrageintervall der Quelldateien und
+# Wartezeit, bis eine geaenderte Datei fertig gespeichert ist (beide in Sekunden)
+BEOBACHTUNG_INTERVALL = 1.0
+BEOBACHTUNG_RUHEZEIT = 0.5
 
 # --- Aktuelles Quartal ---
 
@@ -155,49 +207,57 @@ DASHBOARD_COLS = {
     42: "entscheidung_vorperiode",
 }
 
-# --- Oesterreichische Feiertage 2025-2027 ---
-
-FEIERTAGE = [
-    date(2025, 1, 1),   # Neujahr
-    date(2025, 1, 6),   # Heilige Drei Koenige
-    date(2025, 4, 21),  # Ostermontag
-    date(2025, 5, 1),   # Staatsfeiertag
-    date(2025, 5, 29),  # Christi Himmelfahrt
-    date(2025, 6, 9),   # Pfingstmontag
-    date(2025, 6, 19),  # Fronleichnam
-    date(2025, 8, 15),  # Maria Himmelfahrt
-    date(2025, 10, 26), # Nationalfeiertag
-    date(2025, 11, 1),  # Allerheiligen
-    date(2025, 12, 8),  # Maria Empfaengnis
-    date(2025, 12, 25), # Christtag
-    date(2025, 12, 26), # Stefanitag
-    date(2026, 1, 1),   # Neujahr
-    date(2026, 1, 6),   # Heilige Drei Koenige
-    date(2026, 4, 6),   # Ostermontag
-    date(2026, 5, 1),   # Staatsfeiertag
-    date(2026, 5, 14),  # Christi Himmelfahrt
-    date(2026, 5, 25),  # Pfingstmontag
-    date(2026, 6, 4),   # Fronleichnam
-    date(2026, 8, 15),  # Maria Himmelfahrt
-    date(2026, 10, 26), # Nationalfeiertag
-    date(2026, 11, 1),  # Allerheiligen
-    date(2026, 12, 8),  # Maria Empfaengnis
-    date(2026, 12, 25), # Christtag
-    date(2026, 12, 26), # Stefanitag
-    date(2027, 1, 1),   # Neujahr
-    date(2027, 1, 6),   # Heilige Drei Koenige
-    date(2027, 3, 29),  # Ostermontag
-    date(2027, 5, 1),   # Staatsfeiertag
-    date(2027, 5, 6),   # Christi Himmelfahrt
-    date(2027, 5, 17),  # Pfingstmontag
-    date(2027, 5, 27),  # Fronleichnam
-    date(2027, 8, 15),  # Maria Himmelfahrt
-    date(2027, 10, 26), # Nationalfeiertag
-    date(2027, 11, 1),  # Allerheiligen
-    date(2027, 12, 8),  # Maria Empfaengnis
-    date(2027, 12, 25), # Christtag
-    date(2027, 12, 26), # Stefanitag
-]
+# --- Oesterreichische Feiertage ---
+
+def _ostersonntag(jahr: int) -> date:
+    """Ostersonntag nach dem gregorianischen Kalender (anonymer Algorithmus nach Gauss)."""
+    a = jahr % 19
+    b, c = divmod(jahr, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    monat, tag = divmod(h + l - 7 * m + 114, 31)
+    return date(jahr, monat, tag + 1)
+
+
+@lru_cache(maxsize=None)
+def feiertage(jahr: int) -> tuple[date, ...]:
+    """Gesetzliche Feiertage in Oesterreich fuer ein Jahr, sortiert (pro Jahr nur einmal berechnet)."""
+    ostern = _ostersonntag(jahr)
+    return tuple(sorted([
+        date(jahr, 1, 1),                 # Neujahr
+        date(jahr, 1, 6),                 # Heilige Drei Koenige
+        ostern + timedelta(days=1),       # Ostermontag
+        date(jahr, 5, 1),                 # Staatsfeiertag
+        ostern + timedelta(days=39),      # Christi Himmelfahrt
+        ostern + timedelta(days=50),      # Pfingstmontag
+        ostern + timedelta(days=60),      # Fronleichnam
+        date(jahr, 8, 15),                # Maria Himmelfahrt
+        date(jahr, 10, 26),               # Nationalfeiertag
+        date(jahr, 11, 1),                # Allerheiligen
+        date(jahr, 12, 8),                # Maria Empfaengnis
+        date(jahr, 12, 25),               # Christtag
+        date(jahr, 12, 26),               # Stefanitag
+    ]))
+
+
+@lru_cache(maxsize=None)
+def _feiertage_set(jahr: int) -> frozenset[date]:
+    return frozenset(feiertage(jahr))
+
+
+def ist_feiertag(tag: date) -> bool:
+    """Prueft in O(1), ob ein Tag ein gesetzlicher Feiertag ist."""
+    return tag in _feiertage_set(tag.year)
+
+
+# Feiertage der aktuellen LV-Periode (weitere Jahre berechnet networkdays() bei Bedarf)
+LV_JAHRE = range(2025, 2028)
+FEIERTAGE = [tag for jahr in LV_JAHRE for tag in feiertage(jahr)]
 
 # --- Ampelfarben (fuer Charts und Formatierung) ---
 
@@ -252,3 +312,10 @@ ERWARTETE_WERTE = {
         "projektname": "Neubau Elefantenhaus",
     },
 }
+
+
+# --- PSB-Dateien ---
+
+def psb_dateien() -> list[Path]:
+    """Alle PSB-Dateien im PSB_DIR, sortiert nach Dateiname (ohne Excel-Lockfiles)."""
+    return [f for f in sorted(PSB_DIR.glob("PSB_*.xlsx")) if not f.name.startswith("~$")]
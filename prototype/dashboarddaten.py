@@ -0,0 +1,261 @@
+"""
+dashboarddaten.py — Kompaktes Datenformat fuer das HTML-Dashboard (docs/).
+
+docs/consolidated.json enthaelt nur, was der erste Bildschirm braucht:
+  - spalten:     je Feld ein Array ueber alle Projekte statt ein Objekt je Projekt
+  - kategorien:  Wertelisten fuer Ampel, PAG, Phase, Leistungsbereich und Risiko; die
+                 zugehoerige Spalte enthaelt nur den Index in die Liste (null = leer)
+  - aggregate:   KPIs, Budget je Jahr und Verteilungen ueber alle Projekte, damit app.js
+                 beim Laden (ohne Filter) nichts nachrechnen muss
+  - detail:      Name der Detaildatei je Projekt
+Langtexte (Kurzbeschreibung, Meilensteine, Status, Risiken, Entscheidungen, Ziele) und die
+im Dashboard nicht angezeigten Stammdaten stehen je Projekt in docs/details/<lv_nummer>.json
+und werden erst im Detail-Dialog geladen. Ohne Einrueckung geschrieben.
+
+Festes Schema: Das DataFrame wird mit datenbasis.typisiere() auf SPALTEN gebracht, jede
+Listen-Spalte ist immer vorhanden (ggf. nur null), leere Texte werden null, Datumswerte
+ISO-Text, Zahlen float bzw. int (dauer_werktage). meta.format ist die Version dieses Formats,
+meta.schema die von datenbasis.SCHEMA_VERSION; app.js lehnt andere Formate ab.
+
+Erzeugt von der Pipeline-Stufe "dashboard" direkt aus dem konsolidierten DataFrame;
+start_dashboard.py erzeugt die Datei nur neu, wenn konsolidiert.parquet/.xlsx neuer ist
+(siehe ist_aktuell()). Im Beobachtungsmodus (beobachtung.py) schreibt der Server die Datei
+nach jeder Quelldatei-Aenderung neu und schickt den offenen Dashboards nur delta(); diese
+Datei (meta.quelle = LIVE_QUELLE) gilt danach als veraltet und wird beim naechsten Start ohne
+--beobachten bzw. von der Pipeline aus den konsolidierten Daten neu erzeugt.
+"""
+
+import re
+import json
+from datetime import datetime, date
+from pathlib import Path
+
+import pandas as pd
+
+from datenbasis import SCHEMA_VERSION, SPALTEN, export_spalten, typisiere
+
+FORMAT_VERSION = 2
+
+# Felder fuer Kacheln, Filter, KPIs, Charts, Budget-Tabelle und den Kopf des Detail-Dialogs
+LISTEN_SPALTEN = [
+    "lv_nummer", "projektname", "leistungsbereich", "kapitelzuordnung", "pag", "projektleitung",
+    "projektphase", "ampelstatus", "risiko", "fertigstellungsgrad", "start", "ende", "dauer_werktage",
+    "plankosten_2025", "plankosten_2026", "plankosten_2027", "plankosten_gesamt",
+    "istkosten_2025", "istkosten_2026", "istkosten_2027", "istkosten_gesamt", "istkosten_prozent",
+    "_validierung",
+]
+KATEGORIE_SPALTEN = ["ampelstatus", "pag", "projektphase", "leistungsbereich", "risiko"]
+
+JAHRE = ["2025", "2026", "2027"]
+AMPEL_REIHENFOLGE = ["In Ordnung", "Vorsicht", "Krise"]
+DETAIL_VERZEICHNIS = "details"
+# meta.quelle der im Beobachtungsmodus direkt aus den Quelldaten geschriebenen Datei (ohne die
+# manuellen Korrekturen aus konsolidiert.xlsx); gilt fuer Pipeline und start_dashboard.py als veraltet
+LIVE_QUELLE = "Quelldaten (live)"
+
+
+def _wert(val):
+    if isinstance(val, (datetime, date)):
+        return val.isoformat()
+    return val
+
+
+def _liste(serie: pd.Series) -> list:
+    """Spalte als JSON-Liste: fehlende Werte und leere Texte als None, Datumswerte als ISO-Text."""
+    werte = serie.astype(object).where(serie.notna(), None).tolist()
+    return [None if v == "" else _wert(v) for v in werte]
+
+
+def detail_name(lv_nummer: str, vergeben: set[str]) -> str:
+    """Dateiname der Detaildatei: LV-Nummer ohne Sonderzeichen, bei Kollision mit Zaehler."""
+    basis = re.sub(r"[^A-Za-z0-9._-]", "_", str(lv_nummer or "projekt")).strip(".") or "projekt"
+    name, i = basis, 2
+    while name in vergeben:
+        name, i = f"{basis}_{i}", i + 1
+    vergeben.add(name)
+    return f"{name}.json"
+
+
+def leistungsbereich(lv_nummer) -> str:
+    """Buchstabe A-D am Anfang der LV-Nummer (wie getLeistungsbereich() in app.js)."""
+    m = re.match(r"[A-D]", str(lv_nummer or ""))
+    return m.group(0) if m else ""
+
+
+def aggregate(df: pd.DataFrame) -> dict:
+    """KPIs und Verteilungen in denselben Definitionen wie computeAggregates() in app.js."""
+    df = df.reindex(columns=LISTEN_SPALTEN)
+
+    def summe(teil: pd.DataFrame, spalte: str) -> float:
+        return float(pd.to_numeric(teil[spalte], errors="coerce").fillna(0).sum())
+
+    mit_budget = df[pd.to_numeric(df["plankosten_gesamt"], errors="coerce").fillna(0) > 0]
+    validierung = df["_validierung"].astype(object)
+    # Reihenfolge des ersten Auftretens, wie Object.keys() in app.js
+    bereiche, phasen = {}, {}
+    for lv, phase in zip(df["lv_nummer"], df["projektphase"]):
+        lb = leistungsbereich(lv)
+        if lb:
+            bereiche[lb] = bereiche.get(lb, 0) + 1
+        if isinstance(phase, str) and phase:
+            phasen[phase] = phasen.get(phase, 0) + 1
+
+    return {
+        "anzahl": len(df),
+        "ampel": {a: int((df["ampelstatus"] == a).sum()) for a in AMPEL_REIHENFOLGE},
+        "plan_gesamt": summe(df, "plankosten_gesamt"),
+        "ist_gesamt": summe(df, "istkosten_gesamt"),
+        "validierung": int((validierung.notna() & ~validierung.isin(["", "OK"])).sum()),
+        "plan_je_jahr": [summe(mit_budget, f"plankosten_{j}") for j in JAHRE],
+        "ist_je_jahr": [summe(mit_budget, f"istkosten_{j}") for j in JAHRE],
+        "leistungsbereich": dict(sorted(bereiche.items())),
+        "phase": phasen,
+    }
+
+
+def kompakt(df: pd.DataFrame, quelle: str) -> tuple[dict, dict[str, dict]]:
+    """(consolidated.json, {Dateiname: Detaildaten}) aus dem konsolidierten DataFrame."""
+    df = typisiere(df.reindex(columns=[*SPALTEN, *(c for c in df.columns if c not in SPALTEN)]))
+    df = df[export_spalten(df)]
+    lv, name = df["lv_nummer"], df["projektname"]
+    df = df[(lv.notna() & (lv != "")) | (name.notna() & (name != ""))].reset_index(drop=True)
+
+    spalten, kategorien = {}, {}
+    for spalte in LISTEN_SPALTEN:
+        if spalte in KATEGORIE_SPALTEN:
+            werte = df[spalte].astype(object).where(df[spalte].notna() & (df[spalte] != ""), None)
+            codes, liste = pd.factorize(werte, sort=True)
+            kategorien[spalte] = [str(w) for w in liste]
+            spalten[spalte] = [int(c) if c >= 0 else None for c in codes]
+        else:
+            spalten[spalte] = _liste(df[spalte])
+
+    detail_spalten = [c for c in df.columns if c not in LISTEN_SPALTEN]
+    vergeben, namen, details = set(), [], {}
+    texte = {c: _liste(df[c]) for c in detail_spalten}
+    for i, lv_nummer in enumerate(spalten["lv_nummer"]):
+        datei = detail_name(lv_nummer, vergeben)
+        namen.append(datei)
+        details[datei] = {"lv_nummer": lv_nummer,
+                          **{c: texte[c][i] for c in detail_spalten if texte[c][i] is not None}}
+
+    daten = {
+        "meta": {
+            "format": FORMAT_VERSION,
+            "schema": SCHEMA_VERSION,
+            "generiert": datetime.now().isoformat(),
+            "anzahl_projekte": len(df),
+            "quelle": quelle,
+        },
+        "spalten": spalten,
+        "kategorien": kategorien,
+        "aggregate": aggregate(df),
+        "detail": namen,
+    }
+    return daten, details
+
+
+def _json(daten) -> bytes:
+    return json.dumps(daten, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _schreiben(pfad: Path, inhalt: bytes) -> bool:
+    """Schreibt nur bei geaendertem Inhalt (mtime und ETag unveraenderter Dateien bleiben)."""
+    try:
+        if pfad.read_bytes() == inhalt:
+            return False
+    except OSError:
+        pass
+    tmp = pfad.with_suffix(".tmp")
+    tmp.write_bytes(inhalt)
+    tmp.replace(pfad)
+    return True
+
+
+def _meta(ziel: Path) -> dict | None:
+    try:
+        return json.loads(Path(ziel).read_bytes()).get("meta", {})
+    except (OSError, ValueError):
+        return None
+
+
+def ist_live(ziel: Path) -> bool:
+    """True, wenn ziel zuletzt im Beobachtungsmodus geschrieben wurde (meta.quelle == LIVE_QUELLE)."""
+    meta = _meta(ziel)
+    return meta is not None and meta.get("quelle") == LIVE_QUELLE
+
+
+def ist_aktuell(ziel: Path, quellen: list[Path]) -> bool:
+    """True, wenn ziel im aktuellen Format vorliegt, nicht aus dem Beobachtungsmodus stammt
+    und neuer ist als alle vorhandenen Quellen."""
+    meta = _meta(ziel)
+    if meta is None or meta.get("format") != FORMAT_VERSION or meta.get("schema") != SCHEMA_VERSION:
+        return False
+    if meta.get("quelle") == LIVE_QUELLE:
+        return False
+    return all(Path(ziel).stat().st_mtime > q.stat().st_mtime for q in quellen if q.exists())
+
+
+def projekte(daten: dict) -> dict[str, dict]:
+    """Ein Objekt je Projekt (Schluessel: Detaildatei), Kategorien aufgeloest wie decodeProjects() in app.js."""
+    spalten, kategorien = daten["spalten"], daten["kategorien"]
+    ergebnis = {}
+    for i, name in enumerate(daten["detail"]):
+        projekt = {}
+        for spalte, werte in spalten.items():
+            wert = werte[i]
+            projekt[spalte] = kategorien[spalte][wert] if spalte in kategorien and wert is not None else wert
+        projekt["_detail"] = name
+        ergebnis[name] = projekt
+    return ergebnis
+
+
+def delta(alt: tuple[dict, dict], neu: tuple[dict, dict]) -> dict | None:
+    """
+    Aenderung zwischen zwei Staenden (daten, details) aus kompakt() fuer die Live-Aktualisierung.
+
+    projekte:    geaenderte und neue Projekte vollstaendig (wie decodeProjects() in app.js)
+    entfernt:    Detaildateien nicht mehr vorhandener Projekte
+    reihenfolge: Detaildateien aller Projekte in der neuen Reihenfolge (None, wenn unveraendert)
+    details:     Projekte, deren Detaildatei (Langtexte) sich geaendert hat
+    Dazu meta und aggregate des neuen Stands. None, wenn sich nichts geaendert hat.
+    """
+    (alt_daten, alt_details), (neu_daten, neu_details) = alt, neu
+    vorher, nachher = projekte(alt_daten), projekte(neu_daten)
+    geaendert = [p for name, p in nachher.items() if vorher.get(name) != p]
+    entfernt = [name for name in vorher if name not in nachher]
+    texte = [name for name, d in neu_details.items() if name in alt_details and alt_details[name] != d]
+    if not (geaendert or entfernt or texte) and alt_daten["detail"] == neu_daten["detail"]:
+        return None
+    return {
+        "format": FORMAT_VERSION,
+        "meta": neu_daten["meta"],
+        "aggregate": neu_daten["aggregate"],
+        "projekte": geaendert,
+        "entfernt": entfernt,
+        "reihenfolge": neu_daten["detail"] if neu_daten["detail"] != alt_daten["detail"] else None,
+        "details": texte,
+    }
+
+
+def schreibe_kompakt(daten: dict, details: dict[str, dict], ziel: Path) -> int:
+    """
+    Schreibt consolidated.json nach ziel und die Detaildateien nach ziel.parent/details/.
+    Detaildateien nicht mehr vorhandener Projekte werden entfernt. Gibt die Anzahl der
+    geaenderten Detaildateien zurueck.
+    """
+    verzeichnis = Path(ziel).parent / DETAIL_VERZEICHNIS
+    verzeichnis.mkdir(parents=True, exist_ok=True)
+    geaendert = sum(_schreiben(verzeichnis / name, _json(inhalt)) for name, inhalt in details.items())
+    for alt in verzeichnis.glob("*.json"):
+        if alt.name not in details:
+            alt.unlink()
+    _schreiben(Path(ziel), _json(daten))
+    return geaendert
+
+
+def schreibe_dashboard(df: pd.DataFrame, ziel: Path, quelle: str) -> dict:
+    """consolidated.json und Detaildateien aus dem konsolidierten DataFrame (siehe schreibe_kompakt())."""
+    daten, details = kompakt(df, quelle)
+    geaendert = schreibe_kompakt(daten, details, ziel)
+    return {"projekte": daten["meta"]["anzahl_projekte"], "details_geaendert": geaendert}
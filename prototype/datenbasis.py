@@ -0,0 +1,171 @@
+"""
+datenbasis.py — Typisierte Uebergabe der konsolidierten Daten zwischen den Stufen.
+
+01_konsolidierung.py schreibt neben konsolidiert.xlsx (fuer die manuelle Durchsicht)
+eine Parquet-Datei mit festem Schema (dazu meilensteine.parquet mit den Meilenstein-Terminen
+aller PSBs, siehe lade_meilensteine()). Alle weiteren Stufen laden ueber lade_konsolidiert():
+  - Standard ist die Parquet-Datei (Datentypen bleiben erhalten, schnell).
+  - Ist konsolidiert.xlsx neuer (manuell korrigiert) oder fehlt die Parquet-Datei bzw.
+    pyarrow, wird das Excel gelesen und auf dasselbe Schema gebracht.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from config import (
+    DASHBOARD_COLS, KONSOLIDIERT_XLSX, KONSOLIDIERT_PARQUET, MEILENSTEINE_PARQUET, QUARTAL,
+)
+
+SCHEMA_VERSION = "1"
+
+# Spaltentypen (alle nicht aufgefuehrten Spalten sind Text)
+DATUM_SPALTEN = ["start", "ende"]
+GANZZAHL_SPALTEN = ["dauer_werktage"]
+ZAHL_SPALTEN = [
+    "plankosten_2025", "plankosten_2026", "plankosten_2027", "plankosten_gesamt",
+    "istkosten_2025", "istkosten_2026", "istkosten_2027", "istkosten_gesamt",
+    "istkosten_prozent", "fertigstellungsgrad",
+]
+
+# Meilenstein-Tabelle (lange Form: eine Zeile pro Meilenstein)
+MEILENSTEIN_SPALTEN = ["lv_nummer", "bezeichnung", "plan_lv", "plan_aktuell", "ist"]
+MEILENSTEIN_DATUM_SPALTEN = ["plan_lv", "plan_aktuell", "ist"]
+
+# Spaltenreihenfolge: Dashboard-Spalten, danach interne Felder
+SPALTEN = [name for _, name in sorted(DASHBOARD_COLS.items())] + [
+    "_quelldatei", "_sap_zuordnung", "_validierung",
+]
+
+
+def export_spalten(df: pd.DataFrame) -> list[str]:
+    """Spalten fuer menschenlesbare Exporte: ohne interne Felder (ausser _validierung)."""
+    return [c for c in df.columns if not c.startswith("_") or c == "_validierung"]
+
+
+def _nicht_leer(serie: pd.Series) -> pd.Series:
+    return serie.notna() & (serie.astype("string").str.strip() != "")
+
+
+def typisiere(df: pd.DataFrame) -> pd.DataFrame:
+    """Bringt ein konsolidiertes DataFrame auf das feste Schema.
+
+    Nicht parsebare Datums- oder Zahlenwerte werden leer; der urspruengliche Wert wird in
+    _validierung vermerkt ("<Spalte> verworfen: <Wert>"), sofern er dort nicht schon steht.
+    """
+    df = df.copy()
+    verworfen: dict = {}
+    for c in df.columns:
+        roh = df[c]
+        if c in DATUM_SPALTEN:
+            df[c] = pd.to_datetime(roh, errors="coerce").astype("datetime64[ms]")
+        elif c in GANZZAHL_SPALTEN:
+            df[c] = pd.to_numeric(roh, errors="coerce").round().astype("Int64")
+        elif c in ZAHL_SPALTEN:
+            df[c] = pd.to_numeric(roh, errors="coerce").astype(float)
+        else:
+            df[c] = roh.astype("string")
+            continue
+        for idx, wert in roh[df[c].isna() & _nicht_leer(roh)].items():
+            verworfen.setdefault(idx, []).append(f"{c} verworfen: {wert}")
+    if verworfen:
+        validierung = df.get("_validierung", pd.Series(pd.NA, index=df.index, dtype="string")).copy()
+        for idx, hinweise in verworfen.items():
+            bisher = validierung[idx] if pd.notna(validierung[idx]) and validierung[idx] != "OK" else ""
+            neu = [h for h in hinweise if h.split(": ", 1)[1] not in bisher]
+            if neu:
+                validierung[idx] = "; ".join([bisher, *neu] if bisher else neu)
+        df["_validierung"] = validierung.astype("string")
+    bekannt = [c for c in SPALTEN if c in df.columns]
+    return df[bekannt + [c for c in df.columns if c not in bekannt]]
+
+
+def _arrow_schema(df: pd.DataFrame):
+    import pyarrow as pa
+    felder = []
+    for c in df.columns:
+        if c in DATUM_SPALTEN:
+            typ = pa.date32()
+        elif c in GANZZAHL_SPALTEN:
+            typ = pa.int32()
+        elif c in ZAHL_SPALTEN:
+            typ = pa.float64()
+        else:
+            typ = pa.string()
+        felder.append(pa.field(c, typ))
+    return pa.schema(felder, metadata={"schema_version": SCHEMA_VERSION, "quartal": QUARTAL})
+
+
+def schreibe_parquet(df: pd.DataFrame, pfad: Path = KONSOLIDIERT_PARQUET) -> bool:
+    """Schreibt das konsolidierte DataFrame als Parquet. False, wenn pyarrow fehlt."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("  Hinweis: pyarrow nicht installiert, keine Parquet-Datei (pip install pyarrow).")
+        return False
+    df = typisiere(df)
+    pfad.parent.mkdir(parents=True, exist_ok=True)
+    # Datumsspalten als date32 (ohne Uhrzeit) ablegen
+    daten = {c: (df[c].dt.date.where(df[c].notna(), None) if c in DATUM_SPALTEN else df[c]) for c in df.columns}
+    table = pa.Table.from_pandas(pd.DataFrame(daten), schema=_arrow_schema(df), preserve_index=False)
+    pq.write_table(table, pfad)
+    print(f"  Exportiert: {pfad}")
+    return True
+
+
+def lade_konsolidiert(parquet: Path = KONSOLIDIERT_PARQUET, xlsx: Path = KONSOLIDIERT_XLSX) -> pd.DataFrame:
+    """Laedt die konsolidierten Daten typisiert (siehe Modul-Docstring fuer die Quellwahl).
+    Der Name der tatsaechlich gelesenen Datei steht in df.attrs["quelle"]."""
+    if parquet.exists() and (not xlsx.exists() or parquet.stat().st_mtime >= xlsx.stat().st_mtime):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            pass
+        else:
+            df = typisiere(pq.read_table(parquet).to_pandas(date_as_object=False))
+            df.attrs["quelle"] = parquet.name
+            return df
+    if not xlsx.exists():
+        raise FileNotFoundError(f"Bitte zuerst 01_konsolidierung.py ausfuehren.\n  {xlsx}")
+    if parquet.exists():
+        print(f"  Hinweis: {xlsx.name} ist neuer als {parquet.name}, lade manuell korrigiertes Excel.")
+    df = typisiere(pd.read_excel(xlsx, sheet_name="Konsolidiert"))
+    df.attrs["quelle"] = xlsx.name
+    return df
+
+
+def schreibe_meilensteine(ms: pd.DataFrame, pfad: Path = MEILENSTEINE_PARQUET) -> bool:
+    """Schreibt die Meilenstein-Tabelle als Parquet. False, wenn pyarrow fehlt."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return False
+    schema = pa.schema([pa.field(c, pa.date32() if c in MEILENSTEIN_DATUM_SPALTEN else pa.string())
+                        for c in MEILENSTEIN_SPALTEN], metadata={"schema_version": SCHEMA_VERSION})
+    daten = {}
+    for c in MEILENSTEIN_SPALTEN:
+        if c in MEILENSTEIN_DATUM_SPALTEN:
+            werte = pd.to_datetime(ms[c], errors="coerce")
+            daten[c] = werte.dt.date.where(werte.notna(), None)
+        else:
+            daten[c] = ms[c].astype("string")
+    pfad.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(pd.DataFrame(daten), schema=schema, preserve_index=False), pfad)
+    print(f"  Exportiert: {pfad}")
+    return True
+
+
+def lade_meilensteine(pfad: Path = MEILENSTEINE_PARQUET) -> pd.DataFrame | None:
+    """Laedt die Meilenstein-Tabelle (Datumsspalten als datetime64). None, wenn sie fehlt."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    if not pfad.exists():
+        return None
+    ms = pq.read_table(pfad).to_pandas(date_as_object=False)
+    for c in MEILENSTEIN_DATUM_SPALTEN:
+        ms[c] = ms[c].astype("datetime64[ms]")
+    return ms
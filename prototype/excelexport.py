@@ -0,0 +1,170 @@
+"""
+excelexport.py — Schneller Excel-Export im write-only-Modus von openpyxl.
+
+Dashboard-Excel, LV-Monitoring (03_bericht.py) und konsolidiert.xlsx (01_konsolidierung.py)
+werden ueber schreibe_tabelle() erzeugt:
+  - Alle Formate (Schrift, Rahmen, Fuellung, Ausrichtung, Zahlenformat) sind einmal als
+    benannte Formatvorlagen registriert; eine Zelle verweist nur noch auf ihre Vorlage,
+    statt je Zelle neue Font-/Border-Objekte zu erzeugen.
+  - Jede Spalte bekommt ihre Vorlage vorab zugeordnet; nur Ampel- und Prozentspalten
+    entscheiden noch je Wert (siehe ampel() und prozent()).
+  - Die Zeilen werden direkt in die Datei geschrieben (Workbook(write_only=True)), es
+    entsteht kein Zellenmodell im Speicher. Spaltenbreiten und Fixierung werden deshalb
+    vor der ersten Zeile gesetzt; Autofilter, Tabelle und verbundene Titelzellen stehen
+    am Ende des Blatts und folgen nach der letzten Zeile.
+"""
+
+import warnings
+from copy import copy
+from pathlib import Path
+from typing import Callable, Iterable
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.styles import NamedStyle, PatternFill, Font, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+
+AMPEL_FUELLUNG = {"In Ordnung": "C6EFCE", "Vorsicht": "FFEB9C", "Krise": "FFC7CE"}
+
+PROZENT = "0%"
+EUR = '#,##0.00 "EUR"'
+
+
+# =============================================================================
+# Formatvorlagen
+# =============================================================================
+
+def _fuellung(farbe: str) -> PatternFill:
+    return PatternFill(start_color=farbe, end_color=farbe, fill_type="solid")
+
+
+def _vorlagen() -> list[NamedStyle]:
+    """Alle Formatvorlagen der Exporte (je Arbeitsmappe neu, NamedStyle bindet an die Mappe)."""
+    rahmen = Border(left=Side(style="thin"), right=Side(style="thin"),
+                    top=Side(style="thin"), bottom=Side(style="thin"))
+    klein = Font(size=9)
+    umbruch = Alignment(wrap_text=True, vertical="top")
+    kopf = dict(fill=_fuellung("1F4E79"), border=rahmen,
+                alignment=Alignment(horizontal="center", wrap_text=True))
+
+    vorlagen = [
+        NamedStyle("titel", font=Font(size=14, bold=True, color="1F4E79")),
+        NamedStyle("untertitel", font=Font(size=10, italic=True)),
+        NamedStyle("kopf", font=Font(color="FFFFFF", bold=True, size=10), **kopf),
+        NamedStyle("kopf_klein", font=Font(color="FFFFFF", bold=True, size=9), **kopf),
+        NamedStyle("fehler", border=rahmen, fill=_fuellung("FFC7CE"), font=Font(color="9C0006")),
+        NamedStyle("zelle_eur", border=rahmen, font=klein, number_format=EUR),
+    ]
+    # Grundformate, jeweils mit Prozent- und Ampel-Varianten
+    for name, attr in [("rahmen", {"font": copy(DEFAULT_FONT)}), ("zelle", {"font": klein}),
+                       ("zelle_umbruch", {"font": klein, "alignment": umbruch})]:
+        vorlagen.append(NamedStyle(name, border=rahmen, **attr))
+        vorlagen.append(NamedStyle(f"{name}_prozent", border=rahmen, number_format=PROZENT, **attr))
+        for status, farbe in AMPEL_FUELLUNG.items():
+            vorlagen.append(NamedStyle(f"{name}_{status}", border=rahmen, fill=_fuellung(farbe), **attr))
+    return vorlagen
+
+
+def ampel(basis: str, strip: bool = True) -> Callable:
+    """Spaltenformat fuer den Ampelstatus: Grundformat, bei bekanntem Status mit Fuellung."""
+    varianten = {status: f"{basis}_{status}" for status in AMPEL_FUELLUNG}
+
+    def stil(wert):
+        if strip and wert is not None:
+            wert = str(wert).strip()
+        return varianten.get(wert, basis)
+    return stil
+
+
+def prozent(basis: str) -> Callable:
+    """Spaltenformat fuer Prozentwerte (0 und leere Zellen bleiben ohne Prozentformat)."""
+    mit_format = f"{basis}_prozent"
+    return lambda wert: mit_format if wert else basis
+
+
+# =============================================================================
+# Schreiben
+# =============================================================================
+
+def zeilenwerte(df: pd.DataFrame, spalten: list[str]) -> list[list]:
+    """Zeilen als Listen, fehlende Werte (NaN, NA, NaT) als None."""
+    teil = df.reindex(columns=spalten).astype(object)
+    return teil.where(teil.notna(), None).to_numpy().tolist()
+
+
+def schreibe_tabelle(
+    pfad: Path,
+    blatt: str,
+    kopf: list[str],
+    zeilen: Iterable[list],
+    stile: list[str | Callable | None],
+    breiten: list[float],
+    kopfstil: str = "kopf",
+    titel: list[tuple[str, str]] = (),
+    titel_bis: str = "H",
+    einfrieren: bool = False,
+    autofilter: bool = False,
+    tabelle: str | None = None,
+) -> int:
+    """
+    Schreibt ein Tabellenblatt mit Titelzeilen, Kopfzeile und Datenzeilen nach pfad.
+
+    titel:  (Text, Formatvorlage) je Titelzeile, jeweils verbunden von A bis titel_bis;
+            danach folgt eine Leerzeile und die Kopfzeile.
+    stile:  Formatvorlage je Spalte, als Name oder als Funktion Wert -> Name.
+    Gibt die Anzahl der Datenzeilen zurueck.
+    """
+    wb = Workbook(write_only=True)
+    for vorlage in _vorlagen():
+        wb.add_named_style(vorlage)
+    ws = wb.create_sheet(blatt)
+
+    for i, breite in enumerate(breiten, 1):
+        ws.column_dimensions[get_column_letter(i)].width = breite
+    kopfzeile = len(titel) + 2 if titel else 1
+    if einfrieren:
+        ws.freeze_panes = f"A{kopfzeile + 1}"
+
+    def zelle(wert, stil):
+        c = WriteOnlyCell(ws)
+        if stil:
+            c.style = stil
+        c.value = wert
+        return c
+
+    for nr, (text, stil) in enumerate(titel, 1):
+        ws.merged_cells.add(f"A{nr}:{titel_bis}{nr}")
+        ws.append([zelle(text, stil)])
+    if titel:
+        ws.append([])
+    ws.append([zelle(k, kopfstil) for k in kopf])
+
+    je_wert = [callable(s) for s in stile]
+    anzahl = 0
+    for werte in zeilen:
+        ws.append([zelle(w, s(w) if f else s) for w, s, f in zip(werte, stile, je_wert)])
+        anzahl += 1
+
+    bereich = f"A{kopfzeile}:{get_column_letter(len(kopf))}{kopfzeile + anzahl}"
+    if autofilter:
+        ws.auto_filter.ref = bereich
+    if tabelle:
+        # Im write-only-Modus kann openpyxl die Spaltennamen nicht aus den Zellen lesen,
+        # sie werden deshalb vorgegeben (die Warnung von add_table ist damit gegenstandslos)
+        tab = Table(displayName=tabelle, ref=bereich, autoFilter=AutoFilter(ref=bereich),
+                    tableColumns=[TableColumn(id=i, name=str(k)) for i, k in enumerate(kopf, 1)])
+        tab.tableStyleInfo = TableStyleInfo(
+            name="TableStyleMedium2", showFirstColumn=False,
+            showLastColumn=False, showRowStripes=True, showColumnStripes=False,
+        )
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", "In write-only mode", UserWarning)
+            ws.add_table(tab)
+
+    Path(pfad).parent.mkdir(parents=True, exist_ok=True)
+    wb.save(str(pfad))
+    return anzahl
@@ -0,0 +1,241 @@
+"""
+pipeline.py — Alle Stufen in einem Prozess, ohne Umweg ueber die Zwischendateien.
+
+Ausfuehrung: python pipeline.py                          (alle Stufen, inkrementell)
+             python pipeline.py --only charts,reports    (nur ausgewaehlte Stufen)
+             python pipeline.py --voll                   (alle Ausgaben neu erzeugen)
+
+Stufen (in dieser Reihenfolge):
+  konsolidierung   01_konsolidierung.py (schreibt weiterhin konsolidiert.xlsx/.parquet)
+  dashboard        docs/consolidated.json + docs/details/ fuer das HTML-Dashboard (dashboarddaten.py)
+  charts           02_visualisierung.py
+  reports          03_bericht.py
+  steckbriefe      04_steckbriefe.py (ein One-Pager pro PSB)
+  check            check.py
+
+Das konsolidierte DataFrame wird direkt an die folgenden Stufen uebergeben. Ohne die
+Stufe konsolidierung werden die Daten einmal ueber lade_konsolidiert() geladen.
+Am Ende wird die Laufzeit pro Stufe ausgegeben.
+
+Inkrementell (build.py): Konsolidierung, jedes Chart, jeder Bericht und jeder Steckbrief werden nur neu
+erzeugt, wenn sich ihre Eingaben seit dem letzten erfolgreichen Lauf geaendert haben
+(Quelldateien, Code samt aller importierten Prototyp-Module, verwendete Spalten, eingebundene
+Chart-PNGs) oder eine ihrer Ausgabedateien fehlt. Die Checks laufen immer.
+Eine manuell korrigierte konsolidiert.xlsx bleibt erhalten, solange die Quelldaten
+unveraendert sind.
+"""
+
+import sys
+import time
+import argparse
+import importlib
+
+from config import (
+    SAP_FILE, DASHBOARD_FILE, PPTX_TEMPLATE, KONSOLIDIERT_XLSX, DASHBOARD_JSON, psb_dateien,
+)
+from datenbasis import lade_konsolidiert, typisiere
+from build import BuildStatus, datei_hash, code_hash, daten_hash, signatur
+
+STUFEN = ["konsolidierung", "dashboard", "charts", "reports", "steckbriefe", "check"]
+
+
+def _stufe_konsolidierung(df, build: BuildStatus):
+    konsolidierung = importlib.import_module("01_konsolidierung")
+    eingaben = {f"psb:{f.name}": datei_hash(f) for f in psb_dateien()}
+    eingaben["sap"] = datei_hash(SAP_FILE)
+    eingaben["dashboard"] = datei_hash(DASHBOARD_FILE)
+    eingaben["code"] = code_hash("01_konsolidierung")
+    sig = signatur(eingaben)
+    if build.aktuell("konsolidierung", sig, [KONSOLIDIERT_XLSX]):
+        print("Konsolidierung: Quelldaten unveraendert, uebersprungen.")
+        return lade_konsolidiert()
+
+    build.vergessen("konsolidierung")
+    # Gleiche Datentypen wie beim Laden aus der Parquet-Datei
+    df = typisiere(konsolidierung.main())
+    build.erledigt("konsolidierung", sig)
+    return df
+
+
+def _stufe_dashboard(df, build: BuildStatus):
+    dashboarddaten = importlib.import_module("dashboarddaten")
+    sig = signatur({"code": code_hash("dashboarddaten"),
+                    "daten": daten_hash(df, list(df.columns))})
+    # Im Beobachtungsmodus geschriebene Dateien stammen nicht aus den konsolidierten Daten
+    if not dashboarddaten.ist_live(DASHBOARD_JSON) and build.aktuell("dashboard", sig, [DASHBOARD_JSON]):
+        print("Dashboard-Daten: unveraendert, uebersprungen.")
+        return df
+
+    build.vergessen("dashboard")
+    print("Dashboard-Daten exportieren...")
+    ergebnis = dashboarddaten.schreibe_dashboard(df, DASHBOARD_JSON, df.attrs.get("quelle", "Konsolidierung"))
+    print(f"  {ergebnis['projekte']} Projekte -> {DASHBOARD_JSON.name} "
+          f"({ergebnis['details_geaendert']} Detaildateien geaendert)")
+    build.erledigt("dashboard", sig)
+    return df
+
+
+def _baue(build: BuildStatus, ziel: str, eingaben: dict[str, str], ausgaben: list, erzeuge):
+    """Ruft erzeuge() nur auf, wenn sich die Eingaben von ziel geaendert haben."""
+    sig = signatur(eingaben)
+    if build.aktuell(ziel, sig, ausgaben):
+        return
+    build.vergessen(ziel)
+    erzeuge()
+    build.erledigt(ziel, sig)
+
+
+def _stufe_charts(df, build: BuildStatus):
+    visualisierung = importlib.import_module("02_visualisierung")
+    code = code_hash("02_visualisierung")
+    print("Charts generieren...")
+    signaturen = {}
+    for name, (_, spalten) in visualisierung.CHARTS.items():
+        eingaben = {"code": code, "daten": daten_hash(df, spalten)}
+        for pfad in visualisierung.CHART_DATEIEN.get(name, []):
+            eingaben[pfad.name] = datei_hash(pfad)
+        sig = signatur(eingaben)
+        if not build.aktuell(f"chart:{name}", sig, visualisierung.chart_ausgaben(name, df)):
+            build.vergessen(f"chart:{name}")
+            signaturen[name] = sig
+
+    ergebnisse = visualisierung.render_charts(df, list(signaturen)) if signaturen else []
+    for name, _, fehler in ergebnisse:
+        if not fehler:
+            build.erledigt(f"chart:{name}", signaturen[name])
+    if ergebnisse:
+        visualisierung.zeitbericht(ergebnisse)
+    _zusammenfassung(build, "chart:")
+
+    fehlgeschlagen = [name for name, _, fehler in ergebnisse if fehler]
+    if fehlgeschlagen:
+        raise RuntimeError(f"Charts fehlgeschlagen: {', '.join(fehlgeschlagen)}")
+    return df
+
+
+def _stufe_reports(df, build: BuildStatus):
+    bericht = importlib.import_module("03_bericht")
+    code = code_hash("03_bericht")
+    print("Berichte generieren...")
+    for name, (report_fn, pfad, spalten) in bericht.REPORTS.items():
+        eingaben = {"code": code, "daten": daten_hash(df, spalten)}
+        if name == "pptx":
+            eingaben["template"] = datei_hash(PPTX_TEMPLATE)
+            for bild in bericht.pptx_bilddateien():
+                eingaben[f"chart:{bild.name}"] = datei_hash(bild)
+        _baue(build, f"report:{name}", eingaben, [pfad], lambda: report_fn(df))
+    _zusammenfassung(build, "report:")
+    return df
+
+
+def _stufe_steckbriefe(df, build: BuildStatus):
+    steckbriefe = importlib.import_module("04_steckbriefe")
+    konsolidierung = importlib.import_module("01_konsolidierung")
+    code = code_hash("04_steckbriefe")
+    budget = daten_hash(df, ["lv_nummer", *steckbriefe.BUDGET_SPALTEN])
+    print("Steckbriefe generieren...")
+    signaturen = {}
+    for f in psb_dateien():
+        sig = signatur({"code": code, "budget": budget, "psb": datei_hash(f)})
+        if not build.aktuell(f"steckbrief:{f.name}", sig, [steckbriefe.steckbrief_pfad(f)]):
+            build.vergessen(f"steckbrief:{f.name}")
+            signaturen[f.name] = (f, sig)
+
+    ergebnisse = []
+    if signaturen:
+        psbs, ergebnisse = steckbriefe.lies_psbs([f for f, _ in signaturen.values()])
+        ergebnisse += steckbriefe.erzeuge_steckbriefe(psbs, steckbriefe.budget_je_projekt(df))
+    for name, _, fehler in ergebnisse:
+        if not fehler:
+            build.erledigt(f"steckbrief:{name}", signaturen[name][1])
+    # Ohne Namensliste wie in _zusammenfassung: ein Steckbrief pro PSB
+    gebaut = sum(z.startswith("steckbrief:") for z in build.gebaut)
+    unveraendert = sum(z.startswith("steckbrief:") for z in build.uebersprungen)
+    print(f"  {gebaut} neu erzeugt, {unveraendert} unveraendert")
+
+    fehlgeschlagen = [name for name, _, fehler in ergebnisse if fehler]
+    if fehlgeschlagen:
+        raise RuntimeError(f"Steckbriefe fehlgeschlagen: {', '.join(fehlgeschlagen)}")
+    return df
+
+
+def _zusammenfassung(build: BuildStatus, praefix: str):
+    gebaut = sum(z.startswith(praefix) for z in build.gebaut)
+    unveraendert = [z[len(praefix):] for z in build.uebersprungen if z.startswith(praefix)]
+    print(f"  {gebaut} neu erzeugt, {len(unveraendert)} unveraendert"
+          + (f" ({', '.join(unveraendert)})" if unveraendert else ""))
+
+
+def _stufe_check(df, build: BuildStatus):
+    n_fehler = importlib.import_module("check").pruefe_alles(df)
+    if n_fehler:
+        raise RuntimeError(f"{n_fehler} Checks fehlgeschlagen")
+    return df
+
+
+AUSFUEHRUNG = {
+    "konsolidierung": _stufe_konsolidierung,
+    "dashboard": _stufe_dashboard,
+    "charts": _stufe_charts,
+    "reports": _stufe_reports,
+    "steckbriefe": _stufe_steckbriefe,
+    "check": _stufe_check,
+}
+
+
+def parse_stufen(text: str | None) -> list[str]:
+    """'charts,reports' → ['charts', 'reports'] in Pipeline-Reihenfolge."""
+    if not text:
+        return list(STUFEN)
+    gewaehlt = {s.strip() for s in text.split(",") if s.strip()}
+    unbekannt = gewaehlt - set(STUFEN)
+    if unbekannt:
+        raise SystemExit(f"Unbekannte Stufen: {', '.join(sorted(unbekannt))} (verfuegbar: {', '.join(STUFEN)})")
+    return [s for s in STUFEN if s in gewaehlt]
+
+
+def run(stufen: list[str], zeiten: dict[str, float], voll: bool = False):
+    """Fuehrt die Stufen aus und traegt die Laufzeit pro Stufe (Sekunden) in zeiten ein."""
+    build = BuildStatus(voll=voll)
+    df = None
+    for stufe in stufen:
+        t0 = time.perf_counter()
+        try:
+            if df is None and stufe != "konsolidierung":
+                df = lade_konsolidiert()
+            df = AUSFUEHRUNG[stufe](df, build)
+        finally:
+            build.sichern()
+            zeiten[stufe] = time.perf_counter() - t0
+            print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline Projektportfolio LV-Vorhaben")
+    parser.add_argument("--only", help=f"Kommagetrennte Stufen ({', '.join(STUFEN)})")
+    parser.add_argument("--voll", action="store_true",
+                        help="Alle Ausgaben neu erzeugen, auch wenn die Eingaben unveraendert sind")
+    args = parser.parse_args()
+
+    stufen = parse_stufen(args.only)
+    zeiten = {}
+    fehler = None
+    t0 = time.perf_counter()
+    try:
+        run(stufen, zeiten, voll=args.voll)
+    except RuntimeError as e:
+        fehler = e
+
+    print(f"{'='*60}")
+    print("  Laufzeit pro Stufe")
+    for stufe, sekunden in zeiten.items():
+        print(f"  {stufe:<16} {sekunden:7.2f} s")
+    print(f"  {'gesamt':<16} {time.perf_counter() - t0:7.2f} s")
+    print(f"{'='*60}")
+    if fehler:
+        print(f"  FEHLER: {fehler}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
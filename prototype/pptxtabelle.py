@@ -0,0 +1,53 @@
+"""
+pptxtabelle.py — PowerPoint-Tabellen als ein XML-Fragment (fuer 03_bericht.py und 04_steckbriefe.py).
+
+Die Formatierung jeder Zellart (Kopf, normal, Ampelfarbe) steht einmal als XML-Vorlage bereit;
+tabelle() setzt nur noch die Texte ein, statt jede Zelle und jeden Absatz ueber die
+python-pptx-Objekte zu formatieren. python-pptx wird erst beim Aufruf geladen.
+"""
+
+from xml.sax.saxutils import escape
+
+from config import AMPEL_FARBEN
+
+
+def _zellvorlage(sz: int, fett: bool = False, schrift: str | None = None,
+                 fuellung: str | None = None) -> str:
+    """XML einer Tabellenzelle mit Platzhalter {text}. Die Formatierung wird einmal je Stil
+    erzeugt und nicht je Zelle/Absatz ueber die python-pptx-Objekte gesetzt."""
+    attr = f' sz="{sz}"' + (' b="1"' if fett else "")
+    farbe = f'<a:solidFill><a:srgbClr val="{schrift}"/></a:solidFill>' if schrift else ""
+    fill = f'<a:solidFill><a:srgbClr val="{fuellung}"/></a:solidFill>' if fuellung else ""
+    return ('<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r>'
+            f'<a:rPr lang="de-DE"{attr} dirty="0">{farbe}</a:rPr><a:t>{{text}}</a:t></a:r></a:p></a:txBody>'
+            f'<a:tcPr marT="27432" marB="27432">{fill}</a:tcPr></a:tc>')
+
+
+_ZELLE_KOPF = _zellvorlage(900, fett=True, schrift="FFFFFF", fuellung="1F4E79")
+_ZELLE = _zellvorlage(800)
+_ZELLE_AMPEL = {a: _zellvorlage(800, fuellung=AMPEL_FARBEN[a].lstrip("#")) for a in ("Vorsicht", "Krise")}
+
+
+def tabelle(slide, werte: list[list[str]], left: int, top: int, width: int, zeilenhoehe: int,
+            kopf: list[str], breiten: list[float], ampel_spalte: int | None = None):
+    """Fuegt eine Tabelle (Kopfzeile + werte) als ein XML-Fragment ein; breiten sind relativ,
+    die Zellen der ampel_spalte werden in der Ampelfarbe hinterlegt."""
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import nsdecls, qn
+
+    gesamt = sum(breiten)
+    breiten = [int(width * b / gesamt) for b in breiten]
+    zeilen = ["".join(_ZELLE_KOPF.format(text=escape(h)) for h in kopf)]
+    for zeile in werte:
+        zeilen.append("".join(_ZELLE_AMPEL.get(t, _ZELLE).format(text=escape(t)) if j == ampel_spalte
+                              else _ZELLE.format(text=escape(t)) for j, t in enumerate(zeile)))
+
+    rahmen = slide.shapes.add_table(1, len(breiten), left, top, sum(breiten), zeilenhoehe * len(zeilen))
+    alt = rahmen._element.graphic.graphicData.tbl
+    stil = alt.tblPr.find(qn("a:tableStyleId")).text
+    neu = parse_xml(
+        f'<a:tbl {nsdecls("a")}><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{stil}</a:tableStyleId>'
+        '</a:tblPr><a:tblGrid>' + "".join(f'<a:gridCol w="{b}"/>' for b in breiten) + '</a:tblGrid>'
+        + "".join(f'<a:tr h="{zeilenhoehe}">{z}</a:tr>' for z in zeilen) + '</a:tbl>')
+    alt.getparent().replace(alt, neu)
+    return rahmen
@@ -1,110 +1,405 @@
 """
 Lokaler HTTP-Server fuer das Dashboard.
 
-1. Liest output/review/konsolidiert.xlsx
-2. Konvertiert in docs/consolidated.json (Dashboard-Datenformat)
-3. Startet HTTP-Server auf Port 8080
-4. Oeffnet Browser
+1. Prueft docs/consolidated.json (geschrieben von der Pipeline-Stufe dashboard) und erzeugt
+   es nur neu, wenn output/review/konsolidiert.parquet bzw. .xlsx neuer ist
+   (kompaktes Dashboard-Format mit docs/details/, siehe prototype/dashboarddaten.py)
+2. Startet HTTP-Server auf Port 8080
+3. Oeffnet Browser
 
-Verwendung: python start_dashboard.py
+Verwendung: python start_dashboard.py               (lokal, oeffnet den Browser)
+            python start_dashboard.py --produktiv   (Betrieb: kein Browser, Zugriffsprotokoll)
+            python start_dashboard.py --port 8000
+            python start_dashboard.py --neu         (consolidated.json in jedem Fall neu erzeugen)
+            python start_dashboard.py --beobachten  (Live-Aktualisierung bei geaenderten Quelldaten)
+
+Der Server beantwortet Anfragen parallel (ein Thread je Verbindung, Keep-Alive) und liefert
+jede Datei aus docs/ aus einem Speicher-Cache: vorkomprimiert (gzip, brotli falls installiert),
+mit starkem ETag und Last-Modified. Browser fragen mit If-None-Match nach und erhalten bei
+unveraenderter Datei nur 304 Not Modified. Aendert sich eine Datei (z.B. consolidated.json
+nach neuer Konsolidierung), wird sie beim naechsten Abruf neu eingelesen und komprimiert.
+
+Mit --beobachten werden PSBs, SAP-Auszug und bestehendes Dashboard beobachtet (siehe
+prototype/beobachtung.py). Nach einer Aenderung wird nur die betroffene Konsolidierung wiederholt
+und das Delta ueber Server-Sent Events (/events) an alle offenen Dashboards geschickt; app.js
+aktualisiert nur die geaenderten Projekte, ohne Neuladen der Seite.
 """
 
+import argparse
+import gzip
+import hashlib
 import http.server
-import os
+import json
+import mimetypes
+import stat
 import sys
+import threading
 import webbrowser
-import json
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
-from datetime import datetime, date
+from urllib.parse import parse_qs, unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 SCRIPT_DIR = Path(__file__).parent
 DOCS_DIR = SCRIPT_DIR / "docs"
-SOURCE_XLSX = SCRIPT_DIR / "output" / "review" / "konsolidiert.xlsx"
-TARGET_JSON = DOCS_DIR / "consolidated.json"
+PROTOTYPE_DIR = SCRIPT_DIR / "prototype"
+TARGET_JSON = DOCS_DIR / "consolidated.json"   # = config.DASHBOARD_JSON
 PORT = 8080
 
+# Nur Textformate lohnen die Kompression; sehr kleine Dateien werden unkomprimiert ausgeliefert
+KOMPRIMIERBAR = {".json", ".js", ".css", ".html", ".svg", ".txt"}
+MIN_KOMPRESSION = 512
+# Dateinamen tragen keinen Inhalts-Hash: der Browser darf cachen, muss aber jedes Mal
+# per ETag nachfragen (Antwort 304 ohne Inhalt, solange sich nichts geaendert hat)
+CACHE_CONTROL = "no-cache"
+# Server-Sent Events: Pfad, Kommentarzeile gegen Verbindungsabbrueche durch Proxys (Sekunden),
+# Anzahl gespeicherter Ereignisse fuer Clients, die sich nach kurzer Unterbrechung neu verbinden
+EREIGNIS_PFAD = "/events"
+EREIGNIS_PING = 15
+EREIGNIS_PUFFER = 20
+
 
-def xlsx_to_json():
-    """Konvertiert konsolidiert.xlsx in consolidated.json fuer das Dashboard."""
+def konsolidiert_to_json(neu: bool = False):
+    """
+    Erzeugt consolidated.json fuer das Dashboard, falls noetig.
+
+    Normalerweise schreibt die Pipeline (Stufe dashboard) die Datei direkt aus dem konsolidierten
+    DataFrame. Hier wird sie nur neu erzeugt, wenn sie fehlt, ein anderes Format hat oder
+    konsolidiert.parquet/.xlsx neuer ist (z.B. nach 01_konsolidierung.py allein oder einer
+    manuellen Korrektur im Excel).
+    """
+    sys.path.insert(0, str(PROTOTYPE_DIR))
     try:
-        import openpyxl
-    except ImportError:
-        print("FEHLER: openpyxl nicht installiert. Bitte: pip install openpyxl")
+        from dashboarddaten import ist_aktuell
+        from config import KONSOLIDIERT_XLSX, KONSOLIDIERT_PARQUET
+    except ImportError as e:
+        print(f"FEHLER: {e}. Bitte: pip install -r prototype/requirements.txt")
         sys.exit(1)
 
-    if not SOURCE_XLSX.exists():
-        print(f"FEHLER: {SOURCE_XLSX} nicht gefunden.")
+    if not neu and ist_aktuell(TARGET_JSON, [KONSOLIDIERT_PARQUET, KONSOLIDIERT_XLSX]):
+        print(f"  {TARGET_JSON.name} ist aktuell (neuer als die konsolidierten Daten).")
+        return None
+
+    from datenbasis import lade_konsolidiert
+    from dashboarddaten import schreibe_dashboard
+    try:
+        df = lade_konsolidiert()
+    except FileNotFoundError:
+        print(f"FEHLER: {KONSOLIDIERT_XLSX} nicht gefunden.")
         print("Bitte zuerst: cd prototype && python 01_konsolidierung.py")
         sys.exit(1)
 
-    wb = openpyxl.load_workbook(SOURCE_XLSX, data_only=True)
-    ws = wb["Konsolidiert"]
+    ergebnis = schreibe_dashboard(df, TARGET_JSON, df.attrs.get("quelle", KONSOLIDIERT_XLSX.name))
+
+    n = ergebnis["projekte"]
+    print(f"  {n} Projekte -> {TARGET_JSON.name} "
+          f"(+ {ergebnis['details_geaendert']} geaenderte Detaildateien in details/)")
+    return n
+
+
+# =============================================================================
+# Auslieferung (vorkomprimiert, ETag, 304)
+# =============================================================================
+
+def _kodierungen(accept_encoding: str) -> set[str]:
+    """Vom Client akzeptierte Content-Encodings (ohne die mit q=0 ausgeschlossenen)."""
+    erlaubt = set()
+    for teil in accept_encoding.split(","):
+        name, _, parameter = teil.partition(";")
+        q = 1.0
+        for p in parameter.split(";"):
+            schluessel, _, wert = p.strip().partition("=")
+            if schluessel == "q":
+                try:
+                    q = float(wert)
+                except ValueError:
+                    q = 0.0
+        if name.strip() and q > 0:
+            erlaubt.add(name.strip().lower())
+    return erlaubt
+
+
+class Datei:
+    """Eine Datei aus docs/ mit ihren vorkomprimierten Varianten und Validatoren."""
+
+    def __init__(self, pfad: Path, stempel: tuple[int, int]):
+        roh = pfad.read_bytes()
+        self.stempel = stempel
+        self.typ = mimetypes.guess_type(pfad.name)[0] or "application/octet-stream"
+        if self.typ.startswith("text/") or self.typ in ("application/json", "application/javascript"):
+            self.typ += "; charset=utf-8"
+        self.mtime = stempel[0] // 1_000_000_000
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        self.komprimierbar = pfad.suffix in KOMPRIMIERBAR and len(roh) >= MIN_KOMPRESSION
+
+        # Starker ETag je Darstellung (identity, gzip und br sind verschiedene Bytefolgen)
+        basis = hashlib.sha256(roh).hexdigest()[:20]
+        self.varianten = {"identity": (roh, f'"{basis}"')}
+        if self.komprimierbar:
+            gz = gzip.compress(roh, compresslevel=9, mtime=0)
+            if len(gz) < len(roh):
+                self.varianten["gzip"] = (gz, f'"{basis}-gz"')
+            if brotli is not None:
+                br = brotli.compress(roh, quality=11)
+                if len(br) < len(roh):
+                    self.varianten["br"] = (br, f'"{basis}-br"')
+
+    def variante(self, accept_encoding: str) -> tuple[str, bytes, str]:
+        """(Kodierung, Inhalt, ETag) der kleinsten Variante, die der Client akzeptiert."""
+        erlaubt = _kodierungen(accept_encoding) if self.komprimierbar else set()
+        for kodierung in ("br", "gzip"):
+            if kodierung in erlaubt and kodierung in self.varianten:
+                return (kodierung, *self.varianten[kodierung])
+        return ("identity", *self.varianten["identity"])
+
+
+class DateiCache:
+    """Dateien aus einem Verzeichnis; neu eingelesen, sobald sich mtime oder Groesse aendern."""
+
+    def __init__(self, verzeichnis: Path):
+        self.verzeichnis = Path(verzeichnis).resolve()
+        self._dateien: dict[Path, Datei] = {}
+        self._sperre = threading.Lock()
+
+    def pfad(self, url: str) -> Path | None:
+        """Dateipfad zu einer URL; None fuer Pfade ausserhalb des Verzeichnisses."""
+        relativ = unquote(urlsplit(url).path).lstrip("/")
+        pfad = (self.verzeichnis / relativ).resolve()
+        if pfad.is_dir():
+            pfad = pfad / "index.html"
+        return pfad if pfad.is_relative_to(self.verzeichnis) else None
+
+    def hole(self, url: str) -> Datei | None:
+        pfad = self.pfad(url)
+        try:
+            st = pfad.stat() if pfad else None
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            return None
+        stempel = (st.st_mtime_ns, st.st_size)
+        datei = self._dateien.get(pfad)
+        if datei is None or datei.stempel != stempel:
+            # Nur ein Thread liest und komprimiert eine geaenderte Datei, die anderen warten darauf
+            with self._sperre:
+                datei = self._dateien.get(pfad)
+                if datei is None or datei.stempel != stempel:
+                    datei = Datei(pfad, stempel)
+                    self._dateien[pfad] = datei
+        return datei
 
-    # Header lesen (Zeile 1)
-    headers = []
-    for col in range(1, ws.max_column + 1):
-        val = ws.cell(row=1, column=col).value
-        if val:
-            headers.append(str(val).strip())
-        else:
-            headers.append(f"col_{col}")
+    def vorwaermen(self):
+        """Alle Dateien vorab einlesen und komprimieren (erste Anfrage wartet nicht darauf)."""
+        for pfad in self.verzeichnis.rglob("*"):
+            if pfad.is_file() and not pfad.name.startswith("."):
+                self.hole("/" + pfad.relative_to(self.verzeichnis).as_posix())
 
-    # Daten lesen
-    projekte = []
-    for row in range(2, ws.max_row + 1):
-        vals = {}
-        for col_idx, header in enumerate(headers, 1):
-            val = ws.cell(row=row, column=col_idx).value
-            if isinstance(val, (datetime, date)):
-                val = val.isoformat()
-            vals[header] = val
 
-        if not vals.get("lv_nummer") and not vals.get("projektname"):
-            continue
+class Ereignisse:
+    """Die zuletzt gesendeten Server-Sent Events; wartende Verbindungen werden bei jedem neuen geweckt."""
 
-        projekte.append(vals)
+    def __init__(self, puffer: int = EREIGNIS_PUFFER):
+        self.puffer = puffer
+        self.letzte_id = 0
+        self._liste: list[tuple[int, str, bytes]] = []   # (id, Ereignis, JSON)
+        self._bedingung = threading.Condition()
 
-    wb.close()
+    def senden(self, name: str, daten: dict):
+        inhalt = json.dumps(daten, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        with self._bedingung:
+            self.letzte_id += 1
+            self._liste = [*self._liste[-(self.puffer - 1):], (self.letzte_id, name, inhalt)]
+            self._bedingung.notify_all()
 
-    output = {
-        "meta": {
-            "generiert": datetime.now().isoformat(),
-            "anzahl_projekte": len(projekte),
-            "quelle": SOURCE_XLSX.name,
-        },
-        "projekte": projekte,
-    }
+    def seit(self, nach_id: int, timeout: float) -> list[tuple[int, str, bytes]] | None:
+        """Ereignisse nach nach_id, notfalls bis timeout darauf warten.
+        None, wenn dazwischen Ereignisse fehlen (nicht mehr gepuffert oder Server neu gestartet)."""
+        with self._bedingung:
+            self._bedingung.wait_for(lambda: self.letzte_id != nach_id, timeout)
+            if nach_id > self.letzte_id or (self._liste and nach_id < self._liste[0][0] - 1):
+                return None
+            return [e for e in self._liste if e[0] > nach_id]
 
-    with open(TARGET_JSON, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2, default=str)
 
-    print(f"  {len(projekte)} Projekte -> {TARGET_JSON.name}")
-    return len(projekte)
+class DashboardHandler(http.server.BaseHTTPRequestHandler):
+    """GET/HEAD fuer die Dateien im DateiCache des Servers, mit Komprimierung und 304."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "Projektportfolio-Dashboard"
+    # Kopf und Inhalt gehen getrennt raus; mit Nagle wartet der Inhalt sonst auf das verzoegerte ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if urlsplit(self.path).path == EREIGNIS_PFAD:
+            self._ereignisstrom()
+            return
+        self._senden(mit_inhalt=True)
+
+    def do_HEAD(self):
+        self._senden(mit_inhalt=False)
+
+    def _senden(self, mit_inhalt: bool):
+        datei = self.server.dateien.hole(self.path)
+        if datei is None:
+            self.send_error(404, "Datei nicht gefunden")
+            return
+        kodierung, inhalt, etag = datei.variante(self.headers.get("Accept-Encoding", ""))
+
+        if self._unveraendert(datei, etag):
+            self.send_response(304)
+            self._validatoren(datei, etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", datei.typ)
+        self.send_header("Content-Length", str(len(inhalt)))
+        if kodierung != "identity":
+            self.send_header("Content-Encoding", kodierung)
+        self._validatoren(datei, etag)
+        self.end_headers()
+        if mit_inhalt:
+            self.wfile.write(inhalt)
+
+    def _ereignisstrom(self):
+        """Server-Sent Events: haelt die Verbindung offen und schickt jedes neue Delta.
+
+        Ohne Beobachtungsmodus 204 (EventSource verbindet sich dann nicht erneut). Gesendet wird ab
+        der Last-Event-ID (Wiederverbindung) bzw. ab ?seit=<meta.ereignis> der geladenen
+        consolidated.json (erste Verbindung), sodass kein Delta zwischen Laden und Verbinden fehlt.
+        Liegen die Nachfolger dieser ID nicht mehr vor, bekommt der Browser das Ereignis "neu" und
+        laedt consolidated.json komplett."""
+        ereignisse = self.server.ereignisse
+        if ereignisse is None:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        seit = parse_qs(urlsplit(self.path).query).get("seit", [""])[0]
+        try:
+            stand = int(self.headers.get("Last-Event-ID") or seit)
+        except ValueError:
+            stand = ereignisse.letzte_id
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            while True:
+                neu = ereignisse.seit(stand, EREIGNIS_PING)
+                if neu is None:
+                    stand = ereignisse.letzte_id
+                    self.wfile.write(f"id: {stand}\nevent: neu\ndata: {{}}\n\n".encode())
+                elif not neu:
+                    self.wfile.write(b": ping\n\n")
+                for nr, name, inhalt in neu or []:
+                    self.wfile.write(f"id: {nr}\nevent: {name}\ndata: ".encode() + inhalt + b"\n\n")
+                    stand = nr
+                self.wfile.flush()
+        except OSError:
+            pass   # Browser hat die Seite geschlossen
+
+    def _validatoren(self, datei: Datei, etag: str):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", datei.last_modified)
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        if datei.komprimierbar:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def _unveraendert(self, datei: Datei, etag: str) -> bool:
+        """If-None-Match hat Vorrang; If-Modified-Since nur, wenn kein ETag mitgeschickt wird."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= datei.mtime
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        if self.server.protokoll:
+            super().log_message(format, *args)
+
+
+class DashboardServer(http.server.ThreadingHTTPServer):
+    """Ein Thread je Verbindung; die Dateien liegen komprimiert im gemeinsamen DateiCache."""
+
+    # Warteschlange fuer gleichzeitige Verbindungsaufbauten (Standard 5)
+    request_queue_size = 64
+
+    def __init__(self, adresse: tuple[str, int], verzeichnis: Path = DOCS_DIR, protokoll: bool = False,
+                 ereignisse: Ereignisse | None = None):
+        super().__init__(adresse, DashboardHandler)
+        self.dateien = DateiCache(verzeichnis)
+        self.protokoll = protokoll
+        self.ereignisse = ereignisse
+
+
+def starte_beobachtung(ereignisse: Ereignisse, stop: threading.Event) -> threading.Thread:
+    """Konsolidiert einmal aus den Quelldaten und beobachtet sie danach in einem eigenen Thread."""
+    sys.path.insert(0, str(PROTOTYPE_DIR))
+    from beobachtung import LiveKonsolidierung
+
+    live = LiveKonsolidierung(TARGET_JSON, ereignis=lambda: ereignisse.letzte_id)
+    n = live.starten()
+    print(f"  {n} Projekte aus den Quelldaten -> {TARGET_JSON.name}")
+    thread = threading.Thread(target=live.beobachte, args=(lambda d: ereignisse.senden("delta", d), stop),
+                              name="beobachtung", daemon=True)
+    thread.start()
+    return thread
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Dashboard Projektportfolio LV-Vorhaben")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--produktiv", action="store_true",
+                        help="Betrieb fuer mehrere Nutzer: kein Browser, Zugriffsprotokoll")
+    parser.add_argument("--neu", action="store_true",
+                        help="consolidated.json in jedem Fall neu erzeugen")
+    parser.add_argument("--beobachten", action="store_true",
+                        help="Quelldaten beobachten und offene Dashboards live aktualisieren")
+    args = parser.parse_args()
+
     if not DOCS_DIR.exists():
         print(f"FEHLER: {DOCS_DIR} nicht gefunden.")
         sys.exit(1)
 
-    print("Konvertiere konsolidiert.xlsx -> consolidated.json ...")
-    n = xlsx_to_json()
-    print(f"  {n} Projekte konvertiert.\n")
-
-    os.chdir(DOCS_DIR)
-    handler = http.server.SimpleHTTPRequestHandler
-    handler.log_message = lambda *args: None
-
-    print(f"Dashboard: http://localhost:{PORT}")
-    print("Beenden mit Ctrl+C\n")
-
-    webbrowser.open(f"http://localhost:{PORT}")
+    ereignisse, stop = None, threading.Event()
+    if args.beobachten:
+        print("Beobachtungsmodus: konsolidiere aus den Quelldaten ...")
+        ereignisse = Ereignisse()
+        starte_beobachtung(ereignisse, stop)
+    else:
+        print("Pruefe consolidated.json ...")
+        konsolidiert_to_json(neu=args.neu)
+    print()
 
     try:
-        with http.server.HTTPServer(("", PORT), handler) as httpd:
+        with DashboardServer(("", args.port), protokoll=args.produktiv, ereignisse=ereignisse) as httpd:
+            httpd.dateien.vorwaermen()
+            print(f"Dashboard: http://localhost:{args.port}"
+                  f"  (Kompression: gzip{', br' if brotli else ''})")
+            if args.beobachten:
+                print("Beobachte quelldaten/psb, SAP-Auszug und Dashboard-Excel auf Aenderungen")
+            print("Beenden mit Ctrl+C\n")
+            if not args.produktiv:
+                webbrowser.open(f"http://localhost:{args.port}")
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer beendet.")
+    finally:
+        stop.set()
 
 
 if __name__ == "__main__":